@@ -0,0 +1,286 @@
+# Almacenamiento de los tickets PDF.
+#
+# Los tickets se dibujan en memoria (ver generador_pdf) y se guardan con un
+# almacén: cualquier objeto con los métodos guardar(turno_id, fecha, contenido),
+# obtener(turno_id, fecha) y guardar_cierre(momento, contenido), elegido con
+# TICKETS_ALMACEN (ver crear_almacen).
+#
+# AlmacenDirectorio reparte los tickets en carpetas por día de cobro
+# (AAAA/MM/DD/Ticket_<id>.pdf), así ninguna carpeta junta más que los tickets
+# de un día. Los meses cerrados se pueden empaquetar en un zip por mes
+# (AAAA/AAAA-MM.zip) con un índice al lado (AAAA-MM.indice.json) que guarda
+# dónde empieza cada ticket dentro del zip: leer uno es un seek y un read, sin
+# recorrer el directorio central del zip. Un respaldo copia un archivo por mes
+# en lugar de miles de PDFs sueltos. Los resúmenes de cierre de caja van aparte,
+# uno por cierre en cierres/AAAA/.
+import hashlib
+import json
+import os
+import re
+import struct
+import threading
+import zipfile
+import zlib
+from datetime import datetime
+
+# Resultado de guardar un ticket
+NUEVO = "nuevo"
+IGUAL = "igual" # ya estaba guardado con el mismo contenido: no se escribe
+REEMPLAZADO = "reemplazado" # había otra versión del ticket
+
+PATRON_TICKET = re.compile(r"^Ticket_(\d+)\.pdf$")
+
+def _huella(contenido):
+  return hashlib.sha256(contenido).hexdigest()
+
+def _escribir_atomico(ruta, contenido):
+  """Escribe en un temporal del mismo directorio y lo renombra: nunca queda un archivo a medio escribir."""
+  temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+  try:
+    with open(temporal, "wb") as f:
+      f.write(contenido)
+    os.replace(temporal, ruta)
+  except BaseException:
+    if os.path.exists(temporal):
+      os.remove(temporal)
+    raise
+
+
+class AlmacenDirectorio:
+  """
+  Tickets en carpetas por día de cobro, con empaquetado opcional de los meses cerrados.
+
+  - guardar() compara el contenido con el ticket ya guardado (por su hash) y no
+    vuelve a escribir si es el mismo; si cambió lo reemplaza con un renombrado
+    atómico e informa REEMPLAZADO.
+  - empaquetar_mes() mueve los tickets sueltos de un mes a su zip. Si después se
+    regenera un ticket de ese mes, la versión suelta tiene prioridad hasta que
+    se vuelve a empaquetar.
+  """
+  nombre = "directorio"
+
+  def __init__(self, raiz):
+    self.raiz = raiz
+    self._indices = {} # ruta del índice -> (mtime, índice)
+
+  # --- Rutas ---
+
+  def _carpeta_mes(self, anio, mes):
+    return os.path.join(self.raiz, f"{anio:04d}", f"{mes:02d}")
+
+  def _ruta_suelta(self, turno_id, fecha):
+    return os.path.join(self._carpeta_mes(fecha.year, fecha.month), f"{fecha.day:02d}", f"Ticket_{turno_id}.pdf")
+
+  def _ruta_paquete(self, anio, mes):
+    base = os.path.join(self.raiz, f"{anio:04d}", f"{anio:04d}-{mes:02d}")
+    return base + ".zip", base + ".indice.json"
+
+  # --- Paquetes ---
+
+  def _indice(self, anio, mes):
+    """
+    Returns:
+      dict | None: turno_id (str) -> [nombre, desplazamiento, tamaño, método, sha256], o None si el mes no está empaquetado.
+    """
+    _, ruta_indice = self._ruta_paquete(anio, mes)
+    try:
+      mtime = os.stat(ruta_indice).st_mtime_ns
+    except FileNotFoundError:
+      return None
+    cacheado = self._indices.get(ruta_indice)
+    if cacheado and cacheado[0] == mtime:
+      return cacheado[1]
+    with open(ruta_indice, encoding="utf-8") as f:
+      indice = json.load(f)
+    self._indices[ruta_indice] = (mtime, indice)
+    return indice
+
+  @staticmethod
+  def _leer_del_paquete(ruta_zip, entrada):
+    """Lee un ticket del zip yendo directo a su posición (la del índice)."""
+    nombre, desplazamiento, tamano, metodo, huella = entrada
+    with open(ruta_zip, "rb") as f:
+      f.seek(desplazamiento)
+      cabecera = f.read(30)
+      if cabecera[:4] == b"PK\x03\x04":
+        largo_nombre, largo_extra = struct.unpack("<HH", cabecera[26:30])
+        f.seek(largo_nombre + largo_extra, os.SEEK_CUR)
+        datos = f.read(tamano)
+        if metodo == zipfile.ZIP_DEFLATED:
+          datos = zlib.decompress(datos, -15)
+        if _huella(datos) == huella:
+          return datos
+    # El índice no corresponde al zip (se reempaquetó entre medio): se busca por nombre
+    with zipfile.ZipFile(ruta_zip) as paquete:
+      return paquete.read(nombre)
+
+  def _huella_guardada(self, turno_id, fecha):
+    """Hash del ticket vigente (suelto o empaquetado), o None si no hay."""
+    ruta = self._ruta_suelta(turno_id, fecha)
+    if os.path.exists(ruta):
+      with open(ruta, "rb") as f:
+        return _huella(f.read())
+    indice = self._indice(fecha.year, fecha.month)
+    if indice and str(turno_id) in indice:
+      return indice[str(turno_id)][4]
+    return None
+
+  # --- Interfaz del almacén ---
+
+  def guardar(self, turno_id, fecha, contenido):
+    """
+    Guarda el PDF de un ticket en la carpeta de su día.
+
+    Args:
+      turno_id (int): ID del turno.
+      fecha (date | datetime): Fecha de cobro (define la carpeta).
+      contenido (bytes): El PDF.
+
+    Returns:
+      tuple: (ruta, estado) con estado NUEVO, IGUAL o REEMPLAZADO.
+    """
+    ruta = self._ruta_suelta(turno_id, fecha)
+    anterior = self._huella_guardada(turno_id, fecha)
+    if anterior == _huella(contenido):
+      return ruta if os.path.exists(ruta) else self._ruta_paquete(fecha.year, fecha.month)[0], IGUAL
+
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    _escribir_atomico(ruta, contenido)
+    return ruta, NUEVO if anterior is None else REEMPLAZADO
+
+  def obtener(self, turno_id, fecha):
+    """
+    Returns:
+      bytes | None: El PDF del ticket (la versión suelta si hay, si no la del paquete del mes).
+    """
+    ruta = self._ruta_suelta(turno_id, fecha)
+    try:
+      with open(ruta, "rb") as f:
+        return f.read()
+    except FileNotFoundError:
+      pass
+    indice = self._indice(fecha.year, fecha.month)
+    if not indice or str(turno_id) not in indice:
+      return None
+    return self._leer_del_paquete(self._ruta_paquete(fecha.year, fecha.month)[0], indice[str(turno_id)])
+
+  def guardar_cierre(self, momento, contenido):
+    """
+    Guarda el resumen de un cierre de caja en cierres/AAAA/Cierre_AAAA-MM-DD_HHMMSS.pdf
+    (uno por cierre: un segundo cierre el mismo día no pisa al primero).
+
+    Args:
+      momento (datetime): Fecha y hora del cierre.
+      contenido (bytes): El PDF.
+
+    Returns:
+      str: Ruta del resumen.
+    """
+    ruta = os.path.join(self.raiz, "cierres", f"{momento.year:04d}", f"Cierre_{momento:%Y-%m-%d_%H%M%S}.pdf")
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    _escribir_atomico(ruta, contenido)
+    return ruta
+
+  def meses_sueltos(self):
+    """
+    Returns:
+      list[tuple]: (año, mes) que tienen tickets sin empaquetar, en orden.
+    """
+    meses = []
+    if not os.path.isdir(self.raiz):
+      return meses
+    for anio in sorted(os.listdir(self.raiz)):
+      if not (anio.isdigit() and os.path.isdir(os.path.join(self.raiz, anio))):
+        continue
+      for mes in sorted(os.listdir(os.path.join(self.raiz, anio))):
+        if mes.isdigit() and os.path.isdir(self._carpeta_mes(int(anio), int(mes))):
+          meses.append((int(anio), int(mes)))
+    return meses
+
+  def empaquetar_mes(self, anio, mes):
+    """
+    Mueve los tickets sueltos de un mes a su zip (junto con los que ya estaban
+    empaquetados) y reescribe el índice. Se escribe todo en temporales y se
+    renombra al final; los sueltos se borran recién después, salvo los que
+    cambiaron entre medio.
+
+    Returns:
+      int: Tickets sueltos empaquetados (y borrados).
+    """
+    carpeta = self._carpeta_mes(anio, mes)
+    sueltos = {} # nombre dentro del zip -> ruta
+    if os.path.isdir(carpeta):
+      for dia in sorted(os.listdir(carpeta)):
+        for archivo in os.scandir(os.path.join(carpeta, dia)):
+          if PATRON_TICKET.match(archivo.name):
+            sueltos[f"{dia}/{archivo.name}"] = archivo.path
+    if not sueltos:
+      return 0
+
+    ruta_zip, ruta_indice = self._ruta_paquete(anio, mes)
+    temporal = f"{ruta_zip}.{os.getpid()}.tmp"
+    huellas = {}
+    try:
+      with zipfile.ZipFile(temporal, "w", zipfile.ZIP_DEFLATED) as nuevo:
+        # Los tickets ya empaquetados que no se regeneraron pasan tal cual
+        if os.path.exists(ruta_zip):
+          with zipfile.ZipFile(ruta_zip) as viejo:
+            for info in viejo.infolist():
+              if info.filename not in sueltos:
+                datos = viejo.read(info)
+                huellas[info.filename] = _huella(datos)
+                nuevo.writestr(info, datos, compress_type=zipfile.ZIP_DEFLATED)
+        for nombre, ruta in sueltos.items():
+          with open(ruta, "rb") as f:
+            datos = f.read()
+          huellas[nombre] = _huella(datos)
+          info = zipfile.ZipInfo(nombre, datetime.fromtimestamp(os.path.getmtime(ruta)).timetuple()[:6])
+          nuevo.writestr(info, datos, compress_type=zipfile.ZIP_DEFLATED)
+        indice = {
+          PATRON_TICKET.match(os.path.basename(info.filename)).group(1):
+            [info.filename, info.header_offset, info.compress_size, info.compress_type, huellas[info.filename]]
+          for info in nuevo.infolist()
+        }
+      os.replace(temporal, ruta_zip)
+    except BaseException:
+      if os.path.exists(temporal):
+        os.remove(temporal)
+      raise
+    _escribir_atomico(ruta_indice, json.dumps(indice, separators=(",", ":")).encode("utf-8"))
+
+    # Un suelto que se volvió a guardar mientras se armaba el zip no coincide con su
+    # huella: se conserva (la versión suelta es la que se lee) y entra en el próximo empaquetado
+    borrados = 0
+    for nombre, ruta in sueltos.items():
+      try:
+        with open(ruta, "rb") as f:
+          if _huella(f.read()) != huellas[nombre]:
+            continue
+        os.remove(ruta)
+        borrados += 1
+      except FileNotFoundError:
+        pass
+    # Se borran solo las carpetas que quedaron vacías (un ticket guardado mientras tanto se conserva)
+    for dia in os.listdir(carpeta):
+      try:
+        os.rmdir(os.path.join(carpeta, dia))
+      except OSError:
+        pass
+    try:
+      os.rmdir(carpeta)
+    except OSError:
+      pass
+    return borrados
+
+
+def crear_almacen(raiz):
+  """
+  Crea el almacén indicado por TICKETS_ALMACEN ('directorio' por defecto).
+
+  Args:
+    raiz (str): Carpeta base de los tickets.
+  """
+  nombre = os.getenv("TICKETS_ALMACEN", "directorio").lower()
+  if nombre == "directorio":
+    return AlmacenDirectorio(raiz)
+  raise RuntimeError(f"TICKETS_ALMACEN desconocido: {nombre}")
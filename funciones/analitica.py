@@ -0,0 +1,108 @@
+# Analítica de demanda: ocupación por día de la semana y hora, tasa de
+# cancelación y de ausencias en un rango de fechas.
+#
+# Los turnos se cargan en un arreglo estructurado de NumPy (una columna por
+# campo: minuto de inicio, estado, total y duración) directamente desde el
+# cursor, sin armar diccionarios ni datetimes por fila. Todas las cuentas se
+# hacen sobre las columnas completas (máscaras, np.repeat y np.bincount), así
+# que el costo por turno es el de leerlo de la base.
+#
+# El horario de atención y los días cerrados son los del motor de
+# disponibilidad, los mismos que se ofrecen al reservar.
+from datetime import datetime
+
+import numpy as np
+
+from modelos.modelo_turno import Turno
+from . import disponibilidad
+
+DIAS_SEMANA = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+
+# Una fila por turno, tal como la devuelve Turno.iterar_columnas
+DTYPE_TURNOS = np.dtype([("minuto", "i8"), ("estado", "U10"), ("total", "f8"), ("duracion", "i4")])
+
+def cargar_turnos(desde, hasta):
+  """
+  Carga los turnos entre dos fechas (inclusive) en un arreglo estructurado.
+
+  Returns:
+    np.ndarray: Columnas minuto (desde Turno.EPOCA_MINUTOS), estado, total y duracion.
+  """
+  return np.fromiter(Turno.iterar_columnas(desde, hasta), dtype=DTYPE_TURNOS)
+
+def _minutos(fecha_hora):
+  return int((fecha_hora - Turno.EPOCA_MINUTOS).total_seconds() // 60)
+
+def _dia_semana_y_hora(minutos):
+  """Día de la semana (0=Lunes) y hora de cada minuto contado desde la época."""
+  dias = minutos // (24 * 60)
+  return (dias + Turno.EPOCA_MINUTOS.weekday()) % 7, (minutos % (24 * 60)) // 60
+
+def ocupacion_semanal(turnos, desde, hasta, capacidad=Turno.CAPACIDAD_SLOT):
+  """
+  Porcentaje de ocupación promedio de cada horario por día de la semana.
+
+  Cada turno no cancelado ocupa todos los horarios que abarca su duración
+  (como en Turno_Slot). El porcentaje es lo ocupado sobre la capacidad de ese
+  horario en todos los días del rango con ese día de la semana.
+
+  Args:
+    capacidad (int): Lugares de cada horario. Tiene que ser la misma que usa la
+      reserva: la cantidad de peluqueros activos, o CAPACIDAD_SLOT si no hay.
+
+  Returns:
+    tuple: (ocupacion, horas). ocupacion es un arreglo de 7 x len(horas) con
+      NaN en los días cerrados; horas, las horas de apertura (HORA_APERTURA..HORA_CIERRE-1).
+  """
+  activos = turnos[turnos["estado"] != "cancelado"]
+
+  # Un elemento por cada horario ocupado: el inicio del turno más 0, 1, ... horarios
+  slots = np.maximum(1, -(-activos["duracion"] // disponibilidad.DURACION_SLOT))
+  desplazamiento = np.arange(slots.sum()) - np.repeat(np.cumsum(slots) - slots, slots)
+  minutos = np.repeat(activos["minuto"], slots) + desplazamiento * disponibilidad.DURACION_SLOT
+
+  dia, hora = _dia_semana_y_hora(minutos)
+  ocupados = np.bincount(dia * 24 + hora, minlength=7 * 24).reshape(7, 24)
+
+  # Cuántas veces aparece cada día de la semana en el rango
+  cantidad_dias = np.bincount((desde.weekday() + np.arange((hasta - desde).days + 1)) % 7, minlength=7)
+
+  horas = np.arange(disponibilidad.HORA_APERTURA, disponibilidad.HORA_CIERRE)
+  with np.errstate(divide="ignore", invalid="ignore"):
+    ocupacion = ocupados[:, horas] / (cantidad_dias[:, None] * capacidad) * 100
+  ocupacion[list(disponibilidad.DIAS_CERRADOS)] = np.nan
+  ocupacion[cantidad_dias == 0] = np.nan
+  return ocupacion, horas
+
+def tasas_por_dia(turnos, ahora=None):
+  """
+  Turnos, cancelaciones y ausencias por día de la semana.
+
+  Una ausencia es un turno que ya pasó y quedó 'pendiente' o 'confirmado'
+  (nunca se cobró ni se canceló). La tasa de ausencias se calcula sobre los
+  turnos pasados no cancelados; la de cancelación, sobre todos.
+
+  Returns:
+    dict: Arreglos de 7 elementos (0=Lunes): turnos, cancelados, pasados,
+      ausentes, ingresos, tasa_cancelacion y tasa_ausencia (porcentajes, NaN sin turnos).
+  """
+  estado = turnos["estado"]
+  dia, _ = _dia_semana_y_hora(turnos["minuto"])
+  cancelados = estado == "cancelado"
+  pasados = (turnos["minuto"] < _minutos(ahora or datetime.now())) & ~cancelados
+  ausentes = pasados & ((estado == "pendiente") | (estado == "confirmado"))
+
+  def por_dia(mascara=None, pesos=None):
+    return np.bincount(dia if mascara is None else dia[mascara], weights=pesos, minlength=7)
+
+  resultado = {
+    "turnos": por_dia(),
+    "cancelados": por_dia(cancelados),
+    "pasados": por_dia(pasados),
+    "ausentes": por_dia(ausentes),
+    "ingresos": por_dia(estado == "realizado", turnos["total"][estado == "realizado"]),
+  }
+  with np.errstate(divide="ignore", invalid="ignore"):
+    resultado["tasa_cancelacion"] = resultado["cancelados"] / resultado["turnos"] * 100
+    resultado["tasa_ausencia"] = resultado["ausentes"] / resultado["pasados"] * 100
+  return resultado
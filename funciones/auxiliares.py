@@ -9,18 +9,29 @@ import locale
 
 console = Console()
 
-# --- Configuración Regional a Español ---
-try:
-  # Intenta establecer un locale común en sistemas Unix/Linux
-  locale.setlocale(locale.LC_TIME, 'es_ES.UTF-8')
-except locale.Error:
+# Filas por página en las tablas y selectores paginados
+TAMANO_PAGINA = 20
+OPCION_VER_MAS = "➡️ Ver más..."
+
+def configurar_locale():
+  """
+  Configura los nombres de días y meses en español (se llama una vez al iniciar,
+  desde main.py, y no al importar el módulo).
+  """
   try:
-    # Intenta un locale común en Windows
-    locale.setlocale(locale.LC_TIME, 'Spanish_Spain.1252')
+    # Intenta establecer un locale común en sistemas Unix/Linux
+    locale.setlocale(locale.LC_TIME, 'es_ES.UTF-8')
   except locale.Error:
-    # Si ambos fallan, usa una opción genérica (puede ser menos confiable)
-    locale.setlocale(locale.LC_TIME, 'es')
-# Si la configuración regional falla en el sistema, los nombres pueden seguir en inglés.
+    try:
+      # Intenta un locale común en Windows
+      locale.setlocale(locale.LC_TIME, 'Spanish_Spain.1252')
+    except locale.Error:
+      try:
+        # Si ambos fallan, usa una opción genérica (puede ser menos confiable)
+        locale.setlocale(locale.LC_TIME, 'es')
+      except locale.Error:
+        pass
+  # Si la configuración regional falla en el sistema, los nombres pueden seguir en inglés.
 
 def validar_nombre(texto: str) -> bool:
   """
@@ -209,15 +220,91 @@ def mostrar_tabla(titulo, data):
     tabla.add_row(*[str(v) for v in fila.values()])
 
   console.print(tabla)
-  
-def seleccionar_dia_y_hora(data_horas_ocupadas=None):
+
+def mostrar_tabla_paginada(titulo, cargar_pagina, tamano=TAMANO_PAGINA):
+  """
+  Muestra una tabla Rich de a una página por vez, pidiendo cada página recién
+  cuando el usuario quiere verla.
+
+  Args:
+    titulo: Título de la tabla.
+    cargar_pagina: Función que recibe la última fila mostrada (None para la
+      primera página) y devuelve la página siguiente como lista de diccionarios
+      (ver Usuario.listar_clientes_pagina).
+    tamano: Filas por página; una página más corta indica que no hay más datos.
+  """
+  ultima = None
+  numero = 1
+
+  while True:
+    data = cargar_pagina(ultima)
+
+    if not data:
+      if numero == 1:
+        mostrar_tabla(titulo, data)
+      return
+
+    mostrar_tabla(f"{titulo} (página {numero})", data)
+
+    if len(data) < tamano:
+      return
+
+    try:
+      seguir = inquirer.confirm(message="¿Ver la página siguiente?", default=True).execute()
+    except KeyboardInterrupt:
+      return
+
+    if not seguir:
+      return
+
+    ultima = data[-1]
+    numero += 1
+
+def seleccionar_paginado(message, cargar_pagina, formatear, tamano=TAMANO_PAGINA, qmark="?"):
+  """
+  Selector de InquirerPy que trae las opciones por páginas. Si la página está
+  completa se agrega una opción para cargar la siguiente.
+
+  Args:
+    message: Mensaje del selector.
+    cargar_pagina: Igual que en mostrar_tabla_paginada.
+    formatear: Función que recibe una fila y devuelve su etiqueta.
+    tamano: Filas por página.
+    qmark: Ícono del selector.
+
+  Returns:
+    dict: La fila elegida, o None si no hay filas. KeyboardInterrupt se propaga
+      para que cada menú lo maneje como hasta ahora.
+  """
+  ultima = None
+
+  while True:
+    data = cargar_pagina(ultima)
+    if not data:
+      return None
+
+    opciones_mapeadas = {formatear(fila): fila for fila in data}
+    choices = list(opciones_mapeadas.keys())
+    if len(data) == tamano:
+      choices.append(OPCION_VER_MAS)
+
+    seleccion = inquirer.select(message=message, choices=choices, qmark=qmark).execute()
+
+    if seleccion != OPCION_VER_MAS:
+      return opciones_mapeadas.get(seleccion)
+
+    ultima = data[-1]
+
+def seleccionar_dia_y_hora(horarios_libres):
   """
   Permite al usuario seleccionar un día y una hora válidos para un turno.
   
-  Restricciones:
-  - Próximos 5 días (excluyendo el día actual).
-  - Días laborales: Lunes a Sábado (excluyendo Domingo).
-  - Horario: 9:00 a 18:00 (en punto).
+  Los días, el horario de atención y la capacidad ya vienen resueltos por el
+  motor de disponibilidad; aquí solo se ofrecen los horarios libres.
+  
+  Args:
+    horarios_libres: {fecha: [horas de inicio libres]} como lo devuelve
+      disponibilidad.calcular_disponibilidad.
   
   Returns:
     datetime.datetime: La fecha y hora seleccionada, o None si se cancela.
@@ -226,27 +313,22 @@ def seleccionar_dia_y_hora(data_horas_ocupadas=None):
   # --- 1. Generar Opciones de Días Válidos ---
   
   dias_validos = {} # { "Lunes 28/10": datetime.date(2025, 10, 28), ... }
-  hoy = datetime.now().date()
-  
-  # Iterar para obtener los próximos 5 días laborables, empezando mañana (i=1)
-  count = 1 # para contar los 5 dias disponibles para elegir turno
-  j = 1 # para controlar los dias
-  while count < 6:
-    fecha = hoy + timedelta(days=j)
-  
-    # 0=Lunes, 6=Domingo. Excluimos el Domingo (fecha.weekday() == 6).
-    if fecha.weekday() < 6:
-      # Formato de presentación: "Lunes 28/10"
-      nombre_dia = fecha.strftime("%A") 
-      display_fecha = fecha.strftime("%d/%m")
-      
-      # Formato de la opción en la CLI
-      opcion_key = f"{nombre_dia} {display_fecha}"
-      dias_validos[opcion_key] = fecha
-      
-      count += 1 # Solo contamos si el día es válido (no es domingo)
+  for fecha, horas in horarios_libres.items():
+    # Los días sin horarios libres no se ofrecen
+    if not horas:
+      continue
     
-    j += 1 # Siempre avanzamos al siguiente día
+    # Formato de presentación: "Lunes 28/10"
+    nombre_dia = fecha.strftime("%A") 
+    display_fecha = fecha.strftime("%d/%m")
+    
+    # Formato de la opción en la CLI
+    opcion_key = f"{nombre_dia} {display_fecha}"
+    dias_validos[opcion_key] = fecha
+  
+  if not dias_validos:
+    console.print("[yellow]No hay horarios disponibles en los próximos días para los servicios elegidos.[/yellow]")
+    return None
   
   try:
     # Pide al usuario que seleccione el día
@@ -264,19 +346,8 @@ def seleccionar_dia_y_hora(data_horas_ocupadas=None):
 
 
   # --- 2. Generar Opciones de Horas Válidas ---
-  #----print(data_horas_ocupadas)
-  # Obtengo 'hora' donde 'fecha' es la fecha seleccionada
-  horas_ocupadas = [item['hora'] for item in data_horas_ocupadas if item['fecha'] == str(fecha_seleccionada)]
-  horas_choices = []
-  #----print(horas_ocupadas)
-  # Generar horas desde las 9:00 hasta las 18:00
-  for hora in range(9, 19): 
-    # Si la hora está ocupada, la salto
-    if hora in horas_ocupadas:
-      continue
-    
-    # Formato de hora: "09:00", "15:00", "18:00"
-    horas_choices.append(f"{hora:02d}:00")
+  # Formato de hora: "09:00", "15:00", "18:00"
+  horas_choices = [f"{hora:02d}:00" for hora in horarios_libres[fecha_seleccionada]]
 
   try:
     # Pide al usuario que seleccione la hora
@@ -357,4 +428,20 @@ def validar_duracion(texto: str) -> bool:
       
   except ValueError:
     # Captura errores si la conversión a int falla (ej: "abc", "10.5", "5,5")
-    return False
\ No newline at end of file
+    return False
+
+def validar_fecha(texto: str) -> bool:
+  """
+  Valida si una cadena de texto es una fecha con formato dd/mm/aaaa.
+
+  Args:
+    texto: La entrada de texto del usuario.
+
+  Returns:
+    True si es una fecha válida, False en caso contrario.
+  """
+  try:
+    datetime.strptime(texto, "%d/%m/%Y")
+    return True
+  except ValueError:
+    return False
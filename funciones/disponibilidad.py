@@ -0,0 +1,155 @@
+# Motor de disponibilidad de turnos.
+#
+# Calcula qué horarios pueden ofrecerse según el horario de atención, la capacidad
+# por horario y la duración total de los servicios elegidos. Lo usan el selector
+# de la CLI y el control final de la reserva (Turno.reservar recibe los horarios
+# que devuelve slots_del_turno).
+#
+# Cada día se representa como un bitmap: el bit `h` vale 1 si la hora `h` tiene
+# lugar libre. Un turno que ocupa `k` horarios puede empezar en `h` si los bits
+# h..h+k-1 están en 1, lo que se resuelve para todo el día con `k` operaciones AND.
+#
+# La asignación de peluqueros usa AgendaPeluqueros: por cada peluquero, sus turnos
+# ordenados por inicio, de modo que saber si está libre en un intervalo es una
+# búsqueda binaria.
+from bisect import bisect_left
+from datetime import datetime, time, timedelta
+from math import ceil
+
+# --- Horario de atención ---
+HORA_APERTURA = 9 # primer turno 09:00
+HORA_CIERRE = 19 # el local cierra a las 19:00 (último turno de 1 hora a las 18:00)
+DIAS_CERRADOS = (6,) # 0=Lunes, 6=Domingo
+DURACION_SLOT = 60 # minutos de cada horario
+DIAS_RESERVA = 5 # días hábiles que se ofrecen para reservar
+
+def es_dia_laborable(fecha) -> bool:
+  return fecha.weekday() not in DIAS_CERRADOS
+
+def dias_habiles(cantidad=DIAS_RESERVA, desde=None):
+  """
+  Devuelve los próximos días laborables empezando mañana.
+
+  Args:
+    cantidad: Cantidad de días a devolver.
+    desde: Fecha de referencia (por defecto, hoy).
+
+  Returns:
+    list[datetime.date]: Los días en orden cronológico.
+  """
+  hoy = desde or datetime.now().date()
+  dias = []
+  j = 1
+  while len(dias) < cantidad:
+    fecha = hoy + timedelta(days=j)
+    if es_dia_laborable(fecha):
+      dias.append(fecha)
+    j += 1
+  return dias
+
+def slots_necesarios(duracion_minutos) -> int:
+  """Cantidad de horarios consecutivos que ocupa un turno de esa duración (mínimo 1)."""
+  return max(1, ceil((duracion_minutos or 0) / DURACION_SLOT))
+
+def slots_del_turno(fecha_hora, duracion_minutos):
+  """Devuelve los horarios (datetime) que ocupa un turno que empieza en fecha_hora."""
+  return [fecha_hora + timedelta(minutes=DURACION_SLOT * i) for i in range(slots_necesarios(duracion_minutos))]
+
+def es_inicio_valido(fecha_hora, duracion_minutos) -> bool:
+  """
+  Verifica que un turno empiece en punto, en un día laborable, y que termine
+  antes del cierre.
+  """
+  if fecha_hora.minute or fecha_hora.second or not es_dia_laborable(fecha_hora.date()):
+    return False
+  return HORA_APERTURA <= fecha_hora.hour and fecha_hora.hour + slots_necesarios(duracion_minutos) <= HORA_CIERRE
+
+def _bitmap_libres(fecha, ocupacion, capacidad):
+  """Bitmap de las horas del día que todavía tienen lugar."""
+  libres = 0
+  for hora in range(HORA_APERTURA, HORA_CIERRE):
+    if ocupacion.get((fecha, hora), 0) < capacidad:
+      libres |= 1 << hora
+  return libres
+
+def _inicios_posibles(libres, slots):
+  """Bitmap de las horas donde pueden empezar `slots` horarios consecutivos libres."""
+  inicios = libres
+  for i in range(1, slots):
+    inicios &= libres >> i
+  return inicios
+
+def calcular_disponibilidad(dias, ocupacion, duracion_minutos, capacidad, agenda=None):
+  """
+  Calcula en una sola pasada los horarios de inicio disponibles para varios días.
+
+  Args:
+    dias: Días a evaluar (ver dias_habiles).
+    ocupacion: {(fecha, hora): ocupados} como lo devuelve Turno.listar_ocupacion.
+    duracion_minutos: Duración total de los servicios elegidos.
+    capacidad: Turnos simultáneos permitidos por horario.
+    agenda: AgendaPeluqueros opcional; si se indica, un horario solo se ofrece
+      si algún peluquero está libre durante todo el turno.
+
+  Returns:
+    dict: {fecha: [horas de inicio libres]} con los días en el mismo orden.
+  """
+  slots = slots_necesarios(duracion_minutos)
+  disponibilidad = {}
+
+  for fecha in dias:
+    if not es_dia_laborable(fecha):
+      disponibilidad[fecha] = []
+      continue
+
+    inicios = _inicios_posibles(_bitmap_libres(fecha, ocupacion, capacidad), slots)
+    horas = [hora for hora in range(HORA_APERTURA, HORA_CIERRE) if inicios >> hora & 1]
+
+    if agenda is not None:
+      horas = [hora for hora in horas if agenda.libres(datetime.combine(fecha, time(hora)), duracion_minutos)]
+
+    disponibilidad[fecha] = horas
+
+  return disponibilidad
+
+class AgendaPeluqueros:
+  """
+  Índice en memoria de los turnos asignados a cada peluquero.
+
+  Por peluquero se guardan dos listas paralelas (inicios y fines) ordenadas por
+  inicio. Como la reserva impide que un peluquero tenga turnos superpuestos, los
+  fines también quedan ordenados y alcanza con mirar el último turno que empieza
+  antes del fin del intervalo consultado: O(log n) por peluquero.
+  """
+
+  def __init__(self, peluqueros):
+    # peluqueros: lista de dicts con al menos 'id' (ver Usuario.listar_peluqueros)
+    self.peluqueros = {p['id']: p for p in peluqueros}
+    self._inicios = {p_id: [] for p_id in self.peluqueros}
+    self._fines = {p_id: [] for p_id in self.peluqueros}
+
+  @classmethod
+  def desde_turnos(cls, peluqueros, turnos):
+    """Arma la agenda a partir de filas con peluquero_id, fecha_hora y duracion (ver Turno.listar_agenda)."""
+    agenda = cls(peluqueros)
+    for t in sorted(turnos, key=lambda t: t['fecha_hora']):
+      agenda.agregar(t['peluquero_id'], t['fecha_hora'], t['duracion'])
+    return agenda
+
+  def agregar(self, peluquero_id, inicio, duracion_minutos):
+    if peluquero_id not in self._inicios:
+      return
+    fin = inicio + timedelta(minutes=duracion_minutos or DURACION_SLOT)
+    i = bisect_left(self._inicios[peluquero_id], inicio)
+    self._inicios[peluquero_id].insert(i, inicio)
+    self._fines[peluquero_id].insert(i, fin)
+
+  def esta_libre(self, peluquero_id, inicio, duracion_minutos) -> bool:
+    """True si el peluquero no tiene turnos que se superpongan con el intervalo."""
+    fin = inicio + timedelta(minutes=duracion_minutos or DURACION_SLOT)
+    i = bisect_left(self._inicios[peluquero_id], fin) # turnos que empiezan antes de 'fin'
+    return i == 0 or self._fines[peluquero_id][i - 1] <= inicio
+
+  def libres(self, inicio, duracion_minutos):
+    """Devuelve los IDs de los peluqueros libres durante todo el intervalo (¿quién está libre a las 15:00 por 90 min?)."""
+    return [p_id for p_id in self.peluqueros if self.esta_libre(p_id, inicio, duracion_minutos)]
@@ -9,10 +9,13 @@ from modelos.modelo_servicio import Servicio
 from modelos.modelo_usuario import Usuario
 from modelos.modelo_turno import Turno
 from modelos.modelo_turno_servicio import TurnoServicio
+from modelos.instrumentacion import medir_accion
 from .auxiliares import validar_email, validar_password, validar_nombre, obtener_entrada_valida, mostrar_tabla, seleccionar_dia_y_hora
+from . import disponibilidad
 
 console = Console()
 
+@medir_accion
 def cambiar_contraseña(user_id):
   while True:
     try:
@@ -100,21 +103,37 @@ def seleccionar_servicios(servicios: list) -> list:
   
   return servicios_seleccionados
 
-def solicitar_turno(user_id):
-  # Selecciona dia y hora
-  dia_hora_ocupados = Turno.listar_ocupados(estado='pendiente')
+def seleccionar_peluquero(peluqueros: list):
+  """
+  Permite al cliente elegir un peluquero entre los disponibles, o dejar que se
+  asigne el primero libre.
   
-  turno_final = seleccionar_dia_y_hora(dia_hora_ocupados)
-  if not turno_final:
-    console.print("[red]Proceso de turno abortado.[/red]")
-    print()
-    return
+  Returns:
+    dict | None: El peluquero elegido, o None si no hay ninguno o se cancela.
+  """
+  if not peluqueros:
+    console.print("[yellow]No hay peluqueros libres en ese horario.[/yellow]")
+    return None
   
-  console.print()
-  console.print(f"[green]Turno:[/green] {turno_final.strftime('%A %d/%m/%Y a las %H:%M')}")
-  console.print()
+  opcion_cualquiera = "✨ Cualquiera (primer peluquero libre)"
+  opciones_mapeadas = {opcion_cualquiera: peluqueros[0]}
+  for p in peluqueros:
+    opciones_mapeadas[f"💇 {p['nombre']} {p['apellido']}"] = p
+  
+  try:
+    opcion = inquirer.select(
+      message="Elige tu peluquero/a:",
+      choices=list(opciones_mapeadas.keys())
+    ).execute()
+  except KeyboardInterrupt:
+    console.print("[yellow]Selección de peluquero cancelada.[/yellow]")
+    return None
   
-  # Seleccionar servicios
+  return opciones_mapeadas[opcion]
+
+@medir_accion
+def solicitar_turno(user_id):
+  # Seleccionar servicios (su duración define qué horarios están disponibles)
   servicios = Servicio.listar_todos(solo_activos=True)
   servicios_seleccionados = seleccionar_servicios(servicios)
   
@@ -142,6 +161,40 @@ def solicitar_turno(user_id):
   console.print(f"[bold]Duración estimada total: {duracion_total} minutos[/bold]")
   console.print()
   
+  # Selecciona dia y hora (solo se consulta la ocupación de los días ofrecidos)
+  # La capacidad de cada horario es la cantidad de peluqueros activos; si no hay
+  # peluqueros cargados se usa la capacidad fija por horario.
+  dias = disponibilidad.dias_habiles()
+  peluqueros = Usuario.listar_peluqueros() or []
+  agenda = None
+  capacidad = Turno.CAPACIDAD_SLOT
+  if peluqueros:
+    agenda = disponibilidad.AgendaPeluqueros.desde_turnos(peluqueros, Turno.listar_agenda(dias[0], dias[-1]) or [])
+    capacidad = len(peluqueros)
+  
+  ocupacion = Turno.listar_ocupacion(dias[0], dias[-1])
+  horarios_libres = disponibilidad.calcular_disponibilidad(dias, ocupacion, duracion_total, capacidad, agenda)
+  
+  turno_final = seleccionar_dia_y_hora(horarios_libres)
+  if not turno_final:
+    console.print("[red]Proceso de turno abortado.[/red]")
+    print()
+    return
+  
+  # Elegir peluquero entre los libres durante todo el turno
+  peluquero = None
+  if agenda is not None:
+    peluquero = seleccionar_peluquero([agenda.peluqueros[p_id] for p_id in agenda.libres(turno_final, duracion_total)])
+    if not peluquero:
+      console.print("[red]Proceso de turno abortado.[/red]")
+      return
+  
+  console.print()
+  console.print(f"[green]Turno:[/green] {turno_final.strftime('%A %d/%m/%Y a las %H:%M')}")
+  if peluquero:
+    console.print(f"[green]Peluquero/a:[/green] {peluquero['nombre']} {peluquero['apellido']}")
+  console.print()
+  
   # Confirmar o cancelar
   try:
     confirmar = inquirer.confirm(
@@ -156,18 +209,29 @@ def solicitar_turno(user_id):
     console.print("[yellow]Turno cancelado por el usuario.[/yellow]")
     return
   
-  # Guardar en la base de datos
+  # Control final del horario con el mismo motor que armó el selector
+  if not disponibilidad.es_inicio_valido(turno_final, duracion_total):
+    console.print("[bold red]❌ El horario elegido está fuera del horario de atención para esos servicios.[/bold red]")
+    return
+  
+  # Guardar en la base de datos (turno y servicios en una sola transacción)
   try:
-    if Turno.verificar_disponibilidad(turno_final):
-      turno_id = Turno.crear(user_id, turno_final, total)
-    else:
-      # La capacidad está al máximo
-      console.print()
-      console.print("[bold red]❌ Lo sentimos, el horario seleccionado ya está lleno (3 turnos). Por favor, elige otra hora.[/bold red]")
-      return
+    with Turno.transaccion():
+      # La reserva controla la capacidad de todos los horarios que ocupa el turno de forma atómica
+      turno_id = Turno.reservar(
+        user_id, turno_final, total,
+        duracion=duracion_total,
+        slots=disponibilidad.slots_del_turno(turno_final, duracion_total),
+        limite_turnos=capacidad,
+        peluquero_id=peluquero['id'] if peluquero else None
+      )
+      if not turno_id:
+        # La capacidad está al máximo o el peluquero se ocupó mientras tanto
+        console.print()
+        console.print("[bold red]❌ Lo sentimos, el horario seleccionado ya no está disponible. Por favor, elige otra hora.[/bold red]")
+        return
 
-    for s in servicios_seleccionados:
-      TurnoServicio.agregar_servicio(turno_id, s["id"], s["precio"])
+      TurnoServicio.agregar_servicios(turno_id, [(s["id"], s["precio"]) for s in servicios_seleccionados])
   except Exception as e:
     console.print(f"[ERROR] Error al guardar en la base de datos: {e}")
     return
@@ -179,6 +243,7 @@ def solicitar_turno(user_id):
   console.print(f"Fecha: [bold]{turno_final.strftime('%d/%m/%Y %H:%M')}[/bold]")
   console.print(f"Total: [bold cyan]$ {total:.2f}[/bold cyan]")
   
+@medir_accion
 def listar_turnos_cliente(user_id):
   turnos = Turno.listar_para_cliente(user_id)
   
@@ -220,6 +285,7 @@ def listar_turnos_cliente(user_id):
   console.print(tabla)
   console.print() 
   
+@medir_accion
 def cancelar_turno(user_id):
   # Obtener todos los turnos del cliente
   turnos = Turno.listar_para_cliente(user_id)
@@ -260,9 +326,11 @@ def cancelar_turno(user_id):
     ).execute()
     
     if confirmacion:
-      # Cambiar estado en la base de datos
-      Turno.actualizar_estado(turno_id_a_cancelar, 'cancelado') 
-      console.print(f"\n[bold green]✅ Turno #{turno_id_a_cancelar} cancelado con éxito.[/bold green]")
+      # Cambiar estado en la base de datos y liberar el horario
+      if Turno.cancelar(turno_id_a_cancelar):
+        console.print(f"\n[bold green]✅ Turno #{turno_id_a_cancelar} cancelado con éxito.[/bold green]")
+      else:
+        console.print(f"\n[bold yellow]El turno #{turno_id_a_cancelar} ya no está activo.[/bold yellow]")
       console.print()
     else:
       console.print("\n[bold yellow]Operación de cancelación abortada por el usuario.[/bold yellow]")
@@ -1,3 +1,6 @@
+import time
+from datetime import date, datetime
+
 from rich.console import Console
 from InquirerPy import inquirer
 from rich.rule import Rule
@@ -7,14 +10,17 @@ from decimal import Decimal
 from modelos.modelo_turno import Turno
 from modelos.modelo_usuario import Usuario
 from modelos.modelo_turno_servicio import TurnoServicio
+from modelos.modelo_reporte import Reporte
+from modelos.instrumentacion import medir_accion
 
-from .auxiliares import obtener_entrada_valida, validar_email, validar_duracion
+from .auxiliares import obtener_entrada_valida, validar_email, validar_duracion, seleccionar_paginado
 from .gestion_servicios import listar_servicios
-from .generador_pdf import generar_ticket_pdf
+from .generador_pdf import cola_tickets, generar_cierre_pdf, generar_tickets_lote, resumir_cierre
 
 console = Console()
 
 
+@medir_accion
 def gestion_turnos():
   """
   Permite al recepcionista buscar y confirmar la llegada de un cliente (cambiar estado a 'confirmado').
@@ -121,14 +127,17 @@ def gestion_turnos():
       ).execute()
       
       if confirmacion:
-        # Llama a la función del modelo para actualizar el estado
-        Turno.actualizar_estado(turno_a_confirmar['id'], 'confirmado') 
-        console.print(f"\n[bold green]✅ Turno ID {turno_a_confirmar['id']} CONFIRMADO exitosamente. Cliente listo para ser atendido.[/bold green]")
+        # Solo se confirma si sigue pendiente (el cliente pudo cancelarlo mientras tanto)
+        if Turno.cambiar_estado(turno_a_confirmar['id'], 'pendiente', 'confirmado'):
+          console.print(f"\n[bold green]✅ Turno ID {turno_a_confirmar['id']} CONFIRMADO exitosamente. Cliente listo para ser atendido.[/bold green]")
+        else:
+          console.print(f"\n[bold red]❌ El turno ID {turno_a_confirmar['id']} ya no está pendiente (fue cancelado o confirmado por otro usuario).[/bold red]")
       else:
         console.print("[yellow]Operación de confirmación cancelada.[/yellow]")
     except KeyboardInterrupt:
       console.print("[yellow]Confirmación interrumpida.[/yellow]")
   
+@medir_accion
 def consulta_clientes():
   """
   Permite al recepcionista buscar clientes por nombre similar, seleccionar uno, 
@@ -217,6 +226,7 @@ def mostrar_detalle_cobro(turno_info: dict, detalle_servicios: list):
   total_decimal = turno_info['total'] if isinstance(turno_info['total'], Decimal) else Decimal(str(turno_info['total']))
   console.print(f"\n[bold white on green]TOTAL COBRADO: ${total_decimal:.2f}[/bold white on green]\n")
 
+@medir_accion
 def cobrar_turno():
   """
   Permite al recepcionista seleccionar un turno 'confirmado', cambiar su estado a 
@@ -225,37 +235,30 @@ def cobrar_turno():
   console.print(Rule(title="[bold blue]Finalizar y Cobrar Turno[/bold blue]", style="bold blue"))
   
   try:
-    # 1. Listar turnos con estado 'confirmado'
-    turnos_confirmados = Turno.listar(estado='confirmado')
-    
-    if not turnos_confirmados:
-      console.print("[yellow]No hay turnos con estado 'confirmado' listos para ser cobrados.[/yellow]")
-      return
+    # 1. Listar turnos con estado 'confirmado' (por páginas, a medida que se piden)
+    def cargar_pagina(ultimo):
+      if ultimo is None:
+        return Turno.listar_pagina(estado='confirmado')
+      return Turno.listar_pagina(estado='confirmado', after_fecha=ultimo['fecha_hora'], after_id=ultimo['id'])
 
-    # 2. Preparar opciones para la selección
-    opciones_mapeadas = {}
-    choices = []
-    
-    for t in turnos_confirmados:
+    # 2. Preparar la etiqueta de cada opción
+    def formatear(t):
       fecha_hora_str = t['fecha_hora'].strftime("%H:%M")
-      label = (
+      return (
         f"ID {t['id']} | {fecha_hora_str} | Cliente: {t['cliente_nombre']} {t['cliente_apellido']} "
         f"(Total: ${t['total']:.2f})"
       )
-      choices.append(label)
-      opciones_mapeadas[label] = t
         
     # 3. Seleccionar el turno a cobrar
-    opcion_seleccionada_str = inquirer.select(
+    turno_a_cobrar = seleccionar_paginado(
       message="Selecciona el turno para cobrar:",
-      choices=choices,
+      cargar_pagina=cargar_pagina,
+      formatear=formatear,
       qmark="💰"
-    ).execute()
-    
-    turno_a_cobrar = opciones_mapeadas.get(opcion_seleccionada_str)
+    )
     
     if not turno_a_cobrar:
-      console.print("[yellow]Selección cancelada.[/yellow]")
+      console.print("[yellow]No hay turnos con estado 'confirmado' listos para ser cobrados.[/yellow]")
       return
           
     # 4. Confirmar el Cobro
@@ -267,25 +270,209 @@ def cobrar_turno():
       console.print("[yellow]Cobro cancelado por el usuario.[/yellow]")
       return
         
-    # 5. Realizar el Cobro (Actualizar estado y obtener detalle)
-    
-    # a) Actualizar estado a 'realizado'
-    Turno.actualizar_estado(turno_a_cobrar['id'], 'realizado')
-    
-    # b) Obtener detalle de servicios (incluye precios cobrados)
-    detalle_servicios = TurnoServicio.listar_por_turno(turno_a_cobrar['id'])
+    # 5. Realizar el Cobro (Actualizar estado y obtener detalle en una sola transacción)
+    with Turno.transaccion():
+      # a) Pasar a 'realizado' y sumarlo a los reportes (solo si sigue confirmado: otro recepcionista pudo cobrarlo)
+      if not Turno.registrar_cobro(turno_a_cobrar['id']):
+        console.print(f"[bold red]❌ El turno ID {turno_a_cobrar['id']} ya no está confirmado (fue cobrado o cancelado).[/bold red]")
+        return
+      
+      # b) Fecha de cobro registrada: el ticket se guarda en la carpeta de ese día, no en la de cuando lo dibuje la cola
+      turno_a_cobrar['fecha_cobro'] = Turno.fechas_cobro([turno_a_cobrar['id']]).get(turno_a_cobrar['id'])
+
+      # c) Obtener detalle de servicios (incluye precios cobrados)
+      detalle_servicios = TurnoServicio.listar_por_turno(turno_a_cobrar['id'])
     
-    # c) Mostrar detalle final
+    # d) Mostrar detalle final
     mostrar_detalle_cobro(turno_a_cobrar, detalle_servicios)
     
-    #d) Generar ticket pdf
-    generar_ticket_pdf(turno_a_cobrar, detalle_servicios)
+    # e) Generar ticket pdf en segundo plano (el cobro no espera al PDF)
+    if cola_tickets.encolar(turno_a_cobrar, detalle_servicios):
+      console.print("[cyan]🧾 Ticket en preparación.[/cyan]")
+    else:
+      error = cola_tickets.estado(turno_a_cobrar['id'])['error']
+      console.print(f"[yellow]⚠️ El ticket del turno ID {turno_a_cobrar['id']} no se generó: {error}[/yellow]")
       
   except KeyboardInterrupt:
     console.print("[yellow]Operación cancelada. Volviendo al menú.[/yellow]")
   except Exception as e:
     console.print(f"[bold red]❌ Ocurrió un error al procesar el cobro:[/bold red] {e}")
   
+@medir_accion
+def anular_cobro():
+  """
+  Anula el cobro de un turno 'realizado' (por ejemplo, un cobro hecho por error):
+  lo descuenta de los reportes de facturación y lo deja 'cancelado'.
+  """
+  console.print(Rule(title="[bold red]Anular Cobro[/bold red]", style="bold red"))
+
+  try:
+    turno_id_str = obtener_entrada_valida(
+      message="Ingresa el ID del Turno cobrado:",
+      validator_func=validar_duracion, # valida un número entero positivo
+      error_message="El ID debe ser un número entero válido."
+    )
+    if turno_id_str is None:
+      return
+    turno_id = int(turno_id_str)
+
+    confirmacion = inquirer.confirm(
+      message=f"¿Confirmas la anulación del cobro del turno ID {turno_id}? Se descontará de los reportes."
+    ).execute()
+    if not confirmacion:
+      console.print("[yellow]Anulación cancelada por el usuario.[/yellow]")
+      return
+
+    if Turno.anular_cobro(turno_id):
+      console.print(f"[bold green]✅ Cobro del turno ID {turno_id} anulado. El turno quedó 'cancelado'.[/bold green]")
+    else:
+      console.print(f"[bold red]❌ El turno ID {turno_id} no existe o no está cobrado.[/bold red]")
+
+  except KeyboardInterrupt:
+    console.print("[yellow]Operación cancelada. Volviendo al menú.[/yellow]")
+  except Exception as e:
+    console.print(f"[bold red]❌ Ocurrió un error al anular el cobro:[/bold red] {e}")
+
+def _totales_del_dia(fecha):
+  """
+  Turnos, total y facturación por servicio de un día, leídos de los resúmenes
+  de facturación (Reporte) en lugar de recorrer los turnos.
+
+  Returns:
+    dict: turnos, total y por_servicio (lista de (nombre, cantidad, ingresos)), como resumir_cierre.
+  """
+  resumen = Reporte.resumen(fecha, fecha) or []
+  return {
+    'turnos': resumen[0]['turnos'] if resumen else 0,
+    'total': resumen[0]['ingresos'] if resumen else Decimal(0),
+    'por_servicio': [
+      (s['nombre'] or f"Servicio {s['servicio_id']}", int(s['cantidad']), Decimal(s['ingresos']))
+      for s in Reporte.por_servicio(fecha, fecha) or []
+    ],
+  }
+
+@medir_accion
+def cierre_de_caja():
+  """
+  Cierre de caja: cobra de una vez los turnos 'confirmado' de hoy (o los que se
+  elijan), genera el resumen del cierre en PDF y los tickets, y muestra los
+  totales del cierre y del día. Los confirmados de días anteriores no entran:
+  se cobran uno por uno con cobrar_turno.
+  """
+  console.print(Rule(title="[bold blue]Cierre de Caja[/bold blue]", style="bold blue"))
+
+  cobrados = []
+  try:
+    # 1. Turnos confirmados de hoy
+    hoy = date.today()
+    confirmados = Turno.listar_confirmados(hoy, hoy) or []
+    if not confirmados:
+      console.print("[yellow]No hay turnos con estado 'confirmado' para cobrar hoy.[/yellow]")
+      return
+
+    total = sum(Decimal(str(t['total'] or 0)) for t in confirmados)
+    todos = inquirer.confirm(
+      message=f"¿Cobrar los {len(confirmados)} turnos confirmados (total ${total:,.2f})?",
+      default=True
+    ).execute()
+    if todos:
+      seleccionados = confirmados
+    else:
+      opciones = {
+        f"ID {t['id']} | {t['fecha_hora']:%H:%M} | {t['cliente_nombre']} {t['cliente_apellido']} (${t['total']:.2f})": t
+        for t in confirmados
+      }
+      elegidos = inquirer.select(
+        message="Selecciona los turnos a cobrar:",
+        choices=list(opciones),
+        multiselect=True,
+        long_instruction="(Usa ESPACIO para marcar/desmarcar, ENTER para confirmar)"
+      ).execute()
+      seleccionados = [opciones[e] for e in elegidos]
+      if not seleccionados:
+        console.print("[yellow]No se seleccionó ningún turno. Cierre cancelado.[/yellow]")
+        return
+
+    inicio = time.perf_counter()
+
+    # 2. Cobro y lectura de los cobrados en una transacción: se leen los turnos y
+    # servicios que se acaban de cobrar, con los turnos todavía bloqueados (los que
+    # otro recepcionista cobró o canceló mientras tanto se omiten)
+    with Turno.transaccion():
+      cobrados = Turno.registrar_cobros([t['id'] for t in seleccionados])
+      turnos = Turno.listar_por_ids(cobrados)
+      servicios = TurnoServicio.listar_por_turnos(cobrados)
+    omitidos = len(seleccionados) - len(cobrados)
+    if not cobrados:
+      console.print("[yellow]Ninguno de los turnos seguía confirmado: no se cobró nada.[/yellow]")
+      return
+    tickets = [(t, servicios.get(t['id'], [])) for t in turnos]
+
+    # 3. Totales del día, de los resúmenes de facturación (ya incluyen este cierre)
+    dia = _totales_del_dia(hoy)
+    cierre = resumir_cierre(turnos, servicios)
+
+    # 4. Resumen del cierre y tickets (repartidos entre procesos). El cobro ya está
+    # confirmado: si falla un PDF se informa aparte y no se vuelve a cobrar
+    ruta_cierre = error_cierre = None
+    encolados = []
+    with console.status(f"Generando el resumen del cierre y {len(tickets)} ticket(s)..."):
+      try:
+        ruta_cierre = generar_cierre_pdf(datetime.now(), turnos, servicios, dia)
+      except Exception as e:
+        error_cierre = e
+      try:
+        resultados = generar_tickets_lote(tickets)
+        errores = [turno_id for turno_id, _, _, error in resultados if error]
+      except Exception:
+        # Sin el pool de procesos los tickets se generan en segundo plano, como al cobrar uno
+        resultados = []
+        encolados = [t['id'] for t, detalle in tickets if cola_tickets.encolar(t, detalle)]
+        errores = [t['id'] for t, _ in tickets if t['id'] not in encolados]
+    generados = len(resultados) - len(errores) if resultados else 0
+    demora = time.perf_counter() - inicio
+
+    # 5. Totales
+
+    tabla = Table(title=f"💵 Cierre de caja {hoy:%d/%m/%Y}", show_header=True, header_style="bold magenta")
+    tabla.add_column("", style="cyan")
+    tabla.add_column("Turnos", justify="right")
+    tabla.add_column("💰 Total", justify="right", style="green")
+    tabla.add_row("Cobrados en este cierre", str(cierre['turnos']), f"${cierre['total']:,.2f}")
+    tabla.add_row("[bold]Total del día[/bold]", f"[bold]{dia['turnos']}[/bold]", f"[bold]${dia['total']:,.2f}[/bold]")
+
+    por_servicio = Table(title="💇 Por servicio (día)", show_header=True, header_style="bold magenta")
+    por_servicio.add_column("Servicio", style="cyan")
+    por_servicio.add_column("Cantidad", justify="right")
+    por_servicio.add_column("💰 Ingresos", justify="right", style="green")
+    for nombre, cantidad, ingresos in dia['por_servicio']:
+      por_servicio.add_row(nombre, str(cantidad), f"${ingresos:,.2f}")
+
+    console.print()
+    console.print(tabla)
+    console.print(por_servicio)
+    if omitidos:
+      console.print(f"[yellow]⚠️ {omitidos} turno(s) ya no estaban confirmados (fueron cobrados o cancelados) y se omitieron.[/yellow]")
+    if ruta_cierre:
+      console.print(f"[bold green]✅ Resumen del cierre:[/bold green] [yellow]{ruta_cierre}[/yellow]")
+    else:
+      console.print(f"[yellow]⚠️ Los {len(cobrados)} turnos quedaron cobrados, pero no se pudo generar el resumen del cierre: {error_cierre}[/yellow]")
+    console.print(f"[cyan]🧾 {generados} ticket(s) generados.[/cyan]")
+    if encolados:
+      console.print(f"[cyan]🧾 {len(encolados)} ticket(s) en cola; se generan en segundo plano.[/cyan]")
+    if errores:
+      console.print(f"[yellow]⚠️ No se pudieron generar los tickets de los turnos: {', '.join(map(str, errores))}[/yellow]")
+      console.print(f"[yellow]   Se pueden generar después con: python scripts/exportar_tickets.py --desde {hoy} --hasta {hoy}[/yellow]")
+    console.print(f"[dim]Cierre hecho en {demora:.1f} s.[/dim]")
+    console.print()
+
+  except KeyboardInterrupt:
+    console.print("[yellow]Operación cancelada. Volviendo al menú.[/yellow]")
+  except Exception as e:
+    console.print(f"[bold red]❌ Ocurrió un error en el cierre de caja:[/bold red] {e}")
+    if cobrados:
+      console.print(f"[yellow]Los {len(cobrados)} turnos ya quedaron cobrados; no vuelvas a hacer el cierre. Los tickets se generan con: python scripts/exportar_tickets.py --desde {date.today()} --hasta {date.today()}[/yellow]")
+
 def listar_servicios_recepcion() :
   listar_servicios()
   
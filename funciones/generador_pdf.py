@@ -1,85 +1,627 @@
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
 from decimal import Decimal
+import atexit
+import io
+import multiprocessing
 import os # Necesario para manejar rutas de archivos
-from rich.console import Console
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from dotenv import load_dotenv
 
-console = Console()
+from .almacen_tickets import crear_almacen
+
+load_dotenv()
 
 # --- Constantes y Configuración ---
-PDF_PATH = os.path.join(os.getcwd(), 'tickets')
-
-# Asegúrate de que el directorio exista
-if not os.path.exists(PDF_PATH):
-  os.makedirs(PDF_PATH)
-    
-def generar_ticket_pdf(turno_info: dict, detalle_servicios: list):
-  """Genera y guarda el detalle de cobro como un archivo PDF (Ticket)."""
-  
-  # 1. Preparar la información
-  turno_id = turno_info['id']
-  cliente = f"{turno_info['cliente_nombre']} {turno_info['cliente_apellido']}"
-  fecha_hora_str = turno_info['fecha_hora'].strftime("%d/%m/%Y %H:%M")
-  total_decimal = turno_info['total'] if isinstance(turno_info['total'], Decimal) else Decimal(str(turno_info['total']))
-  
-  filename = os.path.join(PDF_PATH, f"Ticket_{turno_id}_{turno_info['cliente_apellido']}.pdf")
-  
-  c = canvas.Canvas(filename, pagesize=letter)
-  width, height = letter # 612x792 puntos (puntos = 1/72 pulgada)
-  
-  y = height - 50 # Posición inicial vertical (cerca de la parte superior)
-  line_height = 20
-  
-  # 2. Encabezado del Ticket
-  c.setFont("Helvetica-Bold", 16)
-  c.drawString(inch, y, "SALÓN DE BELLEZA")
-  y -= line_height * 1.5
-  
-  c.setFont("Helvetica-Bold", 12)
-  c.drawString(inch, y, f"RECIBO DE PAGO - TURNO ID: {turno_id}")
-  y -= line_height
-  
-  # 3. Datos del Cliente y Fecha
-  c.setFont("Helvetica", 10)
-  c.drawString(inch, y, f"Cliente: {cliente}")
-  y -= line_height
-  c.drawString(inch, y, f"Fecha y Hora: {fecha_hora_str}")
-  y -= line_height * 2
-  
-  # 4. Detalle de Servicios (Tabla simple)
-  c.setFont("Helvetica-Bold", 10)
-  c.drawString(inch, y, "SERVICIO")
-  c.drawString(inch * 4, y, "PRECIO")
-  y -= line_height / 2
-  c.line(inch, y, inch * 6, y) # Línea divisoria
-  y -= line_height
-  
-  c.setFont("Helvetica", 10)
-  for servicio in detalle_servicios:
-      precio_str = f"${servicio['precio_cobrado']:.2f}"
-      
-      c.drawString(inch, y, servicio['nombre'])
-      c.drawString(inch * 4, y, precio_str)
-      y -= line_height
-      
-  y -= line_height / 2
-  c.line(inch, y, inch * 6, y) # Línea divisoria
-  y -= line_height
-  
-  # 5. Total
-  c.setFont("Helvetica-Bold", 12)
-  c.drawString(inch, y, "TOTAL COBRADO:")
-  c.drawString(inch * 4, y, f"${total_decimal:.2f}")
-  y -= line_height * 2
-  
-  # 6. Mensaje Final
-  c.setFont("Helvetica-Oblique", 10)
-  c.drawString(inch, y, "¡Gracias por su preferencia!")
-  
-  # 7. Finalizar y Guardar
-  c.showPage()
+PDF_PATH = os.getenv("TICKETS_DIR") or os.path.join(os.getcwd(), 'tickets')
+
+def _dibujar_ticket(turno_info: dict, detalle_servicios: list):
+  """
+  Dibuja el ticket en memoria.
+
+  El canvas es invariante (sin fecha de creación ni ID al azar): el mismo
+  ticket da siempre los mismos bytes, y así el almacén reconoce por su hash un
+  ticket regenerado sin cambios.
+
+  Returns:
+    bytes: El PDF.
+  """
+  # reportlab se importa recién al generar el primer ticket (ver main.py)
+  from reportlab.pdfgen import canvas
+
+  plantilla = obtener_plantilla()
+  salida = io.BytesIO()
+  c = canvas.Canvas(salida, pagesize=(plantilla.ANCHO, plantilla.ALTO), invariant=1)
+  plantilla.dibujar(c, turno_info, detalle_servicios)
   c.save()
-  
-  console.print(f"[bold green]✅ Ticket generado en:[/bold green] [yellow]{filename}[/yellow]")
+  return salida.getvalue()
+
+def _guardar_ticket(turno_info: dict, detalle_servicios: list, almacen=None):
+  """
+  Dibuja el ticket y lo guarda en el almacén (por defecto almacen_tickets),
+  en la carpeta del día de cobro (o de hoy, si el turno se está cobrando).
+
+  Returns:
+    tuple: (ruta, estado) como AlmacenDirectorio.guardar.
+  """
+  almacen = almacen or almacen_tickets
+  fecha = turno_info.get('fecha_cobro') or datetime.now()
+  return almacen.guardar(turno_info['id'], fecha, _dibujar_ticket(turno_info, detalle_servicios))
+
+def _generar_ticket(turno_info: dict, detalle_servicios: list):
+  """
+  Genera y guarda el ticket sin imprimir nada (lo usan también los hilos de ColaTickets).
+
+  Returns:
+    str: Ruta del ticket guardado.
+  """
+  return _guardar_ticket(turno_info, detalle_servicios)[0]
+
+
+# --- Plantilla del ticket ---
+
+class PlantillaTicket:
+  """
+  Diseño del ticket, separado en partes fijas y campos variables.
+
+  Las partes fijas (título, etiquetas, encabezados de columna, líneas
+  divisorias, leyenda del total y mensaje final) pueden dibujarse como form
+  XObjects de reportlab: se definen una vez por documento y cada hoja solo las
+  referencia con doForm. Conviene cuando el documento tiene varias hojas (un
+  ticket largo o muchos tickets en un mismo PDF); en un PDF de una sola hoja
+  el form agrega un objeto más y sale más caro que dibujarlas directamente
+  (ver scripts/benchmark_tickets.py). Los campos variables (turno, cliente,
+  fecha, servicios y total) van en un solo objeto de texto por hoja.
+
+  Si los servicios no entran en una hoja continúan en la siguiente, con el
+  encabezado repetido y el total en la última.
+  """
+  ANCHO, ALTO = 612, 792 # carta, en puntos (1/72 pulgada)
+  MARGEN = 72 # una pulgada
+  COLUMNA_PRECIO = 72 * 4
+  FIN_LINEA = 72 * 6
+  RENGLON = 20
+  MARGEN_INFERIOR = 50
+
+  # Renglones del encabezado (igual que el ticket original)
+  Y_TITULO = ALTO - 50
+  Y_TURNO = Y_TITULO - RENGLON * 1.5
+  Y_CLIENTE = Y_TURNO - RENGLON
+  Y_FECHA = Y_CLIENTE - RENGLON
+  Y_COLUMNAS = Y_FECHA - RENGLON * 2
+  Y_DIVISOR = Y_COLUMNAS - RENGLON / 2
+  Y_PRIMER_SERVICIO = Y_DIVISOR - RENGLON
+
+  # El pie se dibuja debajo del último servicio: divisor, total y mensaje final
+  PIE_DIVISOR = RENGLON / 2 + RENGLON # desde el último servicio hasta el divisor
+  PIE_TOTAL = RENGLON # desde el divisor hasta el total
+  PIE_ALTO = PIE_DIVISOR + PIE_TOTAL + RENGLON * 2 # desde el último servicio hasta el mensaje final
+
+  FORM_ENCABEZADO = "ticket_encabezado"
+  FORM_PIE = "ticket_pie"
+  FORM_CONTINUA = "ticket_continua"
+
+  FUENTE_TITULO = ("Helvetica-Bold", 16)
+  FUENTE_SUBTITULO = ("Helvetica-Bold", 12)
+  FUENTE_TEXTO = ("Helvetica", 10)
+  FUENTE_NEGRITA = ("Helvetica-Bold", 10)
+  FUENTE_ITALICA = ("Helvetica-Oblique", 10)
+
+  ETIQUETA_TURNO = "RECIBO DE PAGO - TURNO ID: "
+  ETIQUETA_CLIENTE = "Cliente: "
+  ETIQUETA_FECHA = "Fecha y Hora: "
+
+  def __init__(self):
+    from reportlab import rl_config
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    # Flujos comprimidos en binario, sin la codificación ASCII85: está hecha en
+    # Python puro y agrega un 25% al tamaño de cada flujo
+    rl_config.useA85 = 0
+
+    # Los valores van a continuación de sus etiquetas: los anchos se miden una sola vez
+    self.x_turno = self.MARGEN + stringWidth(self.ETIQUETA_TURNO, *self.FUENTE_SUBTITULO)
+    self.x_cliente = self.MARGEN + stringWidth(self.ETIQUETA_CLIENTE, *self.FUENTE_TEXTO)
+    self.x_fecha = self.MARGEN + stringWidth(self.ETIQUETA_FECHA, *self.FUENTE_TEXTO)
+
+    # Servicios por hoja: en la última tiene que entrar el pie, en las demás la leyenda "continúa"
+    self.por_hoja = int((self.Y_PRIMER_SERVICIO - self.MARGEN_INFERIOR - self.RENGLON) // self.RENGLON) + 1
+    self.por_ultima = int((self.Y_PRIMER_SERVICIO - self.MARGEN_INFERIOR - self.PIE_ALTO) // self.RENGLON) + 1
+
+  def hojas(self, detalle_servicios):
+    """
+    Reparte los servicios en hojas.
+
+    Returns:
+      list[list]: Los servicios de cada hoja; la última siempre tiene lugar para el pie.
+    """
+    hojas = []
+    resto = list(detalle_servicios)
+    while len(resto) > self.por_ultima:
+      # Al menos un servicio queda para la última hoja, así el total no aparece solo
+      cantidad = min(self.por_hoja, len(resto) - 1)
+      hojas.append(resto[:cantidad])
+      resto = resto[cantidad:]
+    hojas.append(resto)
+    return hojas
+
+  # --- Partes fijas ---
+
+  def _dibujar_encabezado(self, c):
+    c.setFont(*self.FUENTE_TITULO)
+    c.drawString(self.MARGEN, self.Y_TITULO, "SALÓN DE BELLEZA")
+    c.setFont(*self.FUENTE_SUBTITULO)
+    c.drawString(self.MARGEN, self.Y_TURNO, self.ETIQUETA_TURNO)
+    c.setFont(*self.FUENTE_TEXTO)
+    c.drawString(self.MARGEN, self.Y_CLIENTE, self.ETIQUETA_CLIENTE)
+    c.drawString(self.MARGEN, self.Y_FECHA, self.ETIQUETA_FECHA)
+    c.setFont(*self.FUENTE_NEGRITA)
+    c.drawString(self.MARGEN, self.Y_COLUMNAS, "SERVICIO")
+    c.drawString(self.COLUMNA_PRECIO, self.Y_COLUMNAS, "PRECIO")
+    c.line(self.MARGEN, self.Y_DIVISOR, self.FIN_LINEA, self.Y_DIVISOR)
+
+  def _dibujar_pie(self, c):
+    # Con origen en el último servicio (se ubica con translate)
+    y = -self.PIE_DIVISOR
+    c.line(self.MARGEN, y, self.FIN_LINEA, y)
+    c.setFont(*self.FUENTE_SUBTITULO)
+    c.drawString(self.MARGEN, y - self.PIE_TOTAL, "TOTAL COBRADO:")
+    c.setFont(*self.FUENTE_ITALICA)
+    c.drawString(self.MARGEN, -self.PIE_ALTO, "¡Gracias por su preferencia!")
+
+  def _dibujar_continua(self, c):
+    c.setFont(*self.FUENTE_ITALICA)
+    c.drawString(self.MARGEN, self.MARGEN_INFERIOR, "Continúa en la hoja siguiente...")
+
+  def _parte_fija(self, c, nombre, dibujar, formas, **limites):
+    """
+    Dibuja una parte fija. Con `formas` la define como form del documento la
+    primera vez y después solo la referencia; si no, la dibuja directamente.
+    """
+    if not formas:
+      dibujar(c)
+      return
+    if not c.hasForm(nombre):
+      c.beginForm(nombre, **limites)
+      dibujar(c)
+      c.endForm()
+    c.doForm(nombre)
+
+  # --- Ticket ---
+
+  def dibujar(self, c, turno_info: dict, detalle_servicios: list, formas=None):
+    """
+    Dibuja un ticket en el canvas `c`, en una o más hojas (cada una termina con showPage).
+
+    Args:
+      c (Canvas): Canvas de reportlab; puede recibir varios tickets seguidos.
+      turno_info (dict): id, cliente_nombre, cliente_apellido, fecha_hora y total.
+      detalle_servicios (list): Servicios con nombre y precio_cobrado.
+      formas (bool): Si las partes fijas se reutilizan como forms. Por defecto
+        solo cuando el ticket ocupa más de una hoja; quien dibuja muchos
+        tickets en el mismo canvas debería pasar True.
+    """
+    turno_id = str(turno_info['id'])
+    cliente = f"{turno_info['cliente_nombre']} {turno_info['cliente_apellido']}"
+    fecha_hora_str = turno_info['fecha_hora'].strftime("%d/%m/%Y %H:%M")
+    total_decimal = turno_info['total'] if isinstance(turno_info['total'], Decimal) else Decimal(str(turno_info['total']))
+
+    hojas = self.hojas(detalle_servicios)
+    if formas is None:
+      formas = len(hojas) > 1
+
+    for numero, servicios in enumerate(hojas, start=1):
+      self._parte_fija(c, self.FORM_ENCABEZADO, self._dibujar_encabezado, formas)
+
+      texto = c.beginText()
+      texto.setFont(*self.FUENTE_SUBTITULO)
+      texto.setTextOrigin(self.x_turno, self.Y_TURNO)
+      texto.textOut(turno_id)
+      texto.setFont(*self.FUENTE_TEXTO)
+      texto.setTextOrigin(self.x_cliente, self.Y_CLIENTE)
+      texto.textOut(cliente)
+      texto.setTextOrigin(self.x_fecha, self.Y_FECHA)
+      texto.textOut(fecha_hora_str)
+
+      y = self.Y_PRIMER_SERVICIO
+      for servicio in servicios:
+        texto.setTextOrigin(self.MARGEN, y)
+        texto.textOut(servicio['nombre'])
+        texto.setTextOrigin(self.COLUMNA_PRECIO, y)
+        texto.textOut(f"${servicio['precio_cobrado']:.2f}")
+        y -= self.RENGLON
+
+      ultima = numero == len(hojas)
+      if ultima:
+        # Origen del pie: el renglón del último servicio (o el del primero si la hoja quedó vacía)
+        base = y + self.RENGLON
+        texto.setFont(*self.FUENTE_SUBTITULO)
+        texto.setTextOrigin(self.COLUMNA_PRECIO, base - self.PIE_DIVISOR - self.PIE_TOTAL)
+        texto.textOut(f"${total_decimal:.2f}")
+      c.drawText(texto)
+
+      if ultima:
+        c.saveState()
+        c.translate(0, base)
+        self._parte_fija(
+          c, self.FORM_PIE, self._dibujar_pie, formas,
+          lowery=-self.PIE_ALTO - self.RENGLON, uppery=self.RENGLON
+        )
+        c.restoreState()
+      else:
+        self._parte_fija(c, self.FORM_CONTINUA, self._dibujar_continua, formas)
+      if len(hojas) > 1:
+        c.setFont(*self.FUENTE_TEXTO)
+        c.drawRightString(self.FIN_LINEA, self.MARGEN_INFERIOR, f"Hoja {numero} de {len(hojas)}")
+      c.showPage()
+
+_plantilla = None
+
+def obtener_plantilla():
+  """La plantilla (con sus medidas y la configuración de reportlab) se arma una sola vez por proceso."""
+  global _plantilla
+  if _plantilla is None:
+    _plantilla = PlantillaTicket()
+  return _plantilla
+
+
+# --- Generación por lotes ---
+
+def _dibujar_lote(tickets, almacen):
+  """
+  Dibuja y guarda un lote de tickets (se ejecuta en un proceso de generar_tickets_lote).
+
+  Returns:
+    list[tuple]: (turno_id, ruta, estado, error) por ticket; ruta y estado son None si falló.
+  """
+  resultados = []
+  for turno_info, detalle_servicios in tickets:
+    try:
+      ruta, estado = _guardar_ticket(turno_info, detalle_servicios, almacen)
+      resultados.append((turno_info['id'], ruta, estado, None))
+    except Exception as e:
+      resultados.append((turno_info['id'], None, None, str(e)))
+  return resultados
+
+def generar_tickets_lote(tickets, almacen=None, procesos=None, tamano_lote=50, al_avanzar=None):
+  """
+  Genera muchos tickets repartiendo el dibujo entre varios procesos.
+
+  Se usan procesos y no hilos porque reportlab es Python puro: con hilos los
+  tickets se dibujarían de a uno por el GIL. Cada proceso recibe lotes de
+  `tamano_lote` tickets para no pagar el envío entre procesos por cada uno.
+  Los procesos se crean con "spawn" y no con fork: desde la app interactiva
+  (cierre de caja) un fork copiaría hilos con locks tomados y las conexiones
+  del pool a la base.
+  Un ticket que falla no frena al resto: queda informado en el resultado.
+
+  Args:
+    tickets (list): Tuplas (turno_info, detalle_servicios), con el formato de PlantillaTicket.dibujar.
+    almacen: Dónde se guardan (por defecto almacen_tickets); se envía a cada proceso.
+    procesos (int): Procesos a usar (por defecto uno por núcleo). Con 1 no se crea el pool.
+    tamano_lote (int): Tickets por tarea enviada a cada proceso.
+    al_avanzar (callable): Se llama con la cantidad de tickets de cada lote terminado.
+
+  Returns:
+    list[tuple]: (turno_id, ruta, estado, error) por ticket, en el mismo orden que `tickets`.
+  """
+  almacen = almacen or almacen_tickets
+  procesos = procesos or os.cpu_count() or 1
+  lotes = [tickets[i:i + tamano_lote] for i in range(0, len(tickets), tamano_lote)]
+
+  resultados = []
+  if procesos == 1 or len(lotes) <= 1:
+    for lote in lotes:
+      resultados.extend(_dibujar_lote(lote, almacen))
+      if al_avanzar:
+        al_avanzar(len(lote))
+    return resultados
+
+  contexto = multiprocessing.get_context("spawn")
+  with ProcessPoolExecutor(max_workers=min(procesos, len(lotes)), mp_context=contexto) as pool:
+    for resultado in pool.map(_dibujar_lote, lotes, repeat(almacen)):
+      resultados.extend(resultado)
+      if al_avanzar:
+        al_avanzar(len(resultado))
+  return resultados
+
+
+# --- Cierre de caja ---
+
+def resumir_cierre(turnos, servicios_por_turno):
+  """
+  Totales de un conjunto de turnos cobrados.
+
+  Args:
+    turnos (list): Turnos como los de Turno.listar_por_ids.
+    servicios_por_turno (dict): turno_id -> servicios, como TurnoServicio.listar_por_turnos.
+
+  Returns:
+    dict: turnos, total y por_servicio (lista de (nombre, cantidad, ingresos), del que más facturó al que menos).
+  """
+  por_servicio = {}
+  for turno in turnos:
+    for servicio in servicios_por_turno.get(turno['id'], []):
+      cantidad, ingresos = por_servicio.get(servicio['nombre'], (0, Decimal(0)))
+      por_servicio[servicio['nombre']] = (cantidad + 1, ingresos + Decimal(str(servicio['precio_cobrado'] or 0)))
+  return {
+    'turnos': len(turnos),
+    'total': sum((Decimal(str(t['total'] or 0)) for t in turnos), Decimal(0)),
+    'por_servicio': sorted(((n, c, i) for n, (c, i) in por_servicio.items()), key=lambda s: s[2], reverse=True),
+  }
+
+def _recortar(texto, ancho, fuente):
+  """Acorta el texto con '...' para que no pase de `ancho` puntos."""
+  from reportlab.pdfbase.pdfmetrics import stringWidth
+  if stringWidth(texto, *fuente) <= ancho:
+    return texto
+  while texto and stringWidth(texto + "...", *fuente) > ancho:
+    texto = texto[:-1]
+  return texto + "..."
+
+def _dibujar_cierre(momento, turnos, servicios_por_turno, dia):
+  """
+  Dibuja en memoria el resumen de un cierre de caja: un renglón por turno
+  cobrado en el cierre, sus totales, los del día y lo facturado por servicio en
+  el día, en tantas hojas como haga falta. El encabezado de las hojas es un
+  form (se define una vez y cada hoja lo referencia).
+
+  Args:
+    momento (datetime): Fecha y hora del cierre.
+    turnos (list): Turnos cobrados en el cierre (ver resumir_cierre).
+    servicios_por_turno (dict): turno_id -> servicios de esos turnos.
+    dia (dict): Totales del día (turnos, total y por_servicio, como resumir_cierre).
+
+  Returns:
+    bytes: El PDF.
+  """
+  from reportlab.pdfgen import canvas
+
+  plantilla = obtener_plantilla() # configura reportlab igual que para los tickets
+  ancho, alto = plantilla.ANCHO, plantilla.ALTO
+  margen, derecha = plantilla.MARGEN, plantilla.ANCHO - plantilla.MARGEN
+  renglon = 16
+  y_inicial, y_minimo = alto - 130, plantilla.MARGEN_INFERIOR + renglon
+  fuente, negrita = ("Helvetica", 9), ("Helvetica-Bold", 9)
+  # Columnas: turno, hora, cliente, servicios y total (alineado a la derecha)
+  x_hora, x_cliente, x_servicios = margen + 50, margen + 95, margen + 225
+
+  cierre = resumir_cierre(turnos, servicios_por_turno)
+
+  # Cada renglón: (fuente, [(x, texto, alineado a la derecha)])
+  renglones = []
+  for turno in turnos:
+    servicios = ", ".join(s['nombre'] for s in servicios_por_turno.get(turno['id'], []))
+    renglones.append((fuente, [
+      (margen, str(turno['id']), False),
+      (x_hora, turno['fecha_hora'].strftime("%H:%M"), False),
+      (x_cliente, _recortar(f"{turno['cliente_nombre']} {turno['cliente_apellido']}", x_servicios - x_cliente - 10, fuente), False),
+      (x_servicios, _recortar(servicios, derecha - x_servicios - 70, fuente), False),
+      (derecha, f"${Decimal(str(turno['total'] or 0)):,.2f}", True),
+    ]))
+  renglones.append((fuente, []))
+  renglones.append((negrita, [(margen, "Turnos cobrados en este cierre", False), (derecha, str(cierre['turnos']), True)]))
+  renglones.append((negrita, [(margen, "TOTAL DEL CIERRE", False), (derecha, f"${cierre['total']:,.2f}", True)]))
+  renglones.append((fuente, [(margen, "Turnos cobrados en el día", False), (derecha, str(dia['turnos']), True)]))
+  renglones.append((negrita, [(margen, "TOTAL DEL DÍA", False), (derecha, f"${dia['total']:,.2f}", True)]))
+  if dia['por_servicio']:
+    renglones.append((fuente, []))
+    renglones.append((negrita, [(margen, "POR SERVICIO (DÍA)", False), (derecha - 110, "CANTIDAD", True), (derecha, "INGRESOS", True)]))
+    for nombre, cantidad, ingresos in dia['por_servicio']:
+      renglones.append((fuente, [
+        (margen, _recortar(nombre, derecha - margen - 180, fuente), False),
+        (derecha - 110, str(cantidad), True),
+        (derecha, f"${ingresos:,.2f}", True),
+      ]))
+
+  por_hoja = int((y_inicial - y_minimo) // renglon) + 1
+  hojas = [renglones[i:i + por_hoja] for i in range(0, len(renglones), por_hoja)] or [[]]
+
+  salida = io.BytesIO()
+  c = canvas.Canvas(salida, pagesize=(ancho, alto), invariant=1)
+  c.setTitle(f"Cierre de caja {momento:%d/%m/%Y %H:%M}")
+
+  c.beginForm("cierre_encabezado")
+  c.setFont(*plantilla.FUENTE_TITULO)
+  c.drawString(margen, alto - 50, "SALÓN DE BELLEZA")
+  c.setFont(*plantilla.FUENTE_SUBTITULO)
+  c.drawString(margen, alto - 80, f"CIERRE DE CAJA - {momento:%d/%m/%Y %H:%M}")
+  c.setFont(*negrita)
+  y = y_inicial + renglon * 1.5
+  for x, titulo in ((margen, "TURNO"), (x_hora, "HORA"), (x_cliente, "CLIENTE"), (x_servicios, "SERVICIOS")):
+    c.drawString(x, y, titulo)
+  c.drawRightString(derecha, y, "TOTAL")
+  c.line(margen, y - renglon / 2, derecha, y - renglon / 2)
+  c.endForm()
+
+  for numero, hoja in enumerate(hojas, start=1):
+    c.doForm("cierre_encabezado")
+    y = y_inicial
+    for fuente_renglon, celdas in hoja:
+      c.setFont(*fuente_renglon)
+      for x, texto, a_la_derecha in celdas:
+        if a_la_derecha:
+          c.drawRightString(x, y, texto)
+        else:
+          c.drawString(x, y, texto)
+      y -= renglon
+    c.setFont(*fuente)
+    c.drawRightString(derecha, plantilla.MARGEN_INFERIOR, f"Hoja {numero} de {len(hojas)}")
+    c.showPage()
+
+  c.save()
+  return salida.getvalue()
+
+def generar_cierre_pdf(momento, turnos, servicios_por_turno, dia, almacen=None):
+  """
+  Genera el resumen de un cierre de caja (ver _dibujar_cierre) y lo guarda en
+  el almacén (por defecto almacen_tickets).
+
+  Returns:
+    str: Ruta del resumen.
+  """
+  almacen = almacen or almacen_tickets
+  return almacen.guardar_cierre(momento, _dibujar_cierre(momento, turnos, servicios_por_turno, dia))
+
+
+# --- Generación en segundo plano ---
+
+# Estados de un ticket en la cola
+EN_COLA = "en_cola"
+GENERANDO = "generando"
+LISTO = "listo"
+ERROR = "error"
+DESCARTADO = "descartado" # la cola estaba llena o cerrada
+
+class ColaTickets:
+  """
+  Cola de tickets que se generan en hilos de fondo, para que el cobro
+  (cobrar_turno) no espere a reportlab ni al disco.
+
+  - La cola tiene un tamaño máximo: si está llena el ticket se descarta en el
+    momento (encolar devuelve False) en lugar de frenar el cobro.
+  - Si la generación falla se reintenta hasta REINTENTOS veces, esperando
+    cada vez el doble (ESPERA_REINTENTO, 2 * ESPERA_REINTENTO, ...).
+  - estado(turno_id) informa en qué quedó el ticket de un turno.
+  - drenar() espera a que terminen los tickets pendientes (al cerrar sesión) y
+    cerrar() además detiene los hilos (se registra con atexit al arrancar).
+  """
+  REINTENTOS = 3
+  ESPERA_REINTENTO = 0.5 # segundos
+  MAX_ESTADOS = 1000 # estados que se recuerdan (los más recientes)
+
+  def __init__(self, hilos=1, max_cola=100, generar=_generar_ticket):
+    self.hilos = hilos
+    self.generar = generar
+    self._cola = queue.Queue(maxsize=max_cola)
+    self._estados = OrderedDict() # turno_id -> dict(estado, intentos, ruta, error)
+    self._pendientes = 0
+    self._condicion = threading.Condition()
+    self._trabajadores = []
+    self._cerrada = False
+
+  def _arrancar(self):
+    # Los hilos se crean con el primer ticket; son daemon para no trabar la salida si cerrar() vence
+    if self._trabajadores:
+      return
+    for i in range(self.hilos):
+      hilo = threading.Thread(target=self._trabajar, name=f"tickets-{i}", daemon=True)
+      hilo.start()
+      self._trabajadores.append(hilo)
+    atexit.register(self.cerrar)
+
+  def _actualizar(self, turno_id, **datos):
+    with self._condicion:
+      estado = self._estados.setdefault(turno_id, {"estado": EN_COLA, "intentos": 0, "ruta": None, "error": None})
+      estado.update(datos)
+      self._estados.move_to_end(turno_id)
+      while len(self._estados) > self.MAX_ESTADOS:
+        self._estados.popitem(last=False)
+
+  def encolar(self, turno_info: dict, detalle_servicios: list):
+    """
+    Agrega un ticket a la cola sin esperar.
+
+    Returns:
+      bool: True si quedó en cola, False si la cola está llena o cerrada.
+    """
+    turno_id = turno_info['id']
+    with self._condicion:
+      if self._cerrada:
+        self._actualizar(turno_id, estado=DESCARTADO, error="La cola de tickets está cerrada.")
+        return False
+      self._arrancar()
+      try:
+        self._cola.put_nowait((turno_info, detalle_servicios))
+      except queue.Full:
+        self._actualizar(turno_id, estado=DESCARTADO, error="La cola de tickets está llena.")
+        return False
+      self._pendientes += 1
+      self._actualizar(turno_id, estado=EN_COLA, intentos=0, ruta=None, error=None)
+      return True
+
+  def _trabajar(self):
+    while True:
+      tarea = self._cola.get()
+      if tarea is None:
+        return
+      turno_info, detalle_servicios = tarea
+      turno_id = turno_info['id']
+      try:
+        for intento in range(1, self.REINTENTOS + 1):
+          self._actualizar(turno_id, estado=GENERANDO, intentos=intento)
+          try:
+            ruta = self.generar(turno_info, detalle_servicios)
+            self._actualizar(turno_id, estado=LISTO, ruta=ruta, error=None)
+            break
+          except Exception as e:
+            self._actualizar(turno_id, estado=ERROR, error=str(e))
+            if intento < self.REINTENTOS:
+              time.sleep(self.ESPERA_REINTENTO * 2 ** (intento - 1))
+      finally:
+        with self._condicion:
+          self._pendientes -= 1
+          self._condicion.notify_all()
+
+  def estado(self, turno_id):
+    """
+    Returns:
+      dict | None: estado (en_cola, generando, listo, error, descartado), intentos,
+        ruta y error del ticket del turno, o None si no pasó por la cola.
+    """
+    with self._condicion:
+      estado = self._estados.get(turno_id)
+      return dict(estado) if estado else None
+
+  @property
+  def pendientes(self):
+    return self._pendientes
+
+  def con_error(self):
+    """Turnos cuyo ticket no se pudo generar (agotó los reintentos o se descartó)."""
+    with self._condicion:
+      return [t for t, e in self._estados.items() if e["estado"] in (ERROR, DESCARTADO)]
+
+  def drenar(self, timeout=None):
+    """
+    Espera a que se generen los tickets pendientes.
+
+    Returns:
+      bool: True si no quedó ninguno pendiente, False si venció el timeout.
+    """
+    limite = None if timeout is None else time.monotonic() + timeout
+    with self._condicion:
+      while self._pendientes:
+        restante = None if limite is None else limite - time.monotonic()
+        if restante is not None and restante <= 0:
+          return False
+        self._condicion.wait(restante)
+      return True
+
+  def cerrar(self, timeout=30):
+    """Deja de aceptar tickets, espera los pendientes y detiene los hilos."""
+    with self._condicion:
+      if self._cerrada:
+        return
+      self._cerrada = True
+    self.drenar(timeout)
+    for _ in self._trabajadores:
+      try:
+        self._cola.put_nowait(None)
+      except queue.Full:
+        break # venció el timeout con la cola llena: los hilos son daemon y terminan con el proceso
+
+
+# Almacén de los tickets de la aplicación (ver funciones/almacen_tickets.py)
+almacen_tickets = crear_almacen(PDF_PATH)
+
+# Cola usada por la aplicación; la cantidad de hilos y el tamaño se configuran en el .env
+cola_tickets = ColaTickets(
+  hilos=int(os.getenv("TICKETS_HILOS", "1")),
+  max_cola=int(os.getenv("TICKETS_COLA_MAX", "100"))
+)
     
\ No newline at end of file
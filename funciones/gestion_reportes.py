@@ -1,29 +1,263 @@
+import math
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
 from rich.console import Console
-from rich.panel import Panel
-from rich.box import DOUBLE_EDGE # Importa un estilo de borde
+from rich.table import Table
+from InquirerPy import inquirer
+
+from modelos.modelo_reporte import Reporte
+from modelos.modelo_turno import Turno
+from modelos.modelo_usuario import Usuario
+from modelos.instrumentacion import medir_accion
+
+from .auxiliares import obtener_entrada_valida, validar_fecha
 
 console = Console()
 
-def menu_reportes():
-  contenido = (
-    "[bold yellow]🔒 ACCESO RESTRINGIDO 🔒[/bold yellow]\n\n"
-    "Esta sección de Reportes y Análisis Avanzados\n"
-    "solo está disponible para usuarios con la "
-    "[bold magenta]Suscripción Premium[/bold magenta] 🌟.\n\n"
-    "[italic bright_white]¡Gracias por tu comprensión! 😉[/italic bright_white]"
+# agrupación -> (título, días hacia atrás del rango propuesto, formato del periodo)
+PERIODOS = {
+  "dia": ("Facturación por día", 30, "%d/%m/%Y"),
+  "semana": ("Facturación por semana", 7 * 12, "Semana del %d/%m/%Y"),
+  "mes": ("Facturación por mes", 365, "%m/%Y"),
+}
+
+def _pedir_rango(dias_atras):
+  """
+  Pide el rango de fechas del reporte, proponiendo los últimos `dias_atras` días.
+
+  Returns:
+    tuple: (desde, hasta) como date, o None si el usuario cancela.
+  """
+  hoy = date.today()
+  desde_str = obtener_entrada_valida(
+    message="Desde (dd/mm/aaaa):",
+    validator_func=validar_fecha,
+    error_message="Fecha inválida. Usa el formato dd/mm/aaaa.",
+    default=(hoy - timedelta(days=dias_atras - 1)).strftime("%d/%m/%Y")
+  )
+  if desde_str is None:
+    return None
+  hasta_str = obtener_entrada_valida(
+    message="Hasta (dd/mm/aaaa):",
+    validator_func=validar_fecha,
+    error_message="Fecha inválida. Usa el formato dd/mm/aaaa.",
+    default=hoy.strftime("%d/%m/%Y")
+  )
+  if hasta_str is None:
+    return None
+
+  desde = datetime.strptime(desde_str, "%d/%m/%Y").date()
+  hasta = datetime.strptime(hasta_str, "%d/%m/%Y").date()
+  if desde > hasta:
+    console.print("[bold red]❌ La fecha 'desde' no puede ser posterior a 'hasta'.[/bold red]")
+    return None
+  return desde, hasta
+
+@medir_accion
+def reporte_facturacion(agrupacion):
+  """Muestra turnos cobrados, ingresos y ticket promedio por día, semana o mes."""
+  titulo, dias_atras, formato = PERIODOS[agrupacion]
+  rango = _pedir_rango(dias_atras)
+  if not rango:
+    return
+
+  filas = Reporte.resumen(*rango, agrupacion=agrupacion)
+  if filas is None:
+    console.print("[bold red]❌ No se pudo leer el reporte.[/bold red]")
+    return
+  if not filas:
+    console.print("[yellow]No hay cobros registrados en ese rango.[/yellow]")
+    return
+
+  tabla = Table(
+    title=f"📊 {titulo} ({rango[0]:%d/%m/%Y} - {rango[1]:%d/%m/%Y})",
+    show_header=True,
+    header_style="bold magenta"
+  )
+  tabla.add_column("Periodo", style="cyan")
+  tabla.add_column("Turnos", justify="right")
+  tabla.add_column("💰 Ingresos", justify="right", style="green")
+  tabla.add_column("Ticket promedio", justify="right", style="yellow")
+
+  for fila in filas:
+    tabla.add_row(
+      fila['periodo'].strftime(formato),
+      str(fila['turnos']),
+      f"${fila['ingresos']:,.2f}",
+      f"${fila['ticket_promedio']:,.2f}"
+    )
+
+  turnos = sum(f['turnos'] for f in filas)
+  ingresos = sum((f['ingresos'] for f in filas), Decimal(0))
+  tabla.add_section()
+  tabla.add_row("[bold]TOTAL[/bold]", f"[bold]{turnos}[/bold]", f"[bold]${ingresos:,.2f}[/bold]", f"[bold]${ingresos / turnos:,.2f}[/bold]")
+
+  console.print()
+  console.print(tabla)
+  console.print()
+
+@medir_accion
+def reporte_por_servicio():
+  """Muestra la cantidad e ingresos de cada servicio cobrado en un rango."""
+  rango = _pedir_rango(30)
+  if not rango:
+    return
+
+  filas = Reporte.por_servicio(*rango)
+  if filas is None:
+    console.print("[bold red]❌ No se pudo leer el reporte.[/bold red]")
+    return
+  if not filas:
+    console.print("[yellow]No hay cobros registrados en ese rango.[/yellow]")
+    return
+
+  total = sum(Decimal(str(f['ingresos'])) for f in filas)
+  tabla = Table(
+    title=f"💇 Facturación por servicio ({rango[0]:%d/%m/%Y} - {rango[1]:%d/%m/%Y})",
+    show_header=True,
+    header_style="bold magenta"
+  )
+  tabla.add_column("Servicio", style="cyan")
+  tabla.add_column("Cantidad", justify="right")
+  tabla.add_column("💰 Ingresos", justify="right", style="green")
+  tabla.add_column("% del total", justify="right", style="yellow")
+
+  for fila in filas:
+    ingresos = Decimal(str(fila['ingresos']))
+    tabla.add_row(
+      fila['nombre'] or f"[italic dim]Servicio {fila['servicio_id']} (eliminado)[/italic dim]",
+      str(fila['cantidad']),
+      f"${ingresos:,.2f}",
+      f"{ingresos / total * 100:.1f}%" if total else "-"
+    )
+
+  console.print()
+  console.print(tabla)
+  console.print()
+
+def _color_ocupacion(porcentaje):
+  if porcentaje < 25:
+    return "grey37"
+  if porcentaje < 50:
+    return "green4"
+  if porcentaje < 75:
+    return "yellow3"
+  if porcentaje < 90:
+    return "dark_orange"
+  return "red3"
+
+@medir_accion
+def reporte_demanda():
+  """
+  Muestra el mapa de calor de ocupación (día de la semana x hora) y las tasas
+  de cancelación y ausencias por día de la semana.
+  """
+  rango = _pedir_rango(365)
+  if not rango:
+    return
+
+  # NumPy se importa recién al abrir este reporte, para no demorar el arranque de la aplicación
+  from . import analitica
+
+  inicio = time.perf_counter()
+  turnos = analitica.cargar_turnos(*rango)
+  if not len(turnos):
+    console.print("[yellow]No hay turnos registrados en ese rango.[/yellow]")
+    return
+  # Misma capacidad por horario que al reservar: los peluqueros activos o, si no hay, la fija
+  capacidad = len(Usuario.listar_peluqueros() or []) or Turno.CAPACIDAD_SLOT
+  ocupacion, horas = analitica.ocupacion_semanal(turnos, *rango, capacidad=capacidad)
+  tasas = analitica.tasas_por_dia(turnos)
+  demora = time.perf_counter() - inicio
+
+  # --- Mapa de calor ---
+  mapa = Table(
+    title=f"🔥 Ocupación promedio por horario, en % ({rango[0]:%d/%m/%Y} - {rango[1]:%d/%m/%Y})",
+    show_header=True,
+    header_style="bold magenta"
   )
-  
-  console.print()
-  console.print(
-    Panel(
-      contenido,
-      title="[bold red]💸 Reportes de Facturación 💸[/bold red]",
-      subtitle="[bold red]¡Actualiza tu cuenta hoy mismo![/bold red]",
-      border_style="yellow",
-      box=DOUBLE_EDGE, # Utiliza un borde doble para que se destaque
-      padding=(1, 4), # Relleno vertical y horizontal para más espacio
-      width=75
+  mapa.add_column("Día", style="cyan")
+  for hora in horas:
+    mapa.add_column(f"{hora:02d}", justify="center")
+
+  for dia, nombre in enumerate(analitica.DIAS_SEMANA):
+    if all(math.isnan(p) for p in ocupacion[dia]):
+      continue
+    celdas = [f"[white on {_color_ocupacion(p)}]{p:3.0f}[/]" for p in ocupacion[dia]]
+    mapa.add_row(nombre[:3], *celdas)
+
+  # --- Cancelaciones y ausencias ---
+  tabla = Table(title="📉 Cancelaciones y ausencias por día", show_header=True, header_style="bold magenta")
+  tabla.add_column("Día", style="cyan")
+  tabla.add_column("Turnos", justify="right")
+  tabla.add_column("Cancelados", justify="right")
+  tabla.add_column("% Cancelación", justify="right", style="yellow")
+  tabla.add_column("Ausencias", justify="right")
+  tabla.add_column("% Ausencia", justify="right", style="red")
+
+  def porcentaje(valor):
+    return "-" if math.isnan(valor) else f"{valor:.1f}%"
+
+  for dia, nombre in enumerate(analitica.DIAS_SEMANA):
+    if not tasas["turnos"][dia]:
+      continue
+    tabla.add_row(
+      nombre, str(tasas["turnos"][dia]), str(tasas["cancelados"][dia]), porcentaje(tasas["tasa_cancelacion"][dia]),
+      str(tasas["ausentes"][dia]), porcentaje(tasas["tasa_ausencia"][dia])
     )
+
+  total, cancelados = tasas["turnos"].sum(), tasas["cancelados"].sum()
+  pasados, ausentes = tasas["pasados"].sum(), tasas["ausentes"].sum()
+  tabla.add_section()
+  tabla.add_row(
+    "[bold]TOTAL[/bold]", f"[bold]{total}[/bold]", f"[bold]{cancelados}[/bold]",
+    f"[bold]{porcentaje(cancelados / total * 100)}[/bold]", f"[bold]{ausentes}[/bold]",
+    f"[bold]{porcentaje(ausentes / pasados * 100 if pasados else math.nan)}[/bold]"
   )
+
+  console.print()
+  console.print(mapa)
+  console.print("[dim]Ausencia: turno pasado que quedó pendiente o confirmado (no se cobró ni se canceló).[/dim]")
+  console.print()
+  console.print(tabla)
+  console.print(f"[dim]{len(turnos)} turnos procesados en {demora * 1000:.0f} ms.[/dim]")
   console.print()
-  
+
+def menu_reportes():
+  """Menú de reportes de facturación para el administrador."""
+  console.print()
+
+  while True:
+    try:
+      opcion = inquirer.select(
+        message="Reportes de Facturación - Selecciona un reporte:",
+        choices=[
+          "📅 Por día",
+          "🗓️ Por semana",
+          "📆 Por mes",
+          "💇 Por servicio",
+          "🔥 Ocupación y cancelaciones",
+          "⬅️ Volver al menú principal"
+        ]
+      ).execute()
+    except KeyboardInterrupt:
+      console.print("[yellow]Volviendo al menú principal.[/yellow]")
+      break
+
+    try:
+      if opcion.startswith("📅"):
+        reporte_facturacion("dia")
+      elif opcion.startswith("🗓️"):
+        reporte_facturacion("semana")
+      elif opcion.startswith("📆"):
+        reporte_facturacion("mes")
+      elif opcion.startswith("💇"):
+        reporte_por_servicio()
+      elif opcion.startswith("🔥"):
+        reporte_demanda()
+      elif opcion.startswith("⬅️"):
+        break
+    except KeyboardInterrupt:
+      console.print("[yellow]Operación cancelada. Volviendo al menú de reportes.[/yellow]")
@@ -2,6 +2,7 @@ from rich.console import Console
 from rich.table import Table
 from InquirerPy import inquirer
 from modelos.modelo_servicio import Servicio
+from modelos.instrumentacion import medir_accion
 from decimal import Decimal
 from rich.rule import Rule
 
@@ -9,6 +10,7 @@ from .auxiliares import obtener_entrada_valida, validar_nombre_servicio, validar
 
 console = Console()
 
+@medir_accion
 def crear_servicio():
   console.print("[bold green]--- Crear nuevo servicio ---[/bold green]")
   
@@ -109,6 +111,7 @@ def obtener_servicio_a_editar():
     console.print("[bold yellow]Operación de selección cancelada por el usuario.[/bold yellow]")
     return None
   
+@medir_accion
 def editar_servicio():
   """
   Guía al usuario para seleccionar un servicio y editar sus atributos.
@@ -245,6 +248,7 @@ def editar_servicio():
   except Exception as e:
     console.print(f"[bold red]❌ Error al actualizar servicio:[/bold red] {e}")
 
+@medir_accion
 def listar_servicios():
   console.print("[bold yellow]--- Listado de Servicios ---[/bold yellow]")
   
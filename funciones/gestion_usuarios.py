@@ -2,10 +2,13 @@ from rich.console import Console
 from InquirerPy import inquirer
 
 from modelos.modelo_usuario import Usuario
-from .auxiliares import validar_email, validar_password, validar_nombre, obtener_entrada_valida, mostrar_tabla
+from modelos.instrumentacion import medir_accion
+from .auxiliares import validar_email, validar_password, validar_nombre, obtener_entrada_valida, mostrar_tabla_paginada, TAMANO_PAGINA
 
 console = Console()
 
+ROLES = ["admin", "recepcionista", "peluquero", "cajero", "cliente"]
+
 def verificar_email_unico(email):
   if Usuario.obtener_por_email(email):
     console.print()
@@ -15,6 +18,7 @@ def verificar_email_unico(email):
   else:
     return True
 
+@medir_accion
 def crear_usuario():
   console.print("[bold green]--- Crear nuevo usuario ---[/bold green]")
 
@@ -60,7 +64,7 @@ def crear_usuario():
   try:
     rol = inquirer.select(
       message="Selecciona el rol del usuario:",
-      choices=["admin", "recepcionista", "cajero", "cliente"]
+      choices=ROLES
     ).execute()
   except KeyboardInterrupt:
     console.print()
@@ -111,6 +115,7 @@ def obtener_usuario_a_editar():
   
   return usuario_encontrado
 
+@medir_accion
 def editar_usuario():
   console.print("[bold yellow]--- Editar usuario ---[/bold yellow]")
   
@@ -172,12 +177,11 @@ def editar_usuario():
   #   datos_nuevos['email'] = nuevo_email
 
   # Rol (Usando select con el valor actual como default)
-  roles = ["admin", "recepcionista", "cajero", "cliente"]
   
   try:
     nuevo_rol = inquirer.select(
       message=f"Rol:",
-      choices=roles,
+      choices=ROLES,
       default=usuario_actual['rol']
     ).execute()
   except KeyboardInterrupt:
@@ -189,10 +193,8 @@ def editar_usuario():
   if nuevo_rol != usuario_actual['rol']:
     datos_nuevos['rol'] = nuevo_rol
     
-  # Verificación de email duplicado
   if nuevo_email != usuario_actual['email']:
     datos_nuevos['email'] = nuevo_email
-    if not verificar_email_unico(nuevo_email): return
       
   # --- PASO 3: Actualizar ---
   
@@ -203,8 +205,12 @@ def editar_usuario():
     return
       
   try:
-    # Llamar a tu función 'actualizar' con el ID y los nuevos datos
-    Usuario.actualizar(usuario_actual['id'], **datos_nuevos)
+    # Verificación de email duplicado y actualización en una sola transacción
+    with Usuario.transaccion():
+      if 'email' in datos_nuevos and not verificar_email_unico(nuevo_email): return
+      
+      # Llamar a tu función 'actualizar' con el ID y los nuevos datos
+      Usuario.actualizar(usuario_actual['id'], **datos_nuevos)
     console.print()
     console.print("[bold green]Datos del usuario actualizados exitosamente.[/bold green]")
     console.print()
@@ -212,6 +218,7 @@ def editar_usuario():
   except Exception as e:
     console.print(f"[bold red]Error al actualizar usuario:[/bold red] {e}")
 
+@medir_accion
 def listar_usuarios():
   console.print("[bold yellow]--- Lista de Usuarios ---[/bold yellow]")
   
@@ -226,20 +233,25 @@ def listar_usuarios():
     console.print("[yellow]Operación cancelada. Volviendo al menú de gestión.[/yellow]")
     return # Sale de listar_usuarios() y regresa a menu_gestion_usuarios()
   
-  data = []
   titulo = ''
+  listar_pagina = None
   
   if opcion == 'Empleados':
-    data = Usuario.listar_empleados()
+    listar_pagina = Usuario.listar_empleados_pagina
     titulo = "Empleados del Salón"
   elif opcion == 'Clientes':
-    data = Usuario.listar_clientes()
+    listar_pagina = Usuario.listar_clientes_pagina
     titulo = "Clientes Registrados"
   
+  # Cada página se pide a la base recién cuando se va a mostrar
+  def cargar_pagina(ultima):
+    return listar_pagina(after_id=ultima['id'] if ultima else None, limit=TAMANO_PAGINA)
+
   console.print()
-  mostrar_tabla(titulo, data)
+  mostrar_tabla_paginada(titulo, cargar_pagina)
   console.print()
 
+@medir_accion
 def desactivar_usuario():
   console.print("[bold yellow]--- Desactivar usuario ---[/bold yellow]")
   
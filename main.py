@@ -4,10 +4,11 @@ from rich.align import Align
 from rich.table import Table
 from InquirerPy import inquirer
 
-from menus.menu_admin import mostrar_menu_admin
-from menus.menu_cliente import mostrar_menu_cliente
-from menus.menu_recepcionista import mostrar_menu_recepcionista
-from funciones.login import autenticar
+from funciones.auxiliares import configurar_locale
+
+# Los menús, el login y los modelos (mariadb, passlib, reportlab) se importan
+# recién cuando se usan, para que el banner y el menú de inicio aparezcan enseguida.
+# Ver scripts/benchmark_arranque.py
 
 console = Console()
 
@@ -45,6 +46,7 @@ def mostrar_menu_inicio():
       break
 
     if opcion == "Acceder":
+      from funciones.login import autenticar
       user_info = autenticar()
       console.print()
       if user_info:
@@ -52,10 +54,13 @@ def mostrar_menu_inicio():
         console.print(f"[bold green]✅ Acceso concedido[/bold green] — Rol: [yellow]{rol.upper()}[/yellow]\n")
 
         if rol == "admin":
+          from menus.menu_admin import mostrar_menu_admin
           mostrar_menu_admin(user_info)
         elif rol == "recepcionista":
+          from menus.menu_recepcionista import mostrar_menu_recepcionista
           mostrar_menu_recepcionista(user_info)
         elif rol == "cliente":
+          from menus.menu_cliente import mostrar_menu_cliente
           mostrar_menu_cliente(user_info)
         else:
           console.print("[bold yellow]Rol no reconocido o menú no implementado.[/bold yellow]")
@@ -77,4 +82,5 @@ def mostrar_menu_inicio():
 if __name__ == "__main__":
   console.clear()
   mostrar_banner()
+  configurar_locale()
   mostrar_menu_inicio()
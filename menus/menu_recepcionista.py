@@ -2,13 +2,30 @@ from rich.console import Console
 from rich.panel import Panel
 from InquirerPy import inquirer
 
-from funciones.funciones_recepcionista import gestion_turnos, consulta_clientes, cobrar_turno, listar_servicios_recepcion
+from funciones.funciones_recepcionista import gestion_turnos, consulta_clientes, cobrar_turno, anular_cobro, cierre_de_caja, listar_servicios_recepcion
+from funciones.generador_pdf import cola_tickets
+from modelos.indice_clientes import indice_clientes
 
 console = Console()
 
+def esperar_tickets():
+  """Antes de cerrar sesión, espera a que se terminen de generar los tickets en cola."""
+  if cola_tickets.pendientes:
+    with console.status(f"Generando {cola_tickets.pendientes} ticket(s) pendiente(s)..."):
+      terminado = cola_tickets.drenar(timeout=60)
+    if not terminado:
+      console.print("[yellow]⚠️ Algunos tickets siguen generándose en segundo plano.[/yellow]")
+
+  fallidos = cola_tickets.con_error()
+  if fallidos:
+    console.print(f"[yellow]⚠️ No se pudieron generar los tickets de los turnos: {', '.join(map(str, fallidos))}[/yellow]")
+
 def mostrar_menu_recepcionista(user_info):
   """Muestra el menú interactivo para el rol de Recepcionista."""
   
+  # El índice de búsqueda de clientes se arma mientras se navega el menú
+  indice_clientes.precargar()
+
   # Bucle principal del menú
   while True:
     console.print()
@@ -22,12 +39,15 @@ def mostrar_menu_recepcionista(user_info):
           "📅 Gestión de Turnos",
           "👤 Consulta Rápida de Clientes",
           "💸 Cobro de Turnos confirmados",
+          "↩️ Anular un Cobro",
+          "💵 Cierre de Caja",
           "💇 Consultar Servicios y Precios",
           "🚪 Cerrar Sesión"
         ]
       ).execute()
     except KeyboardInterrupt:
       console.print("[yellow]Operación cancelada por el usuario. Cerrando sesión...[/yellow]")
+      esperar_tickets()
       return
 
     if opcion.startswith("📅"):
@@ -39,10 +59,17 @@ def mostrar_menu_recepcionista(user_info):
     elif opcion.startswith("💸"):
       # Lógica para listar los turnos confirmados y seleccionar uno para cobrar y cambiar a realizado
       cobrar_turno()
+    elif opcion.startswith("↩️"):
+      # Lógica para anular un cobro hecho por error (realizado -> cancelado, se descuenta de los reportes)
+      anular_cobro()
+    elif opcion.startswith("💵"):
+      # Cobra de una vez los turnos confirmados del día, genera el resumen del día y los tickets
+      cierre_de_caja()
     elif opcion.startswith("💇"):
       # Usar la función que ya creaste para listar servicios con sus detalles
       listar_servicios_recepcion() 
     elif opcion.startswith("🚪"):
+      esperar_tickets()
       console.print("[bold cyan]Cerrando sesión de Recepcionista...[/bold cyan]")
       console.print()
       break # Sale del bucle While
\ No newline at end of file
@@ -0,0 +1,197 @@
+import os
+import re
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ESQUEMA_SQLITE = os.path.join(RAIZ, 'scripts', 'tablas_sqlite.sql')
+
+
+class BackendMariaDB:
+  """
+  Motor por defecto: servidor MariaDB. Las consultas de los modelos están
+  escritas en su dialecto, así que no se traducen.
+  """
+  nombre = "mariadb"
+
+  def __init__(self, config):
+    self.config = config
+
+  @property
+  def Error(self):
+    # El conector se importa recién al usarse (ver scripts/benchmark_arranque.py)
+    import mariadb
+    return mariadb.Error
+
+  def conectar(self):
+    missing = [k for k, v in self.config.items() if v is None]
+    if missing:
+      raise RuntimeError(f"Faltan variables de entorno de DB: {missing}")
+    import mariadb
+    return mariadb.connect(**self.config)
+
+  def verificar(self, conn):
+    conn.ping()
+
+  def cursor(self, conn, dict_cursor=False, buffered=True):
+    return conn.cursor(dictionary=dict_cursor, buffered=buffered)
+
+  def iniciar_transaccion(self, conn):
+    # El conector trabaja sin autocommit: la transacción empieza con la primera sentencia
+    pass
+
+  def traducir(self, query):
+    return query
+
+
+# --- Traducción de MariaDB a SQLite ---
+
+# Equivalencias de DATE_FORMAT (MariaDB) a strftime (SQLite)
+FORMATOS_FECHA = {'%i': '%M', '%s': '%S', '%e': '%d', '%c': '%m', '%k': '%H'}
+
+# (patrón, reemplazo) en el orden en que se aplican
+REGLAS_SQLITE = [
+  # GROUP_CONCAT(x SEPARATOR ', ') -> GROUP_CONCAT(x, ', ')
+  (re.compile(r"GROUP_CONCAT\((.+?)\s+SEPARATOR\s+('[^']*')\)", re.IGNORECASE), r"GROUP_CONCAT(\1, \2)"),
+  (re.compile(r"\bnow\(\)", re.IGNORECASE), "datetime('now', 'localtime')"),
+  (re.compile(r"\bHOUR\(([^()]+)\)", re.IGNORECASE), r"CAST(strftime('%H', \1) AS INTEGER)"),
+  (re.compile(r"\bTIMESTAMPDIFF\(\s*MINUTE\s*,\s*([^,()]+),\s*([^,()]+)\)", re.IGNORECASE),
+   r"CAST(ROUND((julianday(\2) - julianday(\1)) * 1440) AS INTEGER)"),
+  # Los bloqueos de fila no existen: BEGIN IMMEDIATE ya serializa las transacciones de escritura
+  (re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE), ""),
+  (re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+  (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE), "ON CONFLICT DO UPDATE SET"),
+  (re.compile(r"\bVALUES\(([A-Za-z_]\w*)\)", re.IGNORECASE), r"excluded.\1"),
+  (re.compile(r"\bANALYZE\s+TABLE\b", re.IGNORECASE), "ANALYZE"),
+]
+
+def _traducir_date_format(match):
+  formato = match.group(2)
+  for mariadb_fmt, sqlite_fmt in FORMATOS_FECHA.items():
+    formato = formato.replace(mariadb_fmt, sqlite_fmt)
+  return f"strftime('{formato}', {match.group(1)})"
+
+PATRON_DATE_FORMAT = re.compile(r"DATE_FORMAT\(([^,()]+),\s*'([^']*)'\)", re.IGNORECASE)
+
+@lru_cache(maxsize=512)
+def traducir_a_sqlite(query):
+  """
+  Traduce una consulta escrita para MariaDB al dialecto de SQLite.
+
+  Cubre lo que usan los modelos: placeholders %s, GROUP_CONCAT ... SEPARATOR,
+  DATE_FORMAT, HOUR, TIMESTAMPDIFF(MINUTE, ...), now(), FOR UPDATE, INSERT IGNORE
+  y ON DUPLICATE KEY UPDATE.
+  Las consultas se repiten mucho, por eso el resultado se cachea.
+  """
+  # DATE_FORMAT va primero: su formato puede contener %s (segundos), que no es un placeholder
+  query = PATRON_DATE_FORMAT.sub(_traducir_date_format, query)
+  for patron, reemplazo in REGLAS_SQLITE:
+    query = patron.sub(reemplazo, query)
+  return re.sub(r"%s", "?", query)
+
+
+def _fila_como_dict(cursor, fila):
+  return {col[0]: valor for col, valor in zip(cursor.description, fila)}
+
+def _convertir_fecha(valor):
+  return date.fromisoformat(valor.decode())
+
+def _convertir_fecha_hora(valor):
+  return datetime.fromisoformat(valor.decode())
+
+def _convertir_decimal(valor):
+  return Decimal(valor.decode())
+
+
+class BackendSQLite:
+  """
+  Motor embebido para tests y benchmarks sin servidor: un archivo o ':memory:'.
+
+  Las consultas de los modelos se traducen al vuelo (ver traducir_a_sqlite) y el
+  esquema se crea desde scripts/tablas_sqlite.sql la primera vez. Las columnas
+  DATETIME y DECIMAL se devuelven como datetime y Decimal, igual que con MariaDB.
+
+  Con ':memory:' todas las conexiones del pool comparten una misma base en
+  memoria (cache compartido) que vive mientras el proceso esté abierto. En ese
+  modo SQLite bloquea por tabla y no espera a que se libere, así que las pruebas
+  con muchos hilos escribiendo a la vez conviene correrlas sobre un archivo.
+  """
+  nombre = "sqlite"
+
+  def __init__(self, ruta=":memory:"):
+    import sqlite3
+    self._sqlite3 = sqlite3
+    self.Error = sqlite3.Error
+    self.en_memoria = ruta == ":memory:"
+    # Un nombre por instancia para que dos backends en memoria no compartan datos
+    self.ruta = f"file:salon_{id(self)}?mode=memory&cache=shared" if self.en_memoria else ruta
+    self._ancla = None
+    self._esquema_listo = False
+    self._lock = threading.Lock()
+
+    sqlite3.register_adapter(datetime, lambda d: d.isoformat(" "))
+    sqlite3.register_adapter(date, lambda d: d.isoformat())
+    sqlite3.register_adapter(Decimal, str)
+    sqlite3.register_converter("DATE", _convertir_fecha)
+    sqlite3.register_converter("DATETIME", _convertir_fecha_hora)
+    sqlite3.register_converter("TIMESTAMP", _convertir_fecha_hora)
+    sqlite3.register_converter("DECIMAL", _convertir_decimal)
+
+  def conectar(self):
+    conn = self._sqlite3.connect(
+      self.ruta,
+      uri=self.en_memoria,
+      detect_types=self._sqlite3.PARSE_DECLTYPES,
+      check_same_thread=False, # el pool entrega la conexión a distintos hilos
+      timeout=30
+    )
+    conn.execute("PRAGMA foreign_keys = ON")
+    if not self.en_memoria:
+      conn.execute("PRAGMA journal_mode = WAL")
+
+    with self._lock:
+      if not self._esquema_listo:
+        self._crear_esquema(conn)
+        if self.en_memoria:
+          # Una conexión que nunca se cierra, para que la base en memoria no se pierda si se vacía el pool
+          self._ancla = self._sqlite3.connect(self.ruta, uri=True)
+        self._esquema_listo = True
+    return conn
+
+  def _crear_esquema(self, conn):
+    existe = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'Usuario'").fetchone()
+    if not existe:
+      with open(ESQUEMA_SQLITE, encoding='utf-8') as archivo:
+        conn.executescript(archivo.read())
+
+  def verificar(self, conn):
+    conn.execute("SELECT 1")
+
+  def cursor(self, conn, dict_cursor=False, buffered=True):
+    cursor = conn.cursor()
+    if dict_cursor:
+      cursor.row_factory = _fila_como_dict
+    return cursor
+
+  def iniciar_transaccion(self, conn):
+    # Toma el lock de escritura al empezar: dos transacciones que leen y después
+    # escriben (ej. Turno.reservar) no pueden intercalarse
+    conn.execute("BEGIN IMMEDIATE")
+
+  def traducir(self, query):
+    return traducir_a_sqlite(query)
+
+
+def crear_backend(config):
+  """
+  Crea el motor indicado por DB_BACKEND ('mariadb' por defecto o 'sqlite').
+  Para SQLite, DB_SQLITE_PATH indica el archivo (por defecto ':memory:').
+  """
+  nombre = os.getenv("DB_BACKEND", "mariadb").lower()
+  if nombre == "sqlite":
+    return BackendSQLite(os.getenv("DB_SQLITE_PATH", ":memory:"))
+  if nombre == "mariadb":
+    return BackendMariaDB(config)
+  raise RuntimeError(f"DB_BACKEND desconocido: {nombre}")
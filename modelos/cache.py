@@ -0,0 +1,198 @@
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Sentencias que modifican una tabla (la tabla es el primer identificador después del verbo)
+PATRON_ESCRITURA = re.compile(
+  r"^\s*(?:INSERT(?:\s+IGNORE)?\s+INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?|ALTER\s+TABLE|DROP\s+TABLE(?:\s+IF\s+EXISTS)?)\s+`?(\w+)`?",
+  re.IGNORECASE
+)
+
+# Tablas que cambian solas cuando se borra en otra (ON DELETE CASCADE, ver scripts/tablas.sql)
+CASCADAS = {"Turno": ("Turno_Servicio",)}
+
+
+@lru_cache(maxsize=1024)
+def tablas_escritas(query):
+  """Devuelve las tablas que modifica una sentencia (vacío si es una lectura)."""
+  coincidencia = PATRON_ESCRITURA.match(query)
+  if not coincidencia:
+    return ()
+  tabla = coincidencia.group(1)
+  return (tabla,) + CASCADAS.get(tabla, ())
+
+def tamano_aproximado(valor):
+  """Bytes aproximados de un resultado (lista de filas, fila o valor suelto)."""
+  if isinstance(valor, (list, tuple)):
+    return sys.getsizeof(valor) + sum(tamano_aproximado(v) for v in valor)
+  if isinstance(valor, dict):
+    return sys.getsizeof(valor) + sum(sys.getsizeof(v) for v in valor.values())
+  return sys.getsizeof(valor)
+
+def _copiar(valor):
+  # Quien llama puede modificar lo que recibe sin alterar lo guardado
+  if isinstance(valor, list):
+    return [dict(v) if isinstance(v, dict) else v for v in valor]
+  if isinstance(valor, dict):
+    return dict(valor)
+  return valor
+
+
+class CacheConsultas:
+  """
+  Caché de resultados de los métodos de lectura de los modelos (ver @cacheado).
+
+  Cada tabla tiene un contador de versión que ModeloBase incrementa después de
+  cada INSERT, UPDATE o DELETE sobre ella (o al confirmar la transacción que la
+  modificó). Cada entrada guarda las versiones de las tablas que leyó y deja de
+  valer en cuanto alguna cambia, sin que los modelos tengan que invalidar nada.
+
+  Los contadores son de este proceso: los cambios hechos desde otras terminales
+  se ven cuando vence el TTL de la entrada. La memoria se acota con LRU por
+  tamaño aproximado de los resultados.
+  """
+
+  def __init__(self):
+    self.activa = os.getenv("DB_CACHE", "1") == "1"
+    self.ttl = float(os.getenv("DB_CACHE_TTL", "10"))
+    self.max_bytes = int(float(os.getenv("DB_CACHE_MAX_MB", "32")) * 1024 * 1024)
+
+    self._versiones = {}
+    self._entradas = OrderedDict() # clave -> (versiones, vence, valor, bytes)
+    self._bytes = 0
+    self._estadisticas = {}
+    self._lock = threading.Lock()
+
+  def version(self, tabla):
+    return self._versiones.get(tabla, 0)
+
+  def incrementar(self, tablas):
+    with self._lock:
+      for tabla in tablas:
+        self._versiones[tabla] = self._versiones.get(tabla, 0) + 1
+
+  def _contar(self, metodo, evento):
+    estadistica = self._estadisticas.setdefault(
+      metodo, {"aciertos": 0, "fallos": 0, "invalidadas": 0, "vencidas": 0, "expulsadas": 0}
+    )
+    estadistica[evento] += 1
+
+  def obtener(self, metodo, clave, tablas):
+    """
+    Returns:
+      tuple: (encontrado, valor).
+    """
+    with self._lock:
+      entrada = self._entradas.get(clave)
+      if entrada is None:
+        self._contar(metodo, "fallos")
+        return False, None
+
+      versiones, vence, valor, tamano = entrada
+      if versiones != tuple(self.version(t) for t in tablas):
+        evento = "invalidadas"
+      elif time.monotonic() > vence:
+        evento = "vencidas"
+      else:
+        self._entradas.move_to_end(clave)
+        self._contar(metodo, "aciertos")
+        return True, _copiar(valor)
+
+      del self._entradas[clave]
+      self._bytes -= tamano
+      self._contar(metodo, evento)
+      self._contar(metodo, "fallos")
+      return False, None
+
+  def guardar(self, metodo, clave, tablas, versiones, valor, ttl):
+    tamano = tamano_aproximado(valor)
+    if tamano > self.max_bytes:
+      return
+    with self._lock:
+      # Si alguna tabla cambió mientras se leía, el resultado podría ser viejo: no se guarda
+      if versiones != tuple(self.version(t) for t in tablas):
+        return
+      anterior = self._entradas.pop(clave, None)
+      if anterior is not None:
+        self._bytes -= anterior[3]
+      self._entradas[clave] = (versiones, time.monotonic() + ttl, _copiar(valor), tamano)
+      self._bytes += tamano
+
+      while self._bytes > self.max_bytes:
+        (metodo_expulsado, _, _), (_, _, _, liberado) = self._entradas.popitem(last=False)
+        self._bytes -= liberado
+        self._contar(metodo_expulsado, "expulsadas")
+
+  def limpiar(self):
+    with self._lock:
+      self._entradas.clear()
+      self._bytes = 0
+
+  def estadisticas(self):
+    """Aciertos, fallos, invalidaciones y expulsiones por método, y memoria usada."""
+    with self._lock:
+      metodos = {m: dict(e) for m, e in self._estadisticas.items()}
+      aciertos = sum(e["aciertos"] for e in metodos.values())
+      fallos = sum(e["fallos"] for e in metodos.values())
+      return {
+        "entradas": len(self._entradas),
+        "bytes": self._bytes,
+        "max_bytes": self.max_bytes,
+        "aciertos": aciertos,
+        "fallos": fallos,
+        "tasa_aciertos": round(aciertos / (aciertos + fallos), 3) if aciertos + fallos else 0,
+        "metodos": metodos,
+      }
+
+
+cache_consultas = CacheConsultas()
+
+def cacheado(*tablas, ttl=None):
+  """
+  Decorador para métodos de lectura de los modelos (debajo de @classmethod):
+  guarda el resultado por método y argumentos hasta que cambie alguna de las
+  `tablas` que lee o venza el TTL.
+
+  Dentro de una transacción no se usa: la transacción tiene que ver sus
+  propios cambios y los bloqueos que toma. Los resultados None (error de base
+  de datos) no se guardan.
+
+  Ejemplo:
+    @classmethod
+    @cacheado("Usuario")
+    def obtener_por_email(cls, email): ...
+  """
+  def decorador(funcion):
+    @wraps(funcion)
+    def envoltura(cls, *args, **kwargs):
+      from .modelo_base import ModeloBase
+
+      if not cache_consultas.activa or getattr(ModeloBase._local, "conexion", None) is not None:
+        return funcion(cls, *args, **kwargs)
+
+      metodo = f"{cls.__name__}.{funcion.__name__}"
+      try:
+        clave = (metodo, args, tuple(sorted(kwargs.items())))
+        hash(clave)
+      except TypeError:
+        return funcion(cls, *args, **kwargs) # argumentos que no sirven de clave (ej. listas)
+
+      encontrado, valor = cache_consultas.obtener(metodo, clave, tablas)
+      if encontrado:
+        return valor
+
+      # Las versiones se toman antes de leer: si cambian durante la lectura, no se guarda
+      versiones = tuple(cache_consultas.version(t) for t in tablas)
+      valor = funcion(cls, *args, **kwargs)
+      if valor is not None:
+        cache_consultas.guardar(metodo, clave, tablas, versiones, valor, cache_consultas.ttl if ttl is None else ttl)
+      return valor
+    return envoltura
+  return decorador
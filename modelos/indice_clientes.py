@@ -0,0 +1,308 @@
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+
+
+@lru_cache(maxsize=65536)
+def normalizar_texto(texto):
+  """Minúsculas, sin acentos ni signos: 'Núñez-Pérez' -> 'nunez perez'."""
+  texto = unicodedata.normalize("NFKD", texto or "")
+  texto = "".join(c for c in texto if not unicodedata.combining(c)).lower()
+  return " ".join(re.findall(r"[a-z0-9]+", texto))
+
+def trigramas(palabra):
+  """
+  Trigramas de una palabra, con dos espacios al inicio y uno al final (como
+  pg_trgm): 'ana' -> {'  a', ' an', 'ana', 'na '}. Así las palabras que empiezan
+  igual comparten trigramas aunque la búsqueda sea corta.
+  """
+  palabra = f"  {palabra} "
+  return {palabra[i:i + 3] for i in range(len(palabra) - 2)}
+
+
+class IndiceClientes:
+  """
+  Índice en memoria para buscar clientes por nombre y apellido.
+
+  Tolera acentos y errores de tipeo ('martines' encuentra a 'Martínez') y
+  ordena por similitud. Se indexan las palabras distintas de los nombres y
+  apellidos (muchas menos que los clientes: los nombres se repiten mucho) con
+  un índice de trigramas, y cada palabra apunta a los clientes que la tienen.
+  Una búsqueda compara solo contra el vocabulario, nunca contra toda la tabla.
+
+  Se arma la primera vez que se usa y se mantiene al día de tres formas:
+  - Los cambios hechos desde este proceso (Usuario.crear, actualizar y
+    desactivar) se aplican al confirmarse.
+  - Cada REFRESCO_SEG se agregan los clientes con id mayor al último leído de
+    la base (altas hechas desde otras terminales). Las altas de este proceso
+    no lo mueven: un alta de otra terminal con un id menor igual se lee.
+  - Cada RECONSTRUIR_SEG (o después de invalidar) se vuelve a armar completo
+    en un hilo aparte (ediciones hechas desde otras terminales). Mientras
+    tanto las búsquedas se responden con el índice actual, y los cambios que
+    llegan durante la lectura se anotan y se aplican al índice nuevo antes de
+    reemplazar al actual.
+  """
+  REFRESCO_SEG = 5
+  RECONSTRUIR_SEG = 600
+
+  # Similitud mínima entre una palabra buscada y una palabra del nombre
+  UMBRAL = 0.5
+
+  def __init__(self):
+    self._clientes = {} # id -> (nombre, apellido, email, activo, palabras)
+    self._por_palabra = {} # palabra -> {ids de clientes}
+    self._por_trigrama = {} # trigrama -> [palabras]
+    self._ultimo_id = 0
+    self._construido_en = None
+    self._invalidado = False
+    self._refrescado_en = 0.0
+    self._cambios = None # durante una reconstrucción: clientes aplicados al índice actual, para repetirlos en el nuevo
+    self._lock = threading.Lock()
+    self._lock_construccion = threading.Lock()
+    self._lock_refresco = threading.Lock()
+
+  @property
+  def construido(self):
+    return self._construido_en is not None
+
+  def precargar(self):
+    """Arma el índice en segundo plano, para que la primera búsqueda no tenga que esperar."""
+    threading.Thread(target=self._asegurar_actualizado, daemon=True).start()
+
+  def invalidar(self):
+    """Fuerza a reconstruir el índice (en segundo plano, desde la próxima búsqueda)."""
+    with self._lock:
+      self._invalidado = True
+
+  def construir(self):
+    """
+    Arma el índice completo leyendo todos los clientes y reemplaza al actual.
+
+    Se arma un índice nuevo y recién al final se reemplaza el actual, así las
+    búsquedas no quedan bloqueadas mientras se leen todos los clientes. Los
+    clientes que se agregan o editan en el índice actual durante la lectura
+    (actualizar_usuario y _refrescar) se anotan en _cambios y se vuelven a
+    aplicar sobre el nuevo antes del reemplazo, para no perderlos.
+    """
+    from .modelo_usuario import Usuario
+
+    with self._lock:
+      self._cambios = []
+    try:
+      nuevo = IndiceClientes()
+      for cliente in Usuario.iterar_clientes(solo_activos=False):
+        nuevo._agregar(cliente)
+        nuevo._ultimo_id = max(nuevo._ultimo_id, cliente['id'])
+
+      with self._lock:
+        for usuario in self._cambios:
+          nuevo._aplicar(usuario)
+        self._clientes, self._por_palabra, self._por_trigrama = nuevo._clientes, nuevo._por_palabra, nuevo._por_trigrama
+        self._ultimo_id = max(self._ultimo_id, nuevo._ultimo_id)
+        self._construido_en = self._refrescado_en = time.monotonic()
+        self._invalidado = False
+    finally:
+      with self._lock:
+        self._cambios = None
+
+  def _reconstruir_en_segundo_plano(self):
+    """Reconstruye el índice en otro hilo, si no hay ya una reconstrucción en curso."""
+    if not self._lock_construccion.acquire(blocking=False):
+      return
+
+    def reconstruir():
+      try:
+        self.construir()
+      finally:
+        self._lock_construccion.release()
+    threading.Thread(target=reconstruir, daemon=True).start()
+
+  def _refrescar(self):
+    """
+    Agrega los clientes nuevos (id mayor al último leído). Las páginas se leen
+    sin el lock, así las búsquedas no esperan a la base; el lock se toma solo
+    para agregarlas.
+    """
+    from .modelo_usuario import Usuario
+
+    if not self._lock_refresco.acquire(blocking=False):
+      return # otro hilo ya está refrescando
+    try:
+      ultimo_id = self._ultimo_id
+      while True:
+        pagina = Usuario.listar_clientes_pagina(after_id=ultimo_id, limit=1000, solo_activos=False)
+        if pagina:
+          ultimo_id = pagina[-1]['id']
+          with self._lock:
+            for cliente in pagina:
+              self._agregar(cliente)
+            if self._cambios is not None:
+              self._cambios.extend(pagina)
+            self._ultimo_id = max(self._ultimo_id, ultimo_id)
+        if not pagina or len(pagina) < 1000:
+          break
+      self._refrescado_en = time.monotonic()
+    finally:
+      self._lock_refresco.release()
+
+  def _vencido(self):
+    return self._invalidado or time.monotonic() - self._construido_en > self.RECONSTRUIR_SEG
+
+  def _asegurar_actualizado(self):
+    from .modelo_base import ModeloBase
+
+    # Dentro de una transacción las lecturas verían sus escrituras sin confirmar (que
+    # pueden terminar en rollback): no se refresca, y si hace falta armar el índice
+    # se arma en otro hilo, con una conexión propia que solo ve lo confirmado
+    if getattr(ModeloBase._local, "conexion", None) is not None:
+      if not self.construido:
+        hilo = threading.Thread(target=self._asegurar_actualizado)
+        hilo.start()
+        hilo.join()
+      return
+
+    if not self.construido:
+      # La primera vez no hay con qué responder: se espera a que se arme
+      with self._lock_construccion:
+        if not self.construido: # otro hilo pudo armarlo mientras se esperaba
+          self.construir()
+    elif self._vencido():
+      self._reconstruir_en_segundo_plano()
+    if time.monotonic() - self._refrescado_en > self.REFRESCO_SEG:
+      self._refrescar()
+
+  def _agregar(self, cliente):
+    cliente_id = cliente['id']
+    self._quitar(cliente_id)
+    palabras = tuple(dict.fromkeys(
+      normalizar_texto(cliente['nombre']).split() + normalizar_texto(cliente['apellido']).split()
+    ))
+    self._clientes[cliente_id] = (cliente['nombre'], cliente['apellido'], cliente['email'], cliente['activo'], palabras)
+
+    for palabra in palabras:
+      ids = self._por_palabra.get(palabra)
+      if ids is None:
+        ids = self._por_palabra[palabra] = set()
+        for trigrama in trigramas(palabra):
+          self._por_trigrama.setdefault(trigrama, []).append(palabra)
+      ids.add(cliente_id)
+
+  def _aplicar(self, usuario):
+    """Agrega o actualiza un cliente; un usuario que ya no es cliente se quita."""
+    if usuario.get('rol') == 'cliente':
+      self._agregar(usuario)
+    else:
+      self._quitar(usuario['id'])
+
+  def _quitar(self, cliente_id):
+    # Las palabras que quedan sin clientes siguen en el vocabulario, pero no aportan resultados
+    anterior = self._clientes.pop(cliente_id, None)
+    if anterior is not None:
+      for palabra in anterior[4]:
+        self._por_palabra[palabra].discard(cliente_id)
+
+  def actualizar_usuario(self, usuario):
+    """
+    Aplica un alta o una edición hecha desde este proceso. Si el índice se está
+    armando también se anota, para aplicarla sobre el índice nuevo.
+
+    Args:
+      usuario (dict): Fila de Usuario (id, nombre, apellido, email, rol, activo).
+    """
+    with self._lock:
+      if self._cambios is not None:
+        self._cambios.append(usuario)
+      if self.construido:
+        self._aplicar(usuario)
+
+  def _palabras_parecidas(self, buscada, umbral):
+    """
+    Devuelve {palabra: similitud} del vocabulario para una palabra buscada.
+
+    La similitud es la fracción de los trigramas de la búsqueda que tiene la
+    palabra. Si la palabra empieza con lo buscado vale 1 ('mart' -> 'martinez'),
+    y si lo contiene en otra posición alcanza el umbral ('art' -> 'martinez').
+    """
+    buscados = trigramas(buscada)
+    comunes = Counter()
+    for trigrama in buscados:
+      comunes.update(self._por_trigrama.get(trigrama, ()))
+
+    parecidas = {}
+    for palabra, cantidad in comunes.items():
+      if palabra.startswith(buscada):
+        similitud = 1.0
+      else:
+        similitud = cantidad / len(buscados)
+        if buscada in palabra:
+          similitud = max(similitud, umbral)
+      if similitud >= umbral and self._por_palabra[palabra]:
+        parecidas[palabra] = similitud
+    return parecidas
+
+  def buscar(self, texto, limite=50, solo_activos=True, umbral=None):
+    """
+    Busca clientes por nombre y/o apellido.
+
+    Cada palabra buscada tiene que parecerse a alguna palabra del nombre o
+    apellido del cliente ('ana gomez' encuentra a Ana Gómez, no a todas las Ana).
+    La similitud del cliente es el promedio de la de cada palabra buscada.
+
+    Args:
+      texto (str): Parte del nombre o apellido (con o sin acentos).
+      limite (int): Cantidad máxima de resultados.
+      solo_activos (bool): Si solo debe devolver clientes activos.
+      umbral (float): Similitud mínima de cada palabra (por defecto UMBRAL).
+
+    Returns:
+      list[dict]: Clientes (id, nombre, apellido, email, rol, activo, similitud),
+        del más parecido al menos parecido.
+    """
+    buscadas = normalizar_texto(texto).split()
+    if not buscadas:
+      return []
+    umbral = self.UMBRAL if umbral is None else umbral
+
+    self._asegurar_actualizado()
+    with self._lock:
+      coincidencias = [self._palabras_parecidas(b, umbral) for b in buscadas]
+      # Se parte de la palabra con menos clientes y el resto solo se compara contra esos candidatos
+      coincidencias.sort(key=lambda parecidas: sum(len(self._por_palabra[p]) for p in parecidas))
+
+      puntajes = {}
+      for palabra, similitud in coincidencias[0].items():
+        for cliente_id in self._por_palabra[palabra]:
+          if similitud > puntajes.get(cliente_id, 0):
+            puntajes[cliente_id] = similitud
+
+      for parecidas in coincidencias[1:]:
+        siguientes = {}
+        for cliente_id, puntaje in puntajes.items():
+          mejor = max((parecidas.get(p, 0) for p in self._clientes[cliente_id][4]), default=0)
+          if mejor:
+            siguientes[cliente_id] = puntaje + mejor
+        puntajes = siguientes
+
+      # Solo hacen falta los `limite` mejores: nsmallest no ordena todos los candidatos
+      clientes = self._clientes
+      mejores = heapq.nsmallest(limite, (
+        (-puntaje, clientes[cliente_id][0], clientes[cliente_id][1], cliente_id)
+        for cliente_id, puntaje in puntajes.items()
+        if clientes[cliente_id][3] or not solo_activos
+      ))
+
+      resultados = []
+      for puntaje, nombre, apellido, cliente_id in mejores:
+        email, activo = clientes[cliente_id][2:4]
+        resultados.append({
+          'id': cliente_id, 'nombre': nombre, 'apellido': apellido, 'email': email,
+          'rol': 'cliente', 'activo': activo, 'similitud': round(-puntaje / len(buscadas), 3)
+        })
+    return resultados
+
+
+indice_clientes = IndiceClientes()
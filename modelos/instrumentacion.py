@@ -0,0 +1,276 @@
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache, wraps
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Límites (en ms) de los buckets de los histogramas, como los de Prometheus
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Cantidad de veces que una misma sentencia puede repetirse en una acción antes de marcarla como N+1
+UMBRAL_REPETICIONES = 5
+
+
+@lru_cache(maxsize=1024)
+def normalizar(query):
+  """
+  Reduce una consulta a su forma genérica para agrupar las estadísticas:
+  sin literales, con un solo tipo de placeholder y con las listas IN (...)
+  colapsadas (así IN con 2 o con 5 valores cuentan como la misma sentencia).
+  """
+  query = re.sub(r"'(?:[^']|'')*'", "?", query)
+  query = re.sub(r"\b\d+(?:\.\d+)?\b", "?", query)
+  query = query.replace("%s", "?")
+  query = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(...)", query)
+  return re.sub(r"\s+", " ", query).strip()
+
+
+class EstadisticaSentencia:
+  """Acumulado de todas las ejecuciones de una misma sentencia normalizada."""
+
+  def __init__(self):
+    self.ejecuciones = 0
+    self.errores = 0
+    self.parametros = 0
+    self.filas = 0
+    self.conexion_ms = 0.0
+    self.ejecucion_ms = 0.0
+    self.lectura_ms = 0.0
+    self.total_ms = 0.0
+    self.max_ms = 0.0
+    self.buckets = [0] * (len(BUCKETS_MS) + 1) # el último es +Inf
+
+  def agregar(self, parametros, filas, conexion_ms, ejecucion_ms, lectura_ms, error):
+    total_ms = conexion_ms + ejecucion_ms + lectura_ms
+    self.ejecuciones += 1
+    self.errores += 1 if error else 0
+    self.parametros += parametros
+    self.filas += filas
+    self.conexion_ms += conexion_ms
+    self.ejecucion_ms += ejecucion_ms
+    self.lectura_ms += lectura_ms
+    self.total_ms += total_ms
+    self.max_ms = max(self.max_ms, total_ms)
+    i = 0
+    while i < len(BUCKETS_MS) and total_ms > BUCKETS_MS[i]:
+      i += 1
+    self.buckets[i] += 1
+
+  def como_dict(self):
+    return {
+      "ejecuciones": self.ejecuciones,
+      "errores": self.errores,
+      "parametros": self.parametros,
+      "filas": self.filas,
+      "conexion_ms": round(self.conexion_ms, 3),
+      "ejecucion_ms": round(self.ejecucion_ms, 3),
+      "lectura_ms": round(self.lectura_ms, 3),
+      "total_ms": round(self.total_ms, 3),
+      "promedio_ms": round(self.total_ms / self.ejecuciones, 3) if self.ejecuciones else 0,
+      "max_ms": round(self.max_ms, 3),
+      "histograma": dict(zip([str(b) for b in BUCKETS_MS] + ["+Inf"], self.buckets)),
+    }
+
+
+class Instrumentacion:
+  """
+  Métricas de las consultas que pasan por ModeloBase.
+
+  - Por sentencia normalizada: ejecuciones, parámetros, filas, tiempos de
+    conexión / ejecución / lectura e histograma de la duración total.
+  - Slow-query log: cada consulta que supera `umbral_lento_ms` se agrega a un archivo.
+  - Por acción de menú (ver medir_accion): cuántas consultas hace cada ejecución
+    y qué sentencias se repiten dentro de una misma acción (patrón N+1).
+
+  Se configura con variables de entorno (ver .env.template) y, si está apagada,
+  ModeloBase no mide nada.
+  """
+
+  def __init__(self):
+    self.activa = os.getenv("DB_METRICAS", "0") == "1"
+    umbral = os.getenv("DB_SLOW_QUERY_MS")
+    self.umbral_lento_ms = float(umbral) if umbral else None
+    self.archivo_lento = os.getenv("DB_SLOW_QUERY_LOG", "slow_queries.log")
+    if self.umbral_lento_ms is not None:
+      self.activa = True
+
+    self._sentencias = {}
+    self._acciones = {}
+    self._lock = threading.Lock()
+    self._local = threading.local()
+
+  def activar(self, umbral_lento_ms=None, archivo_lento=None):
+    self.activa = True
+    if umbral_lento_ms is not None:
+      self.umbral_lento_ms = umbral_lento_ms
+    if archivo_lento is not None:
+      self.archivo_lento = archivo_lento
+
+  def desactivar(self):
+    self.activa = False
+
+  def reiniciar(self):
+    with self._lock:
+      self._sentencias.clear()
+      self._acciones.clear()
+
+  def registrar(self, query, parametros, filas, conexion_ms, ejecucion_ms, lectura_ms, error=False):
+    """Registra una ejecución. Lo llama ModeloBase después de cada consulta."""
+    sentencia = normalizar(query)
+    with self._lock:
+      estadistica = self._sentencias.get(sentencia)
+      if estadistica is None:
+        estadistica = self._sentencias[sentencia] = EstadisticaSentencia()
+      estadistica.agregar(parametros, filas, conexion_ms, ejecucion_ms, lectura_ms, error)
+
+    accion = getattr(self._local, "accion", None)
+    if accion is not None:
+      accion[sentencia] = accion.get(sentencia, 0) + 1
+
+    total_ms = conexion_ms + ejecucion_ms + lectura_ms
+    if self.umbral_lento_ms is not None and total_ms >= self.umbral_lento_ms:
+      self._registrar_lenta(sentencia, parametros, filas, conexion_ms, ejecucion_ms, lectura_ms)
+
+  def _registrar_lenta(self, sentencia, parametros, filas, conexion_ms, ejecucion_ms, lectura_ms):
+    # Solo se guarda la sentencia normalizada: los parámetros pueden tener datos personales
+    total_ms = conexion_ms + ejecucion_ms + lectura_ms
+    linea = (
+      f"{datetime.now().isoformat(timespec='seconds')} total={total_ms:.1f}ms "
+      f"conexion={conexion_ms:.1f}ms ejecucion={ejecucion_ms:.1f}ms lectura={lectura_ms:.1f}ms "
+      f"parametros={parametros} filas={filas} accion={getattr(self._local, 'nombre_accion', None) or '-'} | {sentencia}\n"
+    )
+    with self._lock:
+      with open(self.archivo_lento, "a", encoding="utf-8") as archivo:
+        archivo.write(linea)
+
+  @contextmanager
+  def accion(self, nombre):
+    """
+    Cuenta las consultas hechas dentro del bloque (en el mismo hilo) y las
+    acumula bajo `nombre`. Las acciones anidadas se suman a la exterior.
+    """
+    if not self.activa or getattr(self._local, "accion", None) is not None:
+      yield
+      return
+
+    self._local.accion = {}
+    self._local.nombre_accion = nombre
+    inicio = time.perf_counter()
+    try:
+      yield
+    finally:
+      duracion_ms = (time.perf_counter() - inicio) * 1000
+      consultas = self._local.accion
+      self._local.accion = None
+      self._local.nombre_accion = None
+      self._registrar_accion(nombre, consultas, duracion_ms)
+
+  def _registrar_accion(self, nombre, consultas, duracion_ms):
+    total = sum(consultas.values())
+    with self._lock:
+      acumulado = self._acciones.setdefault(nombre, {
+        "ejecuciones": 0, "consultas": 0, "max_consultas": 0, "duracion_ms": 0.0, "repetidas": {}
+      })
+      acumulado["ejecuciones"] += 1
+      acumulado["consultas"] += total
+      acumulado["max_consultas"] = max(acumulado["max_consultas"], total)
+      acumulado["duracion_ms"] += duracion_ms
+      for sentencia, veces in consultas.items():
+        if veces > UMBRAL_REPETICIONES:
+          acumulado["repetidas"][sentencia] = max(acumulado["repetidas"].get(sentencia, 0), veces)
+
+  def resumen(self):
+    """Devuelve todas las métricas como un diccionario serializable a JSON."""
+    with self._lock:
+      sentencias = {s: e.como_dict() for s, e in self._sentencias.items()}
+      acciones = {}
+      for nombre, a in self._acciones.items():
+        acciones[nombre] = dict(a, repetidas=dict(a["repetidas"]), duracion_ms=round(a["duracion_ms"], 3),
+                                promedio_consultas=round(a["consultas"] / a["ejecuciones"], 2))
+    return {"generado": datetime.now().isoformat(timespec='seconds'), "sentencias": sentencias, "acciones": acciones}
+
+  def exportar_json(self, ruta):
+    with open(ruta, "w", encoding="utf-8") as archivo:
+      json.dump(self.resumen(), archivo, indent=2, ensure_ascii=False)
+
+  def exportar_prometheus(self, ruta):
+    """Escribe las métricas en el formato de texto de Prometheus (para el textfile collector)."""
+    datos = self.resumen()
+
+    def etiqueta(texto):
+      return texto.replace("\\", "\\\\").replace('"', '\\"')
+
+    lineas = [
+      "# HELP salon_consulta_duracion_ms Duración total de cada sentencia (conexión + ejecución + lectura).",
+      "# TYPE salon_consulta_duracion_ms histogram",
+    ]
+    for sentencia, e in datos["sentencias"].items():
+      s = etiqueta(sentencia)
+      acumulado = 0
+      for limite, cantidad in e["histograma"].items():
+        acumulado += cantidad
+        lineas.append(f'salon_consulta_duracion_ms_bucket{{sentencia="{s}",le="{limite}"}} {acumulado}')
+      lineas.append(f'salon_consulta_duracion_ms_sum{{sentencia="{s}"}} {e["total_ms"]}')
+      lineas.append(f'salon_consulta_duracion_ms_count{{sentencia="{s}"}} {e["ejecuciones"]}')
+
+    for metrica, campo, ayuda in (
+      ("salon_consulta_filas_total", "filas", "Filas devueltas o afectadas."),
+      ("salon_consulta_errores_total", "errores", "Consultas que terminaron con error."),
+      ("salon_consulta_conexion_ms_total", "conexion_ms", "Tiempo esperando una conexión del pool."),
+      ("salon_consulta_ejecucion_ms_total", "ejecucion_ms", "Tiempo de execute."),
+      ("salon_consulta_lectura_ms_total", "lectura_ms", "Tiempo de fetch."),
+    ):
+      lineas.append(f"# HELP {metrica} {ayuda}")
+      lineas.append(f"# TYPE {metrica} counter")
+      for sentencia, e in datos["sentencias"].items():
+        lineas.append(f'{metrica}{{sentencia="{etiqueta(sentencia)}"}} {e[campo]}')
+
+    lineas.append("# HELP salon_accion_consultas_total Consultas hechas por cada acción de menú.")
+    lineas.append("# TYPE salon_accion_consultas_total counter")
+    for nombre, a in datos["acciones"].items():
+      lineas.append(f'salon_accion_consultas_total{{accion="{etiqueta(nombre)}"}} {a["consultas"]}')
+    lineas.append("# HELP salon_accion_ejecuciones_total Veces que se ejecutó cada acción de menú.")
+    lineas.append("# TYPE salon_accion_ejecuciones_total counter")
+    for nombre, a in datos["acciones"].items():
+      lineas.append(f'salon_accion_ejecuciones_total{{accion="{etiqueta(nombre)}"}} {a["ejecuciones"]}')
+
+    with open(ruta, "w", encoding="utf-8") as archivo:
+      archivo.write("\n".join(lineas) + "\n")
+
+  def exportar(self, ruta):
+    """Exporta en JSON si la ruta termina en .json y en formato Prometheus en otro caso."""
+    if ruta.endswith(".json"):
+      self.exportar_json(ruta)
+    else:
+      self.exportar_prometheus(ruta)
+
+
+metricas = Instrumentacion()
+
+def medir_accion(funcion=None, nombre=None):
+  """
+  Decorador para las acciones de los menús: cuenta las consultas que hace cada
+  llamada (ver Instrumentacion.accion). Se usa como @medir_accion o
+  @medir_accion(nombre="...").
+  """
+  def decorador(f):
+    etiqueta = nombre or f.__name__
+
+    @wraps(f)
+    def envoltura(*args, **kwargs):
+      with metricas.accion(etiqueta):
+        return f(*args, **kwargs)
+    return envoltura
+
+  return decorador(funcion) if funcion is not None else decorador
+
+# Si se indica un archivo, las métricas se exportan al salir de la aplicación
+if os.getenv("DB_METRICAS_ARCHIVO"):
+  atexit.register(lambda: metricas.activa and metricas.exportar(os.getenv("DB_METRICAS_ARCHIVO")))
@@ -1,9 +1,23 @@
-import mariadb
 import os
+import threading
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
-from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from .pool_conexiones import PoolConexiones
+from .backend import crear_backend
+from .instrumentacion import metricas
+from .cache import cache_consultas, tablas_escritas
+
+# passlib y bcrypt se cargan con el primer hash o login, no al importar (ver obtener_pwd_context)
+_pwd_context = None
+
+def obtener_pwd_context():
+  global _pwd_context
+  if _pwd_context is None:
+    from passlib.context import CryptContext
+    _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+  return _pwd_context
 
 load_dotenv()
 
@@ -14,65 +28,341 @@ class ModeloBase:
     "password": os.getenv("DB_PASSWORD"),
     "database": os.getenv("DB_NAME")
   }
+
+  # Configuración del pool de conexiones (ver .env.template)
+  POOL_CONFIG = {
+    "tamano": int(os.getenv("DB_POOL_SIZE", "5")),
+    "reciclar_cada": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "verificar_tras": int(os.getenv("DB_POOL_PING", "30"))
+  }
+
+  # Motor de base de datos (MariaDB o SQLite, ver modelos/backend.py) y pool de
+  # conexiones. Se comparten entre todos los modelos, por eso se guardan siempre en ModeloBase
+  _backend = None
+  _pool = None
+  _pool_lock = threading.Lock()
+
+  # Conexión de la transacción en curso (una por hilo), ver transaccion()
+  _local = threading.local()
   
   @staticmethod
   def _hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return obtener_pwd_context().hash(password)
 
   @classmethod
-  def _validar_config(cls):
-    missing = [k for k, v in cls.CONFIG.items() if v is None]
-    if missing:
-      raise RuntimeError(f"Faltan variables de entorno de DB: {missing}")
+  def obtener_backend(cls):
+    """Devuelve el motor configurado con DB_BACKEND (ver .env.template)."""
+    if ModeloBase._backend is None:
+      with ModeloBase._pool_lock:
+        if ModeloBase._backend is None:
+          ModeloBase._backend = crear_backend(ModeloBase.CONFIG)
+    return ModeloBase._backend
 
   @classmethod
   def conectar(cls):
-    cls._validar_config()
+    backend = cls.obtener_backend()
     try:
-      conn = mariadb.connect(**cls.CONFIG)
+      conn = backend.conectar()
       return conn
-    except mariadb.Error as e:
+    except backend.Error as e:
       print(f"[ERROR] No se pudo conectar a la base de datos: {e}")
       return None
 
   @classmethod
-  def ejecutar(cls, query, params=(), fetch=False, last_id=False, dict_cursor=False):
-    conn = cls.conectar()
-    if not conn:
-      return None
+  def obtener_pool(cls):
+    """Devuelve el pool de conexiones compartido, creándolo la primera vez."""
+    if ModeloBase._pool is None:
+      backend = cls.obtener_backend()
+      with ModeloBase._pool_lock:
+        if ModeloBase._pool is None:
+          ModeloBase._pool = PoolConexiones(
+            backend.conectar,
+            verificar=backend.verificar,
+            **ModeloBase.POOL_CONFIG
+          )
+    return ModeloBase._pool
+
+  @classmethod
+  def cerrar_pool(cls):
+    """Cierra las conexiones del pool (por ejemplo, al salir de la aplicación)."""
+    with ModeloBase._pool_lock:
+      if ModeloBase._pool is not None:
+        ModeloBase._pool.cerrar()
+        ModeloBase._pool = None
+
+  @classmethod
+  @contextmanager
+  def transaccion(cls):
+    """
+    Agrupa varias llamadas a los modelos en una sola transacción.
+
+    Todas las llamadas a ejecutar() dentro del bloque (en el mismo hilo) usan la
+    misma conexión y se confirman con un único commit al salir. Si ocurre un
+    error se hace rollback y la excepción se propaga. Si ya hay una transacción
+    en curso, el bloque se une a ella.
+
+    Ejemplo:
+      with ModeloBase.transaccion() as tx:
+        turno_id = Turno.crear(...)
+        TurnoServicio.agregar_servicio(turno_id, ...)
+    """
+    actual = getattr(ModeloBase._local, "conexion", None)
+    if actual is not None:
+      yield actual
+      return
+
+    backend = cls.obtener_backend()
+    pool = cls.obtener_pool()
+    conn = pool.obtener()
+    ModeloBase._local.conexion = conn
+    ModeloBase._local.tablas_escritas = set()
+    ModeloBase._local.al_confirmar = []
+    try:
+      backend.iniciar_transaccion(conn)
+      yield conn
+      conn.commit()
+    except BaseException:
+      try:
+        conn.rollback()
+      except backend.Error:
+        pass
+      raise
+    finally:
+      ModeloBase._local.conexion = None
+      pool.devolver(conn)
+      # Recién ahora los cambios son visibles para las demás conexiones (ver cache.py)
+      cache_consultas.incrementar(ModeloBase._local.tablas_escritas)
+      ModeloBase._local.tablas_escritas = set()
+      pendientes, ModeloBase._local.al_confirmar = ModeloBase._local.al_confirmar, []
+
+    # Solo se llega acá si hubo commit: con rollback la excepción ya se propagó
+    for funcion in pendientes:
+      funcion()
+
+  @classmethod
+  def al_confirmar(cls, funcion):
+    """
+    Ejecuta `funcion` cuando los cambios quedan confirmados: enseguida si no hay
+    una transacción en curso, o después de su commit (nunca si se hace rollback).
+    Sirve para reflejar una escritura en estructuras en memoria, como el índice
+    de clientes, sin mostrar datos que después se descartan.
+    """
+    if getattr(ModeloBase._local, "conexion", None) is None:
+      funcion()
+    else:
+      ModeloBase._local.al_confirmar.append(funcion)
+
+  @classmethod
+  def _usar_conexion(cls, operacion, dict_cursor=False, commit=True, medicion=None):
+    """
+    Ejecuta operacion(cursor) sobre la conexión de la transacción en curso o,
+    si no hay ninguna, sobre una conexión del pool que se confirma y se devuelve.
+
+    Si se pasa `medicion` (ver _nueva_medicion), se anota el tiempo que tardó
+    en obtenerse la conexión y si la operación terminó con error.
+    """
+    backend = cls.obtener_backend()
+    pool = cls.obtener_pool()
+    medicion = medicion if medicion is not None else {}
+
+    # Dentro de una transacción se reutiliza su conexión y no se hace commit aquí
+    conn_tx = getattr(ModeloBase._local, "conexion", None)
+    if conn_tx is not None:
+      conn = conn_tx
+    else:
+      inicio = time.perf_counter()
+      try:
+        conn = pool.obtener()
+      except backend.Error as e:
+        print(f"[ERROR] No se pudo conectar a la base de datos: {e}")
+        medicion["error"] = True
+        return None
+      medicion["conexion"] = time.perf_counter() - inicio
 
+    cursor = None
     try:
       # Crear cursor en formato diccionario si se solicita
-      if dict_cursor:
-        cursor = conn.cursor(dictionary=True)
-      else:
-        cursor = conn.cursor()
+      cursor = backend.cursor(conn, dict_cursor=dict_cursor)
 
-      cursor.execute(query, params)
+      resultado = operacion(cursor)
 
-      if fetch:
-        rows = cursor.fetchall()
-        return rows  # conn se cerrará en finally
+      if commit and conn_tx is None:
+        conn.commit()
 
-      conn.commit()
+      return resultado
+
+    except backend.Error as e:
+      print(f"[ERROR SQL] {e}")
+      medicion["error"] = True
+      if conn_tx is not None:
+        raise # el error debe abortar la transacción en curso
+      return None
+    finally:
+      # asegurar que la conexión vuelva siempre al pool
+      try:
+        if cursor is not None:
+          cursor.close()
+      except Exception:
+        pass
+      if conn_tx is None:
+        pool.devolver(conn)
+
+  @staticmethod
+  def _nueva_medicion():
+    """Tiempos (en segundos) y resultado de una consulta, para la instrumentación."""
+    return {"conexion": 0.0, "ejecucion": 0.0, "lectura": 0.0, "filas": 0, "error": False}
+
+  @staticmethod
+  def _registrar_medicion(query, parametros, medicion):
+    if metricas.activa:
+      metricas.registrar(
+        query, parametros, medicion["filas"],
+        medicion["conexion"] * 1000, medicion["ejecucion"] * 1000, medicion["lectura"] * 1000,
+        medicion["error"]
+      )
+
+  @staticmethod
+  def _registrar_escritura(query):
+    """
+    Incrementa la versión de las tablas que modifica `query`, lo que invalida
+    los resultados cacheados que las leyeron (ver cache.py). Dentro de una
+    transacción se anotan y se incrementan al terminarla.
+    """
+    tablas = tablas_escritas(query)
+    if not tablas:
+      return
+    if getattr(ModeloBase._local, "conexion", None) is not None:
+      ModeloBase._local.tablas_escritas.update(tablas)
+    else:
+      cache_consultas.incrementar(tablas)
+
+  @classmethod
+  def ejecutar(cls, query, params=(), fetch=False, last_id=False, dict_cursor=False):
+    # Las consultas se escriben en el dialecto de MariaDB; el backend las adapta si hace falta
+    sql = cls.obtener_backend().traducir(query)
+    medicion = cls._nueva_medicion()
+
+    def operacion(cursor):
+      inicio = time.perf_counter()
+      cursor.execute(sql, params)
+      medicion["ejecucion"] = time.perf_counter() - inicio
+
+      if fetch:
+        inicio = time.perf_counter()
+        filas = cursor.fetchall()
+        medicion["lectura"] = time.perf_counter() - inicio
+        medicion["filas"] = len(filas)
+        return filas
 
       if last_id:
+        medicion["filas"] = 1
         return cursor.lastrowid
 
       # devolver número de filas afectadas
+      medicion["filas"] = max(cursor.rowcount, 0)
       return cursor.rowcount
 
-    except mariadb.Error as e:
+    try:
+      return cls._usar_conexion(operacion, dict_cursor=dict_cursor, commit=not fetch, medicion=medicion)
+    finally:
+      cls._registrar_medicion(query, len(params), medicion)
+      if not fetch:
+        cls._registrar_escritura(query)
+
+  @classmethod
+  def ejecutar_lote(cls, query, lista_params):
+    """
+    Ejecuta una misma sentencia de escritura para varias filas de parámetros.
+
+    Usa executemany, que el conector envía al servidor en un solo viaje, y se
+    confirma con un único commit (o con el de la transacción en curso).
+
+    Args:
+      query (str): Sentencia INSERT/UPDATE/DELETE con placeholders.
+      lista_params (iterable): Una tupla de parámetros por fila.
+
+    Returns:
+      int | None: Filas afectadas, o None si hubo un error.
+    """
+    lista_params = list(lista_params)
+    if not lista_params:
+      return 0
+    sql = cls.obtener_backend().traducir(query)
+    medicion = cls._nueva_medicion()
+
+    def operacion(cursor):
+      inicio = time.perf_counter()
+      cursor.executemany(sql, lista_params)
+      medicion["ejecucion"] = time.perf_counter() - inicio
+      medicion["filas"] = max(cursor.rowcount, 0)
+      return cursor.rowcount
+
+    try:
+      return cls._usar_conexion(operacion, medicion=medicion)
+    finally:
+      cls._registrar_medicion(query, sum(len(p) for p in lista_params), medicion)
+      cls._registrar_escritura(query)
+
+  @classmethod
+  def iterar(cls, query, params=(), dict_cursor=True, lote=500):
+    """
+    Recorre el resultado de una consulta fila por fila sin cargarlo entero en memoria.
+
+    Fuera de una transacción usa una conexión propia del pool con un cursor no
+    buffereado, de modo que las filas se traen del servidor de a `lote` con
+    fetchmany. La conexión vuelve al pool cuando se termina de iterar o cuando
+    el generador se cierra (break, excepción o recolección).
+
+    Dentro de una transacción se usa su conexión con un cursor buffereado, porque
+    un cursor no buffereado bloquearía las demás consultas de la transacción.
+
+    Args:
+      query (str): Consulta SELECT con placeholders.
+      params (tuple): Parámetros de la consulta.
+      dict_cursor (bool): Si cada fila se devuelve como diccionario.
+      lote (int): Filas pedidas al cursor en cada fetchmany.
+
+    Yields:
+      dict | tuple: Cada fila del resultado.
+    """
+    backend = cls.obtener_backend()
+    pool = cls.obtener_pool()
+    medicion = cls._nueva_medicion()
+    conn_tx = getattr(ModeloBase._local, "conexion", None)
+    inicio = time.perf_counter()
+    conn = conn_tx if conn_tx is not None else pool.obtener()
+    medicion["conexion"] = time.perf_counter() - inicio if conn_tx is None else 0.0
+
+    cursor = None
+    try:
+      cursor = backend.cursor(conn, dict_cursor=dict_cursor, buffered=conn_tx is not None)
+      inicio = time.perf_counter()
+      cursor.execute(backend.traducir(query), params)
+      medicion["ejecucion"] = time.perf_counter() - inicio
+      while True:
+        # Solo se mide la lectura del cursor, no el tiempo que tarda quien consume las filas
+        inicio = time.perf_counter()
+        filas = cursor.fetchmany(lote)
+        medicion["lectura"] += time.perf_counter() - inicio
+        if not filas:
+          break
+        medicion["filas"] += len(filas)
+        yield from filas
+    except backend.Error as e:
       print(f"[ERROR SQL] {e}")
-      return None
+      medicion["error"] = True
+      if conn_tx is not None:
+        raise
     finally:
-      # asegurar que la conexión se cierre siempre
+      cls._registrar_medicion(query, len(params), medicion)
       try:
-        cursor.close()
+        if cursor is not None:
+          cursor.close()
       except Exception:
         pass
-      conn.close()
-      
+      if conn_tx is None:
+        pool.devolver(conn)
+
   @classmethod
   def autenticar(cls, email, password):
     # obtener usuario por email
@@ -83,6 +373,6 @@ class ModeloBase:
     usuario = rows[0]
     password_hash = usuario["password_hash"]
     # verificar con passlib
-    if pwd_context.verify(password, password_hash):
+    if obtener_pwd_context().verify(password, password_hash):
       return {"id": usuario["id"], "nombre": usuario["nombre"], "apellido": usuario["apellido"], "email": usuario["email"], "rol": usuario["rol"]}
     return None
\ No newline at end of file
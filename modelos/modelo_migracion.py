@@ -0,0 +1,96 @@
+import os
+import re
+
+from modelos.modelo_base import ModeloBase
+
+# Directorio con los archivos NNN_descripcion.sql (y NNN_descripcion.<backend>.sql
+# cuando una migración necesita una versión propia para otro motor, ej. .sqlite.sql)
+DIRECTORIO_MIGRACIONES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts', 'migraciones')
+
+class Migracion(ModeloBase):
+  TABLA = "Schema_Version"
+
+  @classmethod
+  def asegurar_tabla(cls):
+    """Crea la tabla que registra las versiones aplicadas, si no existe."""
+    query = f"""
+      CREATE TABLE IF NOT EXISTS {cls.TABLA} (
+        version INT PRIMARY KEY,
+        descripcion VARCHAR(255) NOT NULL,
+        aplicada_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+      )
+    """
+    with cls.transaccion():
+      cls.ejecutar(query)
+
+  @classmethod
+  def versiones_aplicadas(cls):
+    rows = cls.ejecutar(f"SELECT version FROM {cls.TABLA}", fetch=True) or []
+    return {r[0] for r in rows}
+
+  @classmethod
+  def listar_archivos(cls, directorio=DIRECTORIO_MIGRACIONES):
+    """
+    Devuelve las migraciones disponibles ordenadas por versión.
+
+    Si una versión tiene un archivo específico del backend en uso
+    (NNN_descripcion.sqlite.sql) se usa ese en lugar del genérico, que está
+    escrito para MariaDB.
+
+    Returns:
+      list[tuple]: (version, descripcion, ruta) por cada migración.
+    """
+    dialecto = cls.obtener_backend().nombre
+    por_version = {}
+    for nombre in os.listdir(directorio):
+      match = re.fullmatch(r"(\d+)_(\w+?)(?:\.(\w+))?\.sql", nombre)
+      if not match or match.group(3) not in (None, dialecto):
+        continue
+      version = int(match.group(1))
+      # El archivo del dialecto tiene prioridad sobre el genérico
+      if version in por_version and match.group(3) is None:
+        continue
+      por_version[version] = (version, match.group(2).replace('_', ' '), os.path.join(directorio, nombre))
+    return sorted(por_version.values())
+
+  @staticmethod
+  def leer_sentencias(ruta):
+    """Separa un archivo .sql en sentencias (terminadas en ';' al final de línea), sin comentarios."""
+    with open(ruta, encoding='utf-8') as archivo:
+      lineas = [l for l in archivo if not l.strip().startswith('--')]
+    sentencias = re.split(r";\s*$", "".join(lineas), flags=re.MULTILINE)
+    return [s.strip() for s in sentencias if s.strip()]
+
+  @classmethod
+  def pendientes(cls, directorio=DIRECTORIO_MIGRACIONES):
+    cls.asegurar_tabla()
+    aplicadas = cls.versiones_aplicadas()
+    return [m for m in cls.listar_archivos(directorio) if m[0] not in aplicadas]
+
+  @classmethod
+  def aplicar(cls, version, descripcion, ruta):
+    """
+    Ejecuta las sentencias de una migración y registra su versión.
+
+    Se ejecuta dentro de una transacción para que cualquier error se propague
+    y la versión no quede registrada (las sentencias DDL hacen commit
+    implícito, por eso las migraciones se escriben idempotentes con IF NOT EXISTS).
+    """
+    with cls.transaccion():
+      for sentencia in cls.leer_sentencias(ruta):
+        cls.ejecutar(sentencia)
+      cls.ejecutar(f"INSERT INTO {cls.TABLA} (version, descripcion) VALUES (%s, %s)", (version, descripcion))
+
+  @classmethod
+  def migrar(cls, directorio=DIRECTORIO_MIGRACIONES):
+    """
+    Aplica en orden todas las migraciones pendientes.
+
+    Returns:
+      list[tuple]: Las migraciones aplicadas (version, descripcion, ruta).
+    """
+    aplicadas = []
+    for version, descripcion, ruta in cls.pendientes(directorio):
+      cls.aplicar(version, descripcion, ruta)
+      aplicadas.append((version, descripcion, ruta))
+    return aplicadas
@@ -0,0 +1,201 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from modelos.modelo_base import ModeloBase
+from modelos.cache import cacheado
+
+
+class Reporte(ModeloBase):
+  """
+  Reportes de facturación a partir de tablas de resumen por día de cobro.
+
+  Reporte_Diario guarda los turnos cobrados y los ingresos de cada día, y
+  Reporte_Servicio_Diario lo mismo por servicio. Se actualizan en la misma
+  transacción que el cobro (Turno.registrar_cobro) y que su anulación
+  (Turno.anular_cobro), así que un reporte de un año lee a lo sumo 365 filas
+  por servicio en lugar de recorrer Turno y Turno_Servicio. El historial se
+  carga o se corrige con reconstruir() (ver scripts/backfill_reportes.py).
+  """
+  TABLA = "Reporte_Diario"
+  TABLA_SERVICIO = "Reporte_Servicio_Diario"
+
+  @staticmethod
+  def _rango(desde, hasta):
+    # fecha_cobro es DATETIME: el último día se incluye completo
+    return datetime.combine(desde, time.min), datetime.combine(hasta + timedelta(days=1), time.min)
+
+  @classmethod
+  def _aplicar_cobros(cls, turno_ids, signo):
+    """
+    Suma (signo 1) o descuenta (signo -1) turnos cobrados en las tablas de
+    resumen, con un INSERT ... SELECT agrupado por día (y servicio) para todos.
+    """
+    marcadores = ", ".join(["%s"] * len(turno_ids))
+    cls.ejecutar(f"""
+      INSERT INTO {cls.TABLA} (fecha, turnos, ingresos)
+      SELECT DATE(fecha_cobro), %s * COUNT(*), %s * COALESCE(SUM(total), 0)
+      FROM Turno WHERE id IN ({marcadores}) AND fecha_cobro IS NOT NULL
+      GROUP BY DATE(fecha_cobro)
+      ON DUPLICATE KEY UPDATE turnos = turnos + VALUES(turnos), ingresos = ROUND(ingresos + VALUES(ingresos), 2)
+    """, (signo, signo, *turno_ids))
+    cls.ejecutar(f"""
+      INSERT INTO {cls.TABLA_SERVICIO} (fecha, servicio_id, cantidad, ingresos)
+      SELECT DATE(t.fecha_cobro), ts.servicio_id, %s * COUNT(*), %s * COALESCE(SUM(ts.precio_cobrado), 0)
+      FROM Turno t JOIN Turno_Servicio ts ON ts.turno_id = t.id
+      WHERE t.id IN ({marcadores}) AND t.fecha_cobro IS NOT NULL
+      GROUP BY DATE(t.fecha_cobro), ts.servicio_id
+      ON DUPLICATE KEY UPDATE cantidad = cantidad + VALUES(cantidad), ingresos = ROUND(ingresos + VALUES(ingresos), 2)
+    """, (signo, signo, *turno_ids))
+
+  @classmethod
+  def sumar_cobro(cls, turno_id):
+    """Agrega un turno recién cobrado (ya con estado 'realizado' y fecha_cobro)."""
+    cls._aplicar_cobros([turno_id], 1)
+
+  @classmethod
+  def sumar_cobros(cls, turno_ids):
+    """Agrega varios turnos recién cobrados (cierre de caja) con una sola consulta por tabla."""
+    cls._aplicar_cobros(turno_ids, 1)
+
+  @classmethod
+  def descontar_cobro(cls, turno_id):
+    """Quita un turno cobrado de los resúmenes (antes de borrar o cambiar su fecha_cobro)."""
+    cls._aplicar_cobros([turno_id], -1)
+
+  @classmethod
+  def reconstruir(cls, desde, hasta):
+    """
+    Recalcula los resúmenes de un rango de días desde Turno y Turno_Servicio,
+    en una transacción (los reportes no ven el rango vacío a mitad de camino).
+
+    Args:
+      desde (date): Primer día.
+      hasta (date): Último día (inclusive).
+
+    Returns:
+      int: Días con cobros en el rango.
+    """
+    inicio, fin = cls._rango(desde, hasta)
+    with cls.transaccion():
+      cls.ejecutar(f"DELETE FROM {cls.TABLA} WHERE fecha >= %s AND fecha <= %s", (desde, hasta))
+      cls.ejecutar(f"DELETE FROM {cls.TABLA_SERVICIO} WHERE fecha >= %s AND fecha <= %s", (desde, hasta))
+      dias = cls.ejecutar(f"""
+        INSERT INTO {cls.TABLA} (fecha, turnos, ingresos)
+        SELECT DATE(fecha_cobro), COUNT(*), COALESCE(SUM(total), 0)
+        FROM Turno
+        WHERE estado = 'realizado' AND fecha_cobro >= %s AND fecha_cobro < %s
+        GROUP BY DATE(fecha_cobro)
+      """, (inicio, fin))
+      cls.ejecutar(f"""
+        INSERT INTO {cls.TABLA_SERVICIO} (fecha, servicio_id, cantidad, ingresos)
+        SELECT DATE(t.fecha_cobro), ts.servicio_id, COUNT(*), COALESCE(SUM(ts.precio_cobrado), 0)
+        FROM Turno t JOIN Turno_Servicio ts ON ts.turno_id = t.id
+        WHERE t.estado = 'realizado' AND t.fecha_cobro >= %s AND t.fecha_cobro < %s
+        GROUP BY DATE(t.fecha_cobro), ts.servicio_id
+      """, (inicio, fin))
+    return dias
+
+  @classmethod
+  def rango_cobros(cls):
+    """
+    Returns:
+      tuple | None: (primer día, último día) con turnos cobrados, o None si no hay.
+    """
+    # ORDER BY ... LIMIT 1 en lugar de MIN/MAX: usa el índice y conserva el tipo DATETIME en SQLite
+    query = "SELECT fecha_cobro FROM Turno WHERE estado = 'realizado' AND fecha_cobro IS NOT NULL ORDER BY fecha_cobro {} LIMIT 1"
+    primero = cls.ejecutar(query.format("ASC"), fetch=True)
+    ultimo = cls.ejecutar(query.format("DESC"), fetch=True)
+    if not primero or not ultimo:
+      return None
+    return primero[0][0].date(), ultimo[0][0].date()
+
+  @classmethod
+  def diferencias(cls, desde, hasta):
+    """
+    Compara Reporte_Diario con lo que da recorrer los turnos cobrados.
+
+    Returns:
+      list[tuple]: (fecha, (turnos, ingresos) del resumen, (turnos, ingresos) de Turno)
+        para cada día que no coincide.
+    """
+    inicio, fin = cls._rango(desde, hasta)
+    resumen = cls.ejecutar(
+      f"SELECT fecha, turnos, ingresos FROM {cls.TABLA} WHERE fecha >= %s AND fecha <= %s",
+      (desde, hasta), fetch=True
+    ) or []
+    calculado = cls.ejecutar("""
+      SELECT DATE(fecha_cobro), COUNT(*), COALESCE(SUM(total), 0) FROM Turno
+      WHERE estado = 'realizado' AND fecha_cobro >= %s AND fecha_cobro < %s
+      GROUP BY DATE(fecha_cobro)
+    """, (inicio, fin), fetch=True) or []
+
+    def por_dia(filas):
+      # DATE() puede volver como texto (SQLite) y los días sin cobros se toman como vacíos
+      return {
+        str(fecha): (turnos, Decimal(str(ingresos)).quantize(Decimal("0.01")))
+        for fecha, turnos, ingresos in filas if turnos
+      }
+
+    a, b = por_dia(resumen), por_dia(calculado)
+    return [(fecha, a.get(fecha), b.get(fecha)) for fecha in sorted(a.keys() | b.keys()) if a.get(fecha) != b.get(fecha)]
+
+  @classmethod
+  @cacheado("Reporte_Diario")
+  def resumen(cls, desde, hasta, agrupacion="dia"):
+    """
+    Turnos cobrados, ingresos y ticket promedio por día, semana o mes.
+
+    Args:
+      desde (date): Primer día.
+      hasta (date): Último día (inclusive).
+      agrupacion (str): 'dia', 'semana' (empieza el lunes) o 'mes'.
+
+    Returns:
+      list[dict]: (periodo, turnos, ingresos, ticket_promedio) ordenada por periodo,
+        solo para los periodos con cobros. None si hubo un error.
+    """
+    rows = cls.ejecutar(
+      f"SELECT fecha, turnos, ingresos FROM {cls.TABLA} WHERE fecha >= %s AND fecha <= %s ORDER BY fecha",
+      (desde, hasta), fetch=True, dict_cursor=True
+    )
+    if rows is None:
+      return None
+
+    periodos = {}
+    for r in rows:
+      if not r['turnos']:
+        continue
+      fecha = r['fecha']
+      if agrupacion == "semana":
+        fecha = fecha - timedelta(days=fecha.weekday())
+      elif agrupacion == "mes":
+        fecha = fecha.replace(day=1)
+      turnos, ingresos = periodos.get(fecha, (0, Decimal(0)))
+      periodos[fecha] = (turnos + r['turnos'], ingresos + Decimal(r['ingresos']))
+
+    return [
+      {'periodo': fecha, 'turnos': turnos, 'ingresos': ingresos,
+       'ticket_promedio': (ingresos / turnos).quantize(Decimal("0.01"))}
+      for fecha, (turnos, ingresos) in sorted(periodos.items())
+    ]
+
+  @classmethod
+  @cacheado("Reporte_Servicio_Diario", "Servicio")
+  def por_servicio(cls, desde, hasta):
+    """
+    Cantidad e ingresos de cada servicio cobrado entre dos fechas (inclusive),
+    del que más facturó al que menos.
+
+    Returns:
+      list[dict]: (servicio_id, nombre, cantidad, ingresos).
+    """
+    query = f"""
+      SELECT r.servicio_id, s.nombre, SUM(r.cantidad) AS cantidad, SUM(r.ingresos) AS ingresos
+      FROM {cls.TABLA_SERVICIO} r
+      LEFT JOIN Servicio s ON r.servicio_id = s.id
+      WHERE r.fecha >= %s AND r.fecha <= %s
+      GROUP BY r.servicio_id, s.nombre
+      HAVING SUM(r.cantidad) > 0
+      ORDER BY ingresos DESC
+    """
+    return cls.ejecutar(query, (desde, hasta), fetch=True, dict_cursor=True)
@@ -1,8 +1,105 @@
+import os
+import threading
+import time
+
 from modelos.modelo_base import ModeloBase
+from modelos.cache import cache_consultas
+
+
+class CatalogoServicios:
+  """
+  Copia en memoria del catálogo de servicios, que cambia pocas veces al mes
+  pero se lee en cada reserva y cada listado.
+
+  Guarda los servicios por id (búsqueda O(1)) y la lista de activos ya armada.
+  Se vuelve a leer de la base cuando pasan `ttl` segundos (cambios hechos desde
+  otras terminales) o cuando se invalida (cambios hechos desde este proceso,
+  ver Servicio.crear, actualizar y desactivar). También se descarta si cambió
+  la versión de la tabla Servicio (cualquier escritura, ver cache.py).
+  """
+
+  def __init__(self, ttl):
+    self.ttl = ttl
+    self.aciertos = 0
+    self.fallos = 0
+    self._por_id = {}
+    self._todos = []
+    self._activos = []
+    self._cargado_en = None
+    self._version = None
+    self._generacion = 0 # cambia con cada invalidar(), para no guardar una carga vieja
+    self._lock = threading.Lock()
+
+  def invalidar(self):
+    with self._lock:
+      self._cargado_en = None
+      self._generacion += 1
+
+  def _vigente(self):
+    return (
+      self._cargado_en is not None
+      and time.monotonic() - self._cargado_en < self.ttl
+      and self._version == cache_consultas.version(Servicio.TABLA)
+    )
+
+  @staticmethod
+  def _armar(servicios):
+    return {s['id']: s for s in servicios}, servicios, [s for s in servicios if s['activo']]
+
+  def obtener(self, cargar):
+    """
+    Devuelve (por_id, todos, activos), cargando el catálogo con `cargar()` si hace falta.
+
+    La carga se hace sin el lock (las demás lecturas siguen usando el catálogo
+    vigente o cargan el suyo) y el resultado se guarda al final, salvo que el
+    catálogo se haya invalidado mientras tanto. Dentro de una transacción se lee
+    siempre de la base, como en @cacheado: la transacción tiene que ver sus
+    propios cambios.
+
+    Returns:
+      tuple | None: None si no se pudo leer la base.
+    """
+    if getattr(ModeloBase._local, "conexion", None) is not None:
+      servicios = cargar()
+      return self._armar(servicios) if servicios is not None else None
+
+    with self._lock:
+      if self._vigente():
+        self.aciertos += 1
+        return self._por_id, self._todos, self._activos
+      self.fallos += 1
+      generacion = self._generacion
+
+    version = cache_consultas.version(Servicio.TABLA)
+    servicios = cargar()
+    if servicios is None:
+      return None # error de base de datos: no se cachea
+
+    catalogo = self._armar(servicios)
+    with self._lock:
+      if self._generacion == generacion:
+        self._por_id, self._todos, self._activos = catalogo
+        self._cargado_en = time.monotonic()
+        self._version = version
+    return catalogo
+
+  def estadisticas(self):
+    total = self.aciertos + self.fallos
+    return {
+      "aciertos": self.aciertos,
+      "fallos": self.fallos,
+      "tasa_aciertos": round(self.aciertos / total, 3) if total else 0,
+      "servicios": len(self._todos),
+      "edad_seg": round(time.monotonic() - self._cargado_en, 1) if self._cargado_en is not None else None,
+    }
+
 
 class Servicio(ModeloBase):
   TABLA = "Servicio"
 
+  # Catálogo en memoria (ver CatalogoServicios); el TTL se configura en el .env
+  catalogo = CatalogoServicios(ttl=int(os.getenv("DB_CACHE_SERVICIOS_TTL", "300")))
+
   @classmethod
   def crear(cls, nombre, descripcion, precio, duracion_estimada):
     """Crea un nuevo servicio en la base de datos."""
@@ -10,23 +107,40 @@ class Servicio(ModeloBase):
       INSERT INTO {cls.TABLA} (nombre, descripcion, precio, duracion_estimada)
       VALUES (%s, %s, %s, %s)
     """
-    return cls.ejecutar(query, (nombre, descripcion, precio, duracion_estimada), last_id=True)
+    servicio_id = cls.ejecutar(query, (nombre, descripcion, precio, duracion_estimada), last_id=True)
+    cls.catalogo.invalidar()
+    return servicio_id
 
   @classmethod
-  def listar_todos(cls, solo_activos=False):
-    """Obtiene todos los servicios."""
-    query = f"SELECT * FROM {cls.TABLA}"
-    
-    if solo_activos:
-      query += " WHERE activo = True"
+  def _cargar_catalogo(cls):
+    query = f"SELECT * FROM {cls.TABLA} ORDER BY id"
     return cls.ejecutar(query, fetch=True, dict_cursor=True)
 
+  @classmethod
+  def listar_todos(cls, solo_activos=False):
+    """
+    Obtiene todos los servicios (del catálogo en memoria, sin consultar la base
+    mientras esté vigente). Se devuelven copias: modificarlas no altera el catálogo.
+    """
+    catalogo = cls.catalogo.obtener(cls._cargar_catalogo)
+    if catalogo is None:
+      return None
+    _, todos, activos = catalogo
+    return [dict(s) for s in (activos if solo_activos else todos)]
+
   @classmethod
   def obtener_por_id(cls, servicio_id):
     """Obtiene un servicio por su ID."""
-    query = f"SELECT * FROM {cls.TABLA} WHERE id = %s"
-    rows = cls.ejecutar(query, (servicio_id,), fetch=True, dict_cursor=True)
-    return rows[0] if rows else None
+    catalogo = cls.catalogo.obtener(cls._cargar_catalogo)
+    if catalogo is None:
+      return None
+    servicio = catalogo[0].get(servicio_id)
+    return dict(servicio) if servicio else None
+
+  @classmethod
+  def estadisticas_cache(cls):
+    """Aciertos y fallos del catálogo en memoria."""
+    return cls.catalogo.estadisticas()
 
   @classmethod
   def actualizar(cls, servicio_id, nombre, descripcion, precio, duracion_estimada, activo):
@@ -36,10 +150,13 @@ class Servicio(ModeloBase):
       SET nombre = %s, descripcion = %s, precio = %s, duracion_estimada = %s, activo = %s
       WHERE id = %s
     """
-    return cls.ejecutar(query, (nombre, descripcion, precio, duracion_estimada, activo, servicio_id))
+    filas = cls.ejecutar(query, (nombre, descripcion, precio, duracion_estimada, activo, servicio_id))
+    cls.catalogo.invalidar()
+    return filas
 
   @classmethod
   def desactivar(cls, servicio_id):
     query = f"UPDATE {cls.TABLA} SET activo = FALSE WHERE id = %s"
-    return cls.ejecutar(query, (servicio_id,))
-
+    filas = cls.ejecutar(query, (servicio_id,))
+    cls.catalogo.invalidar()
+    return filas
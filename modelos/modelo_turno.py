@@ -1,22 +1,32 @@
+from datetime import datetime, time, timedelta
+
 from modelos.modelo_base import ModeloBase
+from modelos.cache import cacheado
+from modelos.modelo_reporte import Reporte
 
 class Turno(ModeloBase):
   TABLA = "Turno"
+  TABLA_SLOT = "Turno_Slot"
+
+  # Cantidad máxima de turnos activos por horario
+  CAPACIDAD_SLOT = 3
 
   @classmethod
-  def crear(cls, cliente_id, fecha_hora, total=0.0):
-    """Crea un nuevo turno pendiente."""
+  def crear(cls, cliente_id, fecha_hora, total=0.0, duracion=60, peluquero_id=None):
+    """Crea un nuevo turno pendiente (duracion en minutos)."""
     query = f"""
-      INSERT INTO {cls.TABLA} (cliente_id, fecha_hora, total)
-      VALUES (%s, %s, %s)
+      INSERT INTO {cls.TABLA} (cliente_id, fecha_hora, total, duracion, peluquero_id)
+      VALUES (%s, %s, %s, %s, %s)
     """
-    return cls.ejecutar(query, (cliente_id, fecha_hora, total), last_id=True)
+    return cls.ejecutar(query, (cliente_id, fecha_hora, total, duracion, peluquero_id), last_id=True)
 
   @classmethod
-  def listar(cls, estado=None, cliente_id=None,fecha_hoy=False):
+  def _consulta_listar(cls, estado=None, cliente_id=None, fecha_hoy=False, after_fecha=None, after_id=None):
     """
-    Devuelve una lista de turnos con filtros opcionales, incluyendo el nombre
-    del cliente y los servicios asociados.
+    Arma la consulta de listar() y sus variantes paginadas.
+
+    Returns:
+      tuple: (query, params) ordenada por fecha_hora e id.
     """
     base_query = f"""
       SELECT 
@@ -47,6 +57,13 @@ class Turno(ModeloBase):
       filtros.append("t.fecha_hora > now()")
       #params.append(fecha_hoy)  
 
+    # Paginación por clave (keyset): continúa después del último turno mostrado.
+    # Se escribe con OR en lugar de (fecha_hora, id) > (%s, %s) para que el
+    # optimizador pueda usar el índice sobre fecha_hora como rango.
+    if after_fecha is not None:
+      filtros.append("t.fecha_hora >= %s AND (t.fecha_hora > %s OR t.id > %s)")
+      params.extend([after_fecha, after_fecha, after_id or 0])
+
     if filtros:
       base_query += " WHERE " + " AND ".join(filtros)
 
@@ -58,10 +75,169 @@ class Turno(ModeloBase):
         u1.nombre, u1.apellido
     """
     
-    base_query += " ORDER BY t.fecha_hora ASC"
+    # El id desempata los turnos del mismo horario, así cada página continúa sin repetir ni saltear filas
+    base_query += " ORDER BY t.fecha_hora ASC, t.id ASC"
+
+    return base_query, params
+
+  @classmethod
+  def listar(cls, estado=None, cliente_id=None,fecha_hoy=False):
+    """
+    Devuelve una lista de turnos con filtros opcionales, incluyendo el nombre
+    del cliente y los servicios asociados.
+
+    Con fecha_hoy el resultado depende de la hora (now()) y no solo de las
+    tablas, así que no se cachea.
+    """
+    if not fecha_hoy:
+      return cls._listar_cacheado(estado, cliente_id)
+    query, params = cls._consulta_listar(estado, cliente_id, fecha_hoy)
+    return cls.ejecutar(query, params, fetch=True, dict_cursor=True)
+
+  @classmethod
+  @cacheado("Turno", "Usuario", "Turno_Servicio", "Servicio")
+  def _listar_cacheado(cls, estado=None, cliente_id=None):
+    query, params = cls._consulta_listar(estado, cliente_id)
+    return cls.ejecutar(query, params, fetch=True, dict_cursor=True)
+
+  @classmethod
+  def listar_pagina(cls, estado=None, cliente_id=None, fecha_hoy=False, after_fecha=None, after_id=None, limit=20):
+    """
+    Devuelve una página de listar(), empezando después del turno (after_fecha, after_id).
+
+    Para pedir la página siguiente se pasan la fecha_hora y el id del último
+    turno recibido. Cada página cuesta lo mismo sin importar cuántas haya antes
+    (a diferencia de OFFSET, que recorre y descarta las filas anteriores).
+
+    Args:
+      after_fecha (datetime): fecha_hora del último turno de la página anterior (None = primera página).
+      after_id (int): id del último turno de la página anterior.
+      limit (int): Cantidad máxima de turnos de la página.
+
+    Returns:
+      list[dict]: Los turnos de la página, en el mismo formato que listar().
+    """
+    query, params = cls._consulta_listar(estado, cliente_id, fecha_hoy, after_fecha, after_id)
+    query += " LIMIT %s"
+    params.append(limit)
+    return cls.ejecutar(query, params, fetch=True, dict_cursor=True)
+
+  @classmethod
+  def iterar_listado(cls, estado=None, cliente_id=None, fecha_hoy=False):
+    """
+    Igual que listar(), pero devuelve un generador que trae las filas del
+    cursor a medida que se consumen (ver ModeloBase.iterar).
+    """
+    query, params = cls._consulta_listar(estado, cliente_id, fecha_hoy)
+    return cls.iterar(query, params)
+
+  # Origen de los minutos que devuelve iterar_columnas (un sábado)
+  EPOCA_MINUTOS = datetime(2000, 1, 1)
+
+  @classmethod
+  def iterar_columnas(cls, desde, hasta):
+    """
+    Recorre los turnos entre dos fechas (inclusive) como tuplas planas, sin
+    diccionarios ni objetos datetime, para cargarlas en arreglos (ver funciones/analitica.py).
 
-    return cls.ejecutar(base_query, params, fetch=True, dict_cursor=True)
+    Returns:
+      generator: (minutos desde EPOCA_MINUTOS, estado, total, duracion) por turno.
+    """
+    query = f"""
+      SELECT TIMESTAMPDIFF(MINUTE, '2000-01-01 00:00:00', fecha_hora), estado, COALESCE(total, 0), duracion
+      FROM {cls.TABLA}
+      WHERE fecha_hora >= %s AND fecha_hora < %s
+    """
+    params = (datetime.combine(desde, time.min), datetime.combine(hasta + timedelta(days=1), time.min))
+    return cls.iterar(query, params, dict_cursor=False, lote=5000)
   
+  @classmethod
+  def listar_cobrados(cls, desde, hasta):
+    """
+    Devuelve los turnos cobrados entre dos fechas (inclusive, por fecha_cobro)
+    con los datos que lleva el ticket, en una sola consulta.
+
+    Returns:
+      list[dict]: (id, fecha_hora, fecha_cobro, total, cliente_nombre, cliente_apellido)
+        ordenada por fecha_cobro.
+    """
+    query = f"""
+      SELECT t.id, t.fecha_hora, t.fecha_cobro, t.total,
+        u.nombre AS cliente_nombre, u.apellido AS cliente_apellido
+      FROM {cls.TABLA} t
+      JOIN Usuario u ON t.cliente_id = u.id
+      WHERE t.estado = 'realizado' AND t.fecha_cobro >= %s AND t.fecha_cobro < %s
+      ORDER BY t.fecha_cobro ASC, t.id ASC
+    """
+    params = (datetime.combine(desde, time.min), datetime.combine(hasta + timedelta(days=1), time.min))
+    return cls.ejecutar(query, params, fetch=True, dict_cursor=True)
+
+  @classmethod
+  def listar_confirmados(cls, desde, hasta):
+    """
+    Devuelve los turnos 'confirmado' entre dos fechas (inclusive, por fecha_hora),
+    para cobrarlos (ver registrar_cobros). Usa el índice (estado, fecha_hora).
+
+    Returns:
+      list[dict]: (id, fecha_hora, total, cliente_nombre, cliente_apellido) ordenada por fecha_hora.
+    """
+    query = f"""
+      SELECT t.id, t.fecha_hora, t.total,
+        u.nombre AS cliente_nombre, u.apellido AS cliente_apellido
+      FROM {cls.TABLA} t
+      JOIN Usuario u ON t.cliente_id = u.id
+      WHERE t.estado = 'confirmado' AND t.fecha_hora >= %s AND t.fecha_hora < %s
+      ORDER BY t.fecha_hora ASC, t.id ASC
+    """
+    params = (datetime.combine(desde, time.min), datetime.combine(hasta + timedelta(days=1), time.min))
+    return cls.ejecutar(query, params, fetch=True, dict_cursor=True)
+
+  @classmethod
+  def listar_por_ids(cls, turno_ids, tamano_consulta=5000):
+    """
+    Devuelve varios turnos con los datos que lleva el ticket (como
+    listar_cobrados), con una consulta IN por cada `tamano_consulta` turnos.
+
+    Returns:
+      list[dict]: (id, fecha_hora, fecha_cobro, total, cliente_nombre, cliente_apellido)
+        ordenada por fecha_hora.
+    """
+    turno_ids = list(turno_ids)
+    turnos = []
+    for i in range(0, len(turno_ids), tamano_consulta):
+      parte = turno_ids[i:i + tamano_consulta]
+      marcadores = ", ".join(["%s"] * len(parte))
+      rows = cls.ejecutar(f"""
+        SELECT t.id, t.fecha_hora, t.fecha_cobro, t.total,
+          u.nombre AS cliente_nombre, u.apellido AS cliente_apellido
+        FROM {cls.TABLA} t
+        JOIN Usuario u ON t.cliente_id = u.id
+        WHERE t.id IN ({marcadores})
+      """, parte, fetch=True, dict_cursor=True) or []
+      turnos.extend(rows)
+    return sorted(turnos, key=lambda t: (t['fecha_hora'], t['id']))
+
+  @classmethod
+  def fechas_cobro(cls, turno_ids, tamano_consulta=5000):
+    """
+    Devuelve la fecha de cobro de varios turnos, con una consulta IN por cada
+    `tamano_consulta` turnos.
+
+    Returns:
+      dict: turno_id -> fecha_cobro (solo los turnos que la tienen).
+    """
+    turno_ids = list(turno_ids)
+    fechas = {}
+    for i in range(0, len(turno_ids), tamano_consulta):
+      parte = turno_ids[i:i + tamano_consulta]
+      marcadores = ", ".join(["%s"] * len(parte))
+      rows = cls.ejecutar(
+        f"SELECT id, fecha_cobro FROM {cls.TABLA} WHERE id IN ({marcadores}) AND fecha_cobro IS NOT NULL",
+        parte, fetch=True
+      ) or []
+      fechas.update((r[0], r[1]) for r in rows)
+    return fechas
+
   @classmethod
   def obtener_por_id(cls, turno_id):
     query = f"""SELECT T.id, T.fecha_hora, T.estado, T.total, GROUP_CONCAT(S.nombre SEPARATOR ', ') AS servicios
@@ -73,29 +249,56 @@ class Turno(ModeloBase):
     return turno[0] if turno else None
 
   @classmethod
-  def listar_ocupados(cls, estado=None):
-    """Devuelve una lista de turnos en fecha y hora separados con un determinado estado."""
-    base_query = f"""
-      SELECT DATE_FORMAT(t.fecha_hora, '%Y-%m-%d') fecha, hour(t.fecha_hora) hora 
-      FROM {cls.TABLA} t
+  def listar_ocupacion(cls, desde, hasta):
     """
-    filtros = []
-    params = []
+    Devuelve la cantidad de turnos activos por horario entre dos fechas (inclusive).
 
-    if estado:
-      filtros.append("t.estado = %s")
-      params.append(estado)
+    Lee el contador por horario (Turno_Slot) con un rango sobre su clave
+    primaria, así que el costo depende solo de la ventana pedida y no del
+    historial de turnos.
 
-    if filtros:
-      base_query += " WHERE " + " AND ".join(filtros)
+    Args:
+      desde (date): Primer día de la ventana.
+      hasta (date): Último día de la ventana.
 
-    base_query += " ORDER BY t.fecha_hora DESC"
+    Returns:
+      dict: {(fecha, hora): ocupados} solo para los horarios con turnos.
+    """
+    query = f"""
+      SELECT fecha_hora, ocupados FROM {cls.TABLA_SLOT}
+      WHERE fecha_hora >= %s AND fecha_hora < %s AND ocupados > 0
+    """
+    inicio = datetime.combine(desde, time.min)
+    fin = datetime.combine(hasta + timedelta(days=1), time.min)
+    rows = cls.ejecutar(query, (inicio, fin), fetch=True, dict_cursor=True) or []
+
+    return {(r['fecha_hora'].date(), r['fecha_hora'].hour): r['ocupados'] for r in rows}
+
+  @classmethod
+  def listar_agenda(cls, desde, hasta, peluquero_id=None):
+    """
+    Devuelve los turnos activos con peluquero asignado entre dos fechas (inclusive),
+    ordenados por inicio. Sirve para armar disponibilidad.AgendaPeluqueros.
+    """
+    query = f"""
+      SELECT peluquero_id, fecha_hora, duracion FROM {cls.TABLA}
+      WHERE fecha_hora >= %s AND fecha_hora < %s
+        AND estado IN ('pendiente', 'confirmado')
+    """
+    params = [datetime.combine(desde, time.min), datetime.combine(hasta + timedelta(days=1), time.min)]
+
+    if peluquero_id:
+      query += " AND peluquero_id = %s"
+      params.append(peluquero_id)
+    else:
+      query += " AND peluquero_id IS NOT NULL"
 
-    return cls.ejecutar(base_query, params, fetch=True, dict_cursor=True)
+    query += " ORDER BY fecha_hora ASC"
+    return cls.ejecutar(query, params, fetch=True, dict_cursor=True)
 
   @classmethod
   def listar_para_cliente(cls, cliente_id):
-    # Devuelve la lista de turnos pendientes del cliente
+    # Devuelve la lista de turnos pendientes del cliente (sin caché: depende de now())
     query = f'''SELECT T.id, T.fecha_hora, T.total, GROUP_CONCAT(S.nombre SEPARATOR ', ') AS servicios
       FROM {cls.TABLA} T JOIN Turno_Servicio TS ON T.id = TS.turno_id
       JOIN Servicio S ON TS.servicio_id = S.id
@@ -111,6 +314,21 @@ class Turno(ModeloBase):
     query = f"UPDATE {cls.TABLA} SET estado = %s WHERE id = %s"
     return cls.ejecutar(query, (nuevo_estado, turno_id))
 
+  @classmethod
+  def cambiar_estado(cls, turno_id, estado_actual, nuevo_estado):
+    """
+    Cambia el estado de un turno solo si todavía está en `estado_actual`.
+
+    La condición va en el mismo UPDATE, así que si otro usuario lo cambió
+    mientras tanto (ej. el cliente canceló el turno que la recepción estaba
+    por confirmar) no se pisa su cambio ni se revive un turno cancelado.
+
+    Returns:
+      bool: True si el turno cambió de estado.
+    """
+    query = f"UPDATE {cls.TABLA} SET estado = %s WHERE id = %s AND estado = %s"
+    return bool(cls.ejecutar(query, (nuevo_estado, turno_id, estado_actual)))
+
   @classmethod
   def actualizar_total(cls, turno_id, total):
     """Actualiza el total del turno."""
@@ -118,12 +336,200 @@ class Turno(ModeloBase):
     return cls.ejecutar(query, (total, turno_id))
   
   @classmethod
-  def verificar_disponibilidad(cls, fecha_hora, limite_turnos=3):
+  def reservar(cls, cliente_id, fecha_hora, total=0.0, duracion=60, slots=None, limite_turnos=None, peluquero_id=None):
+    """
+    Crea un turno solo si queda capacidad en todos los horarios que ocupa, de forma atómica.
+
+    La capacidad se controla con un contador por horario (tabla Turno_Slot). Las
+    filas de los horarios se bloquean en orden cronológico, así que solo se
+    serializan las reservas que comparten algún horario y el resto de la
+    tabla Turno no se bloquea.
+
+    Si se indica un peluquero, antes se bloquea su fila en Usuario (solo se
+    serializan las reservas de ese peluquero) y se verifica que no tenga otro
+    turno superpuesto.
+
+    Args:
+      cliente_id (int): ID del cliente.
+      fecha_hora (datetime): Inicio del turno.
+      total (Decimal | float): Total del turno.
+      duracion (int): Duración total en minutos.
+      slots (list[datetime]): Horarios que ocupa el turno (ver
+        funciones.disponibilidad.slots_del_turno). Por defecto, solo fecha_hora.
+      limite_turnos (int): Capacidad de cada horario (por defecto CAPACIDAD_SLOT).
+      peluquero_id (int): Peluquero asignado (opcional).
+
+    Returns:
+      int | None: ID del turno creado, o None si algún horario está completo
+        o el peluquero ya no está libre.
+    """
+    limite = limite_turnos or cls.CAPACIDAD_SLOT
+    slots = sorted(slots or [fecha_hora])
+    marcadores = ", ".join(["%s"] * len(slots))
+
+    with cls.transaccion():
+      if peluquero_id and not cls._bloquear_peluquero_libre(peluquero_id, fecha_hora, duracion):
+        return None # El peluquero ya tiene un turno en ese intervalo
+
+      # Crear las filas de los horarios que falten. ON DUPLICATE KEY toma el lock
+      # exclusivo directamente y evita el deadlock típico de INSERT IGNORE.
+      cls.ejecutar_lote(f"""
+        INSERT INTO {cls.TABLA_SLOT} (fecha_hora, ocupados) VALUES (%s, 0)
+        ON DUPLICATE KEY UPDATE ocupados = ocupados
+      """, [(slot,) for slot in slots])
+
+      # FOR UPDATE lee el último valor confirmado aunque la transacción ya tenga una vista anterior
+      rows = cls.ejecutar(
+        f"SELECT ocupados FROM {cls.TABLA_SLOT} WHERE fecha_hora IN ({marcadores}) FOR UPDATE",
+        slots, fetch=True, dict_cursor=True
+      )
+      if len(rows) != len(slots) or any(r['ocupados'] >= limite for r in rows):
+        return None # Algún horario está completo
+
+      cls.ejecutar(
+        f"UPDATE {cls.TABLA_SLOT} SET ocupados = ocupados + 1 WHERE fecha_hora IN ({marcadores})",
+        slots
+      )
+
+      return cls.crear(cliente_id, fecha_hora, total, duracion, peluquero_id)
+
+  @classmethod
+  def _bloquear_peluquero_libre(cls, peluquero_id, fecha_hora, duracion):
+    """
+    Bloquea la fila del peluquero hasta el fin de la transacción y verifica que
+    no tenga turnos activos superpuestos con [fecha_hora, fecha_hora + duracion).
+    """
+    bloqueado = cls.ejecutar(
+      "SELECT id FROM Usuario WHERE id = %s AND rol = 'peluquero' AND activo = TRUE FOR UPDATE",
+      (peluquero_id,), fetch=True
+    )
+    if not bloqueado:
+      return False
+
+    fin = fecha_hora + timedelta(minutes=duracion)
+    # Ningún turno dura más de un día: basta con mirar desde 24 hs antes. La lectura
+    # con FOR UPDATE ve los últimos turnos confirmados y, gracias al índice
+    # (peluquero_id, fecha_hora), solo bloquea la agenda de este peluquero.
+    candidatos = cls.ejecutar(f"""
+      SELECT fecha_hora, duracion FROM {cls.TABLA}
+      WHERE peluquero_id = %s AND fecha_hora > %s AND fecha_hora < %s
+        AND estado IN ('pendiente', 'confirmado')
+      FOR UPDATE
+    """, (peluquero_id, fecha_hora - timedelta(days=1), fin), fetch=True, dict_cursor=True)
+
+    return all(t['fecha_hora'] + timedelta(minutes=t['duracion']) <= fecha_hora for t in candidatos)
+
+  @classmethod
+  def cancelar(cls, turno_id):
+    """
+    Cancela un turno activo y libera su lugar en todos los horarios que ocupaba.
+
+    Returns:
+      bool: True si el turno se canceló, False si no existe o ya no estaba activo.
+    """
+    with cls.transaccion():
+      # Bloquear el turno para que dos cancelaciones no liberen el lugar dos veces
+      rows = cls.ejecutar(
+        f"SELECT fecha_hora, duracion, estado FROM {cls.TABLA} WHERE id = %s FOR UPDATE",
+        (turno_id,), fetch=True, dict_cursor=True
+      )
+      if not rows or rows[0]['estado'] not in ('pendiente', 'confirmado'):
+        return False
+
+      cls._liberar_horarios(rows[0]['fecha_hora'], rows[0]['duracion'])
+      cls.actualizar_estado(turno_id, 'cancelado')
+      return True
+
+  @classmethod
+  def _liberar_horarios(cls, inicio, duracion):
+    """Descuenta un turno de todos los horarios que ocupaba (Turno_Slot)."""
+    fin = inicio + timedelta(minutes=duracion or 60)
+    cls.ejecutar(
+      f"""UPDATE {cls.TABLA_SLOT} SET ocupados = ocupados - 1
+        WHERE fecha_hora >= %s AND fecha_hora < %s AND ocupados > 0""",
+      (inicio, fin)
+    )
+
+  @classmethod
+  def registrar_cobro(cls, turno_id):
+    """
+    Pasa un turno de 'confirmado' a 'realizado', registra la fecha de cobro y lo
+    suma a los reportes de facturación, todo en una transacción (se une a la
+    del llamador si hay una).
+
+    Returns:
+      bool: True si se cobró, False si el turno ya no estaba confirmado.
+    """
+    with cls.transaccion():
+      filas = cls.ejecutar(
+        f"UPDATE {cls.TABLA} SET estado = 'realizado', fecha_cobro = now() WHERE id = %s AND estado = 'confirmado'",
+        (turno_id,)
+      )
+      if filas != 1:
+        return False
+      Reporte.sumar_cobro(turno_id)
+      return True
+
+  @classmethod
+  def registrar_cobros(cls, turno_ids):
+    """
+    Cobra varios turnos a la vez (cierre de caja): bloquea los que siguen
+    'confirmado', los pasa a 'realizado' con un solo UPDATE y los suma a los
+    reportes con una consulta por tabla, todo en una transacción.
+
+    Returns:
+      list[int]: Los turnos cobrados (se omiten los que ya no estaban confirmados).
+    """
+    if not turno_ids:
+      return []
+    with cls.transaccion():
+      marcadores = ", ".join(["%s"] * len(turno_ids))
+      rows = cls.ejecutar(
+        f"SELECT id FROM {cls.TABLA} WHERE id IN ({marcadores}) AND estado = 'confirmado' FOR UPDATE",
+        list(turno_ids), fetch=True
+      )
+      cobrables = [r[0] for r in rows]
+      if not cobrables:
+        return []
+
+      marcadores = ", ".join(["%s"] * len(cobrables))
+      cls.ejecutar(
+        f"UPDATE {cls.TABLA} SET estado = 'realizado', fecha_cobro = now() WHERE id IN ({marcadores})",
+        cobrables
+      )
+      Reporte.sumar_cobros(cobrables)
+    return cobrables
+
+  @classmethod
+  def anular_cobro(cls, turno_id):
+    """
+    Anula el cobro de un turno 'realizado': lo descuenta de los reportes, libera
+    sus horarios y lo deja 'cancelado'.
+
+    Returns:
+      bool: True si se anuló, False si no existe o no estaba cobrado.
+    """
+    with cls.transaccion():
+      rows = cls.ejecutar(
+        f"SELECT fecha_hora, duracion, estado FROM {cls.TABLA} WHERE id = %s FOR UPDATE",
+        (turno_id,), fetch=True, dict_cursor=True
+      )
+      if not rows or rows[0]['estado'] != 'realizado':
+        return False
+
+      Reporte.descontar_cobro(turno_id)
+      cls._liberar_horarios(rows[0]['fecha_hora'], rows[0]['duracion'])
+      cls.actualizar_estado(turno_id, 'cancelado')
+      return True
+
+  @classmethod
+  def verificar_disponibilidad(cls, fecha_hora, limite_turnos=None):
     """
     Verifica si hay capacidad para crear un nuevo turno en una fecha_hora específica.
     
-    Cuenta el número de turnos existentes (PENDIENTES) en el mismo 
-    minuto y verifica si es menor que el límite.
+    Consulta el contador de turnos activos del horario. Es solo informativo:
+    la reserva en sí debe hacerse con reservar(), que vuelve a controlar la
+    capacidad de forma atómica.
     
     Args:
       fecha_hora (datetime): La fecha y hora exacta del turno propuesto.
@@ -132,31 +538,36 @@ class Turno(ModeloBase):
     Returns:
       bool: True si hay disponibilidad (contador < limite), False en caso contrario.
     """
+    limite = limite_turnos or cls.CAPACIDAD_SLOT
     
-    # 1. Convertir la fecha_hora a un string para la consulta SQL
-    # La base de datos necesita la fecha y hora exactas para la comparación.
-    fecha_hora_str = fecha_hora.strftime('%Y-%m-%d %H:%M:%S')
+    query = f"SELECT ocupados FROM {cls.TABLA_SLOT} WHERE fecha_hora = %s"
+    rows = cls.ejecutar(query, (fecha_hora,), fetch=True, dict_cursor=True)
     
-    # 2. La consulta cuenta los turnos activos (no cancelados ni realizados)
-    # en la fecha_hora exacta.
-    query = f"""
-        SELECT 
-          COUNT(id) AS turnos_ocupados
-        FROM {cls.TABLA}
-        WHERE fecha_hora = %s
-          AND estado = 'pendiente'
-    """
-    
-    rows = cls.ejecutar(query, (fecha_hora_str,), fetch=True, dict_cursor=True)
-    
-    # Si la consulta devuelve un resultado, extraemos el contador
-    turnos_ocupados = rows[0]['turnos_ocupados'] if rows and rows[0]['turnos_ocupados'] is not None else 0
+    turnos_ocupados = rows[0]['ocupados'] if rows else 0
     
-    # 3. Verificar si la cuenta es menor que el límite
-    return turnos_ocupados < limite_turnos
+    return turnos_ocupados < limite
 
   @classmethod
   def eliminar(cls, turno_id):
-    """Elimina un turno (también elimina relaciones en Turno_Servicio por ON DELETE CASCADE)."""
-    query = f"DELETE FROM {cls.TABLA} WHERE id = %s"
-    return cls.ejecutar(query, (turno_id,))
+    """
+    Elimina un turno (también elimina relaciones en Turno_Servicio por ON DELETE CASCADE).
+
+    Si no estaba cancelado libera sus horarios y, si estaba cobrado, lo descuenta
+    de los reportes antes de borrarlo, en la misma transacción.
+
+    Returns:
+      int: Filas borradas (0 si el turno no existe).
+    """
+    with cls.transaccion():
+      rows = cls.ejecutar(
+        f"SELECT fecha_hora, duracion, estado FROM {cls.TABLA} WHERE id = %s FOR UPDATE",
+        (turno_id,), fetch=True, dict_cursor=True
+      )
+      if not rows:
+        return 0
+
+      if rows[0]['estado'] == 'realizado':
+        Reporte.descontar_cobro(turno_id)
+      if rows[0]['estado'] != 'cancelado':
+        cls._liberar_horarios(rows[0]['fecha_hora'], rows[0]['duracion'])
+      return cls.ejecutar(f"DELETE FROM {cls.TABLA} WHERE id = %s", (turno_id,))
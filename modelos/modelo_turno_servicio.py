@@ -1,4 +1,7 @@
+from datetime import datetime, time, timedelta
+
 from modelos.modelo_base import ModeloBase
+from modelos.cache import cacheado
 
 class TurnoServicio(ModeloBase):
   TABLA = "Turno_Servicio"
@@ -13,6 +16,22 @@ class TurnoServicio(ModeloBase):
     return cls.ejecutar(query, (turno_id, servicio_id, precio_cobrado))
 
   @classmethod
+  def agregar_servicios(cls, turno_id, servicios):
+    """
+    Asocia varios servicios a un turno en una sola operación.
+
+    Args:
+      turno_id (int): ID del turno.
+      servicios (list): Lista de tuplas (servicio_id, precio_cobrado).
+    """
+    query = f"""
+      INSERT INTO {cls.TABLA} (turno_id, servicio_id, precio_cobrado)
+      VALUES (%s, %s, %s)
+    """
+    return cls.ejecutar_lote(query, [(turno_id, servicio_id, precio) for servicio_id, precio in servicios])
+
+  @classmethod
+  @cacheado("Turno_Servicio", "Servicio")
   def listar_por_turno(cls, turno_id):
     """Devuelve los servicios asociados a un turno."""
     query = f"""
@@ -23,6 +42,57 @@ class TurnoServicio(ModeloBase):
     """
     return cls.ejecutar(query, (turno_id,), fetch=True, dict_cursor=True)
 
+  @classmethod
+  def listar_por_turnos_cobrados(cls, desde, hasta):
+    """
+    Devuelve los servicios de todos los turnos cobrados entre dos fechas
+    (inclusive), en una sola consulta (ver Turno.listar_cobrados).
+
+    Returns:
+      dict: turno_id -> lista de servicios (servicio_id, nombre, precio_cobrado).
+    """
+    query = f"""
+      SELECT ts.turno_id, ts.servicio_id, s.nombre, ts.precio_cobrado
+      FROM Turno t
+      JOIN {cls.TABLA} ts ON ts.turno_id = t.id
+      JOIN Servicio s ON ts.servicio_id = s.id
+      WHERE t.estado = 'realizado' AND t.fecha_cobro >= %s AND t.fecha_cobro < %s
+    """
+    params = (datetime.combine(desde, time.min), datetime.combine(hasta + timedelta(days=1), time.min))
+    rows = cls.ejecutar(query, params, fetch=True, dict_cursor=True)
+    if rows is None:
+      return None
+    return cls._agrupar_por_turno(rows)
+
+  @classmethod
+  def listar_por_turnos(cls, turno_ids, tamano_consulta=5000):
+    """
+    Devuelve los servicios de varios turnos, con una consulta IN por cada
+    `tamano_consulta` turnos (ver Turno.listar_por_ids).
+
+    Returns:
+      dict: turno_id -> lista de servicios (servicio_id, nombre, precio_cobrado).
+    """
+    turno_ids = list(turno_ids)
+    rows = []
+    for i in range(0, len(turno_ids), tamano_consulta):
+      parte = turno_ids[i:i + tamano_consulta]
+      marcadores = ", ".join(["%s"] * len(parte))
+      rows.extend(cls.ejecutar(f"""
+        SELECT ts.turno_id, ts.servicio_id, s.nombre, ts.precio_cobrado
+        FROM {cls.TABLA} ts
+        JOIN Servicio s ON ts.servicio_id = s.id
+        WHERE ts.turno_id IN ({marcadores})
+      """, parte, fetch=True, dict_cursor=True) or [])
+    return cls._agrupar_por_turno(rows)
+
+  @staticmethod
+  def _agrupar_por_turno(rows):
+    por_turno = {}
+    for r in rows:
+      por_turno.setdefault(r.pop('turno_id'), []).append(r)
+    return por_turno
+
   @classmethod
   def eliminar_servicios_turno(cls, turno_id):
     """Elimina todas las relaciones de servicios de un turno (por ejemplo, al cancelar)."""
@@ -1,4 +1,6 @@
 from .modelo_base import ModeloBase
+from .cache import cacheado
+from .indice_clientes import indice_clientes
 
 
 class Usuario(ModeloBase):
@@ -8,10 +10,53 @@ class Usuario(ModeloBase):
   def crear(cls, nombre, apellido, email, password, rol):
     query = f"""
     INSERT INTO {cls.TABLA} (nombre, apellido, email, password_hash, rol)
-    VALUES (?, ?, ?, ?, ?)
+    VALUES (%s, %s, %s, %s, %s)
     """
     password = ModeloBase._hash_password(password)
-    return cls.ejecutar(query, (nombre, apellido, email, password, rol), last_id=True)
+    usuario_id = cls.ejecutar(query, (nombre, apellido, email, password, rol), last_id=True)
+    if usuario_id:
+      usuario = {'id': usuario_id, 'nombre': nombre, 'apellido': apellido, 'email': email, 'rol': rol, 'activo': True}
+      # Si se crea dentro de una transacción, el índice se actualiza recién con el commit
+      cls.al_confirmar(lambda: indice_clientes.actualizar_usuario(usuario))
+    return usuario_id
+
+  @classmethod
+  def crear_lote(cls, usuarios):
+    """
+    Crea varios usuarios en una sola transacción (todos o ninguno).
+
+    Args:
+      usuarios (list): Tuplas (nombre, apellido, email, password_hash, rol), con
+        la contraseña ya hasheada (ver scripts/importar_clientes.py).
+
+    Returns:
+      int: Cantidad de usuarios creados.
+    """
+    query = f"""
+    INSERT INTO {cls.TABLA} (nombre, apellido, email, password_hash, rol)
+    VALUES (%s, %s, %s, %s, %s)
+    """
+    with cls.transaccion():
+      cls.ejecutar_lote(query, usuarios)
+    return len(usuarios)
+
+  @classmethod
+  def emails_existentes(cls, emails, tamano_consulta=5000):
+    """
+    Devuelve cuáles de los emails ya están registrados, con una consulta IN
+    por cada `tamano_consulta` emails (en lugar de una por email).
+
+    Returns:
+      set[str]: Los emails registrados, en minúsculas.
+    """
+    emails = list(emails)
+    existentes = set()
+    for i in range(0, len(emails), tamano_consulta):
+      parte = emails[i:i + tamano_consulta]
+      marcadores = ", ".join(["%s"] * len(parte))
+      rows = cls.ejecutar(f"SELECT email FROM {cls.TABLA} WHERE email IN ({marcadores})", parte, fetch=True) or []
+      existentes.update(r[0].lower() for r in rows)
+    return existentes
 
   @classmethod
   def listar_empleados(cls, solo_activos=True):
@@ -28,32 +73,94 @@ class Usuario(ModeloBase):
     return cls.ejecutar(query, fetch=True, dict_cursor=True)
 
   @classmethod
+  def _consulta_pagina(cls, filtro_rol, solo_activos=True, after_id=None):
+    """Consulta de usuarios ordenada por id, empezando después de after_id (keyset)."""
+    query = f"SELECT id, nombre, apellido, email, rol, activo FROM {cls.TABLA} WHERE {filtro_rol}"
+    params = []
+    if solo_activos:
+      query += " AND activo = TRUE"
+    if after_id is not None:
+      query += " AND id > %s"
+      params.append(after_id)
+    query += " ORDER BY id"
+    return query, params
+
+  @classmethod
+  def listar_empleados_pagina(cls, after_id=None, limit=50, solo_activos=True):
+    """
+    Devuelve una página de empleados ordenada por id.
+
+    Args:
+      after_id (int): id del último empleado de la página anterior (None = primera página).
+      limit (int): Cantidad máxima de empleados de la página.
+    """
+    query, params = cls._consulta_pagina("rol != 'cliente'", solo_activos, after_id)
+    return cls.ejecutar(query + " LIMIT %s", params + [limit], fetch=True, dict_cursor=True)
+
+  @classmethod
+  def listar_clientes_pagina(cls, after_id=None, limit=50, solo_activos=True):
+    """
+    Devuelve una página de clientes ordenada por id.
+
+    Args:
+      after_id (int): id del último cliente de la página anterior (None = primera página).
+      limit (int): Cantidad máxima de clientes de la página.
+    """
+    query, params = cls._consulta_pagina("rol = 'cliente'", solo_activos, after_id)
+    return cls.ejecutar(query + " LIMIT %s", params + [limit], fetch=True, dict_cursor=True)
+
+  @classmethod
+  def iterar_clientes(cls, solo_activos=True):
+    """Generador con todos los clientes, leídos del cursor a medida que se consumen."""
+    query, params = cls._consulta_pagina("rol = 'cliente'", solo_activos)
+    return cls.iterar(query, params)
+
+  @classmethod
+  @cacheado("Usuario")
+  def listar_peluqueros(cls, solo_activos=True):
+    """Devuelve los peluqueros, que son quienes definen la capacidad real de cada horario."""
+    query = f"SELECT id, nombre, apellido FROM {cls.TABLA} WHERE rol = 'peluquero'"
+    if solo_activos:
+      query += " AND activo = TRUE"
+    query += " ORDER BY id"
+    return cls.ejecutar(query, fetch=True, dict_cursor=True)
+
+  @classmethod
+  @cacheado("Usuario")
   def obtener_por_id(cls, id_empleado):
     query = f"SELECT id, nombre, apellido, email, rol, activo FROM {cls.TABLA} WHERE id = %s"
     result = cls.ejecutar(query, (id_empleado,), fetch=True, dict_cursor=True)
     return result[0] if result else None
   
   @classmethod
+  @cacheado("Usuario")
   def obtener_por_email(cls, email):
     query = f"SELECT id, nombre, apellido, email, rol, activo FROM {cls.TABLA} WHERE email = %s"
     result = cls.ejecutar(query, (email,), fetch=True, dict_cursor=True)
     return result[0] if result else None
   
   @classmethod
-  def buscar_por_nombre_similar(cls, nombre_parcial, rol='cliente', solo_activos=True):
+  def buscar_por_nombre_similar(cls, nombre_parcial, rol='cliente', solo_activos=True, limite=50):
     """
     Busca usuarios por coincidencia parcial en el nombre o apellido
     para un rol específico (por defecto, 'cliente').
+
+    Los clientes se buscan en el índice de trigramas (ver IndiceClientes):
+    sin importar acentos, con tolerancia a errores de tipeo y ordenados por
+    similitud. Para los demás roles se usa LIKE sobre la tabla.
     
     Args:
       nombre_parcial (str): Parte del nombre o apellido a buscar.
       rol (str): El rol del usuario a buscar.
       solo_activos (bool): Si solo debe buscar usuarios activos.
+      limite (int): Cantidad máxima de resultados.
         
     Returns:
       list[dict]: Lista de diccionarios de usuarios coincidentes.
     """
-    
+    if rol == 'cliente':
+      return indice_clientes.buscar(nombre_parcial, limite=limite, solo_activos=solo_activos)
+
     # Usamos LOWER() y LIKE con comodines % para buscar coincidencias
     query = f"""
       SELECT id, nombre, apellido, email, rol, activo 
@@ -70,7 +177,8 @@ class Usuario(ModeloBase):
     if solo_activos:
       query += " AND activo = TRUE"
 
-    query += " ORDER BY nombre, apellido ASC"
+    query += " ORDER BY nombre, apellido ASC LIMIT %s"
+    params.append(limite)
     
     return cls.ejecutar(query, params, fetch=True, dict_cursor=True)
 
@@ -90,12 +198,26 @@ class Usuario(ModeloBase):
 
     query = f"UPDATE {cls.TABLA} SET {', '.join(campos)} WHERE id = %s"
     valores.append(id)
-    return cls.ejecutar(query, tuple(valores))
+    filas = cls.ejecutar(query, tuple(valores))
+    cls._actualizar_indice(id)
+    return filas
 
   @classmethod
   def desactivar(cls, usuario_id):
     query = "UPDATE Usuario SET activo = FALSE WHERE id = %s"
-    return cls.ejecutar(query, (usuario_id,))
+    filas = cls.ejecutar(query, (usuario_id,))
+    cls._actualizar_indice(usuario_id)
+    return filas
+
+  @classmethod
+  def _actualizar_indice(cls, usuario_id):
+    """Refleja en el índice de búsqueda de clientes una edición de este proceso (ya confirmada)."""
+    def actualizar():
+      if indice_clientes.construido:
+        usuario = cls.obtener_por_id(usuario_id)
+        if usuario:
+          indice_clientes.actualizar_usuario(usuario)
+    cls.al_confirmar(actualizar)
   
   @classmethod
   def cambiar_password(cls, password, usuario_id):
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolConexiones:
+  """
+  Pool de conexiones reutilizables a la base de datos.
+
+  Mantiene hasta `tamano` conexiones abiertas. Al pedir una conexión se reutiliza
+  la última devuelta (LIFO, así las que quedan ociosas envejecen y se reciclan).
+
+  - Health check: si la conexión estuvo ociosa más de `verificar_tras` segundos
+    se hace un ping antes de entregarla; si falla se reemplaza por una nueva.
+  - Reciclado: las conexiones con más de `reciclar_cada` segundos de vida se
+    cierran y se reemplazan (evita cortes por wait_timeout del servidor).
+  """
+
+  def __init__(self, crear_conexion, tamano=5, reciclar_cada=1800, verificar_tras=30, verificar=None):
+    if tamano < 1:
+      raise ValueError("El tamaño del pool debe ser al menos 1.")
+    self._crear_conexion = crear_conexion
+    self._verificar = verificar or (lambda conn: conn.ping())
+    self.tamano = tamano
+    self.reciclar_cada = reciclar_cada
+    self.verificar_tras = verificar_tras
+
+    self._libres = deque() # (conexion, devuelta_en)
+    self._creada_en = {} # id(conexion) -> momento de creación
+    self._en_uso = 0
+    self._cerrado = False # después de cerrar(), las conexiones devueltas se cierran
+    self._cond = threading.Condition()
+
+  def obtener(self, timeout=None):
+    """
+    Entrega una conexión lista para usar. Bloquea si todas están en uso.
+
+    Raises:
+      TimeoutError: si no se libera ninguna conexión dentro de `timeout` segundos.
+    """
+    with self._cond:
+      while not self._libres and self._en_uso >= self.tamano:
+        if not self._cond.wait(timeout):
+          raise TimeoutError("No hay conexiones libres en el pool.")
+
+      conn, devuelta_en = self._libres.pop() if self._libres else (None, None)
+      self._en_uso += 1
+
+    # La creación y el ping se hacen fuera del lock para no frenar a otros hilos
+    try:
+      if conn is None:
+        return self._nueva()
+
+      ahora = time.monotonic()
+      if ahora - self._creada_en.get(id(conn), ahora) > self.reciclar_cada:
+        self._cerrar(conn)
+        return self._nueva()
+
+      if ahora - devuelta_en > self.verificar_tras and not self._esta_viva(conn):
+        self._cerrar(conn)
+        return self._nueva()
+
+      return conn
+    except Exception:
+      with self._cond:
+        self._en_uso -= 1
+        self._cond.notify()
+      raise
+
+  def devolver(self, conn, descartar=False):
+    """
+    Devuelve una conexión al pool. Se hace rollback de cualquier transacción
+    abierta para que el próximo uso arranque limpio; si eso falla la conexión
+    está rota y se descarta.
+    """
+    if not descartar:
+      try:
+        conn.rollback()
+      except Exception:
+        descartar = True
+
+    with self._cond:
+      self._en_uso -= 1
+      if descartar or self._cerrado:
+        self._cerrar(conn)
+      else:
+        self._libres.append((conn, time.monotonic()))
+      self._cond.notify()
+
+  def cerrar(self):
+    """Cierra todas las conexiones libres (las que están en uso se cierran al devolverse)."""
+    with self._cond:
+      self._cerrado = True
+      while self._libres:
+        conn, _ = self._libres.pop()
+        self._cerrar(conn)
+
+  def estadisticas(self):
+    with self._cond:
+      return {"tamano": self.tamano, "en_uso": self._en_uso, "libres": len(self._libres)}
+
+  def _nueva(self):
+    conn = self._crear_conexion()
+    self._creada_en[id(conn)] = time.monotonic()
+    return conn
+
+  def _esta_viva(self, conn):
+    try:
+      self._verificar(conn)
+      return True
+    except Exception:
+      return False
+
+  def _cerrar(self, conn):
+    self._creada_en.pop(id(conn), None)
+    try:
+      conn.close()
+    except Exception:
+      pass
@@ -0,0 +1,71 @@
+import sys
+import os
+import time
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_base import ModeloBase
+from modelos.modelo_reporte import Reporte
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def meses(desde, hasta):
+  """Divide [desde, hasta] en tramos de un mes calendario: [(desde, hasta), ...]."""
+  tramos = []
+  inicio = desde
+  while inicio <= hasta:
+    siguiente = (inicio.replace(day=1) + timedelta(days=32)).replace(day=1)
+    tramos.append((inicio, min(hasta, siguiente - timedelta(days=1))))
+    inicio = siguiente
+  return tramos
+
+def leer_fecha(texto):
+  return datetime.strptime(texto, "%Y-%m-%d").date()
+
+def main():
+  """
+  Carga (o vuelve a calcular) las tablas de resumen de los reportes de
+  facturación a partir de los turnos cobrados.
+
+  Procesa un mes por transacción, así una base con años de historia no queda
+  bloqueada durante todo el recálculo. Con --verificar no modifica nada: compara
+  los resúmenes con los turnos y termina con código 1 si algún día no coincide.
+  """
+  parser = argparse.ArgumentParser(description="Recalcula los resúmenes de facturación desde los turnos cobrados.")
+  parser.add_argument("--desde", type=leer_fecha, default=None, help="Primer día (AAAA-MM-DD); por defecto el primer cobro")
+  parser.add_argument("--hasta", type=leer_fecha, default=None, help="Último día (AAAA-MM-DD); por defecto el último cobro")
+  parser.add_argument("--verificar", action="store_true", help="Solo compara los resúmenes con los turnos")
+  args = parser.parse_args()
+
+  rango = Reporte.rango_cobros()
+  if rango is None and (args.desde is None or args.hasta is None):
+    print("[INFO] No hay turnos cobrados.")
+    return
+  desde = args.desde or rango[0]
+  hasta = args.hasta or rango[1]
+
+  inicio = time.perf_counter()
+  if args.verificar:
+    diferencias = Reporte.diferencias(desde, hasta)
+    for fecha, resumen, calculado in diferencias:
+      print(f"[DIFERENCIA] {fecha}: resumen {resumen} | turnos {calculado}")
+    ModeloBase.cerrar_pool()
+    if diferencias:
+      print(f"[ERROR] {len(diferencias)} día(s) no coinciden. Corregir con: python scripts/backfill_reportes.py --desde {desde} --hasta {hasta}")
+      sys.exit(1)
+    print(f"[OK] Resúmenes de {desde} a {hasta} coinciden con los turnos ({time.perf_counter() - inicio:.1f} s).")
+    return
+
+  dias = 0
+  for tramo_desde, tramo_hasta in meses(desde, hasta):
+    dias += Reporte.reconstruir(tramo_desde, tramo_hasta) or 0
+    print(f"      {tramo_desde:%Y-%m}")
+  ModeloBase.cerrar_pool()
+  print(f"[OK] {dias} día(s) con cobros recalculados de {desde} a {hasta} en {time.perf_counter() - inicio:.1f} s.")
+
+if __name__ == "__main__":
+  main()
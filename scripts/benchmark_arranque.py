@@ -0,0 +1,88 @@
+import sys
+import os
+import argparse
+import subprocess
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencias que no deben cargarse antes del banner: se importan recién al usarse
+MODULOS_DIFERIDOS = (
+  "mariadb", "passlib", "bcrypt", "reportlab",
+  "modelos.modelo_base", "menus.menu_admin", "menus.menu_cliente", "menus.menu_recepcionista",
+)
+
+def medir_importacion():
+  """
+  Importa main.py en un proceso nuevo con -X importtime.
+
+  Returns:
+    list[tuple]: (modulo, profundidad, propio_us, acumulado_us) en el orden que informa Python.
+  """
+  resultado = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", "import main"],
+    cwd=RAIZ, capture_output=True, text=True
+  )
+  if resultado.returncode != 0:
+    print(resultado.stderr)
+    sys.exit(1)
+
+  filas = []
+  for linea in resultado.stderr.splitlines():
+    if not linea.startswith("import time:") or "[us]" in linea:
+      continue
+    propio, acumulado, nombre = linea[len("import time:"):].split("|")
+    profundidad = (len(nombre) - len(nombre.lstrip()) - 1) // 2
+    filas.append((nombre.strip(), profundidad, int(propio), int(acumulado)))
+  return filas
+
+def modulos_cargados():
+  """Devuelve cuáles de MODULOS_DIFERIDOS quedan cargados después de importar main."""
+  codigo = (
+    "import sys, main; "
+    f"print(','.join(m for m in {MODULOS_DIFERIDOS!r} if m in sys.modules))"
+  )
+  resultado = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True)
+  return [m for m in resultado.stdout.strip().split(",") if m]
+
+def main():
+  """
+  Mide cuánto tarda en importarse main.py (lo que pasa antes del banner) y
+  termina con código 1 si se supera el presupuesto o si alguna dependencia
+  pesada se carga antes de tiempo.
+  """
+  parser = argparse.ArgumentParser(description="Tiempo de arranque de main.py con desglose por módulo.")
+  parser.add_argument("--presupuesto-ms", type=float, default=500, help="Tiempo máximo de importación permitido")
+  parser.add_argument("--repeticiones", type=int, default=5, help="Se toma la mejor de N ejecuciones")
+  parser.add_argument("--top", type=int, default=15, help="Módulos a mostrar en el desglose")
+  args = parser.parse_args()
+
+  mejor = None
+  for _ in range(args.repeticiones):
+    filas = medir_importacion()
+    total = next(acumulado for nombre, profundidad, _, acumulado in filas if nombre == "main" and profundidad == 0)
+    if mejor is None or total < mejor[0]:
+      mejor = (total, filas)
+
+  total, filas = mejor
+  print(f"{'Módulo':<45} {'Propio (ms)':>12} {'Acumulado (ms)':>15}")
+  for nombre, profundidad, propio, acumulado in sorted(filas, key=lambda f: f[3], reverse=True)[:args.top]:
+    print(f"{'  ' * profundidad + nombre:<45} {propio / 1000:>12.1f} {acumulado / 1000:>15.1f}")
+
+  print(f"\nImportación de main.py: {total / 1000:.1f} ms (mejor de {args.repeticiones}, presupuesto {args.presupuesto_ms:.0f} ms)")
+
+  fallas = 0
+  cargados = modulos_cargados()
+  if cargados:
+    fallas += 1
+    print(f"[ERROR] Se importan antes del banner: {', '.join(cargados)}")
+
+  if total / 1000 > args.presupuesto_ms:
+    fallas += 1
+    print("[ERROR] El arranque supera el presupuesto.")
+
+  if fallas:
+    sys.exit(1)
+  print("[OK] El arranque está dentro del presupuesto.")
+
+if __name__ == "__main__":
+  main()
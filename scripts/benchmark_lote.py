@@ -0,0 +1,74 @@
+import sys
+import os
+import time
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_base import ModeloBase
+from modelos.modelo_servicio import Servicio
+from modelos.modelo_turno import Turno
+from modelos.modelo_turno_servicio import TurnoServicio
+from modelos.instrumentacion import metricas
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def contar_viajes():
+  """Sentencias enviadas al servidor desde el último reinicio de las métricas."""
+  return sum(e["ejecuciones"] for e in metricas.resumen()["sentencias"].values())
+
+def reserva_fila_por_fila(cliente_id, fecha_hora, servicios):
+  """Comportamiento anterior: un INSERT y un commit por servicio."""
+  turno_id = Turno.crear(cliente_id, fecha_hora, 0)
+  for servicio_id, precio in servicios:
+    TurnoServicio.agregar_servicio(turno_id, servicio_id, precio)
+  return turno_id
+
+def reserva_en_lote(cliente_id, fecha_hora, servicios):
+  with ModeloBase.transaccion():
+    turno_id = Turno.crear(cliente_id, fecha_hora, 0)
+    TurnoServicio.agregar_servicios(turno_id, servicios)
+  return turno_id
+
+def medir(funcion, cliente_id, servicios, repeticiones):
+  creados = []
+  metricas.activar()
+  metricas.reiniciar()
+  fecha_hora = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=365)
+
+  inicio = time.perf_counter()
+  for _ in range(repeticiones):
+    creados.append(funcion(cliente_id, fecha_hora, servicios))
+  total = time.perf_counter() - inicio
+  viajes_por_reserva = contar_viajes() / repeticiones
+
+  # Limpiar los turnos de prueba
+  for turno_id in creados:
+    Turno.eliminar(turno_id)
+
+  return viajes_por_reserva, total / repeticiones * 1000
+
+def main():
+  parser = argparse.ArgumentParser(description="Compara la reserva fila por fila contra la inserción en lote.")
+  parser.add_argument("--cliente", type=int, required=True, help="ID de un cliente existente")
+  parser.add_argument("--repeticiones", type=int, default=50, help="Reservas por escenario")
+  args = parser.parse_args()
+
+  servicios = [(s["id"], s["precio"]) for s in Servicio.listar_todos()]
+  if not servicios:
+    print("[ERROR] No hay servicios cargados. Ejecuta scripts/data_test.sql primero.")
+    return
+
+  print(f"{'Servicios':>9} | {'Viajes antes':>12} {'ms antes':>9} | {'Viajes lote':>11} {'ms lote':>9}")
+  for n in range(1, len(servicios) + 1):
+    viajes_antes, ms_antes = medir(reserva_fila_por_fila, args.cliente, servicios[:n], args.repeticiones)
+    viajes_lote, ms_lote = medir(reserva_en_lote, args.cliente, servicios[:n], args.repeticiones)
+    print(f"{n:>9} | {viajes_antes:>12.0f} {ms_antes:>9.2f} | {viajes_lote:>11.0f} {ms_lote:>9.2f}")
+
+  ModeloBase.cerrar_pool()
+
+if __name__ == "__main__":
+  main()
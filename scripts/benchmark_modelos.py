@@ -0,0 +1,170 @@
+import sys
+import os
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_base import ModeloBase
+from modelos.modelo_usuario import Usuario
+from modelos.modelo_turno import Turno
+from modelos.modelo_turno_servicio import TurnoServicio
+from modelos.instrumentacion import metricas
+from modelos.indice_clientes import indice_clientes
+from modelos.cache import cache_consultas
+from funciones import disponibilidad, analitica
+
+import generar_datos
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def commit_actual():
+  try:
+    return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True).stdout.strip()
+  except OSError:
+    return "desconocido"
+
+def casos(ids):
+  """Métodos a medir, con argumentos tomados de los datos generados."""
+  cliente_id = ids["clientes"][len(ids["clientes"]) // 2]
+  turno_id = ids["turnos"][len(ids["turnos"]) // 2]
+  hoy = datetime.now().date()
+  dias = disponibilidad.dias_habiles()
+  # Un horario con lugar, para medir la reserva completa y no el rechazo por capacidad
+  horarios = [datetime.combine(dia, datetime.min.time()).replace(hour=hora)
+              for dia in reversed(dias) for hora in range(disponibilidad.HORA_APERTURA, disponibilidad.HORA_CIERRE)]
+  reserva = next((h for h in horarios if Turno.verificar_disponibilidad(h)), horarios[0])
+
+  def analitica_demanda():
+    desde = hoy - timedelta(days=730)
+    turnos = analitica.cargar_turnos(desde, hoy)
+    analitica.ocupacion_semanal(turnos, desde, hoy)
+    analitica.tasas_por_dia(turnos)
+
+  def reservar_y_cancelar():
+    nuevo = Turno.reservar(cliente_id, reserva, 0, 60)
+    if nuevo:
+      Turno.cancelar(nuevo)
+      Turno.eliminar(nuevo)
+
+  return {
+    "Turno.listar(confirmado)": lambda: Turno.listar(estado='confirmado'),
+    "Turno.listar(pendiente, cliente, futuros)": lambda: Turno.listar('pendiente', cliente_id, True),
+    "Turno.listar_pagina(realizado)": lambda: Turno.listar_pagina(estado='realizado'),
+    "Turno.iterar_listado(pendiente)": lambda: sum(1 for _ in Turno.iterar_listado(estado='pendiente')),
+    "Turno.obtener_por_id": lambda: Turno.obtener_por_id(turno_id),
+    "Turno.listar_para_cliente": lambda: Turno.listar_para_cliente(cliente_id),
+    "Turno.listar_ocupacion": lambda: Turno.listar_ocupacion(hoy, dias[-1]),
+    "Turno.listar_agenda": lambda: Turno.listar_agenda(hoy, dias[-1]),
+    "Turno.reservar + cancelar": reservar_y_cancelar,
+    "TurnoServicio.listar_por_turno": lambda: TurnoServicio.listar_por_turno(turno_id),
+    "Usuario.buscar_por_nombre_similar": lambda: Usuario.buscar_por_nombre_similar("mart"),
+    "Usuario.buscar_por_nombre_similar(error de tipeo)": lambda: Usuario.buscar_por_nombre_similar("rodrigez lucia"),
+    "Usuario.listar_clientes_pagina": lambda: Usuario.listar_clientes_pagina(),
+    "Usuario.listar_clientes": lambda: Usuario.listar_clientes(),
+    "analitica de demanda (730 días)": analitica_demanda,
+  }
+
+def medir(funcion, repeticiones):
+  """Devuelve los tiempos (ms) de cada repetición y las consultas por llamada."""
+  funcion() # calentamiento (caches del motor, conexiones del pool)
+  metricas.reiniciar()
+  tiempos = []
+  for _ in range(repeticiones):
+    inicio = time.perf_counter()
+    funcion()
+    tiempos.append((time.perf_counter() - inicio) * 1000)
+  consultas = sum(e["ejecuciones"] for e in metricas.resumen()["sentencias"].values())
+  return tiempos, consultas / repeticiones
+
+def percentil(valores, p):
+  ordenados = sorted(valores)
+  return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+def comparar(actual, archivo_anterior):
+  """Muestra la variación de la mediana contra una corrida anterior (ej. de otro commit)."""
+  with open(archivo_anterior, encoding="utf-8") as archivo:
+    anterior = json.load(archivo)
+  previos = {(r["clientes"], r["metodo"]): r["mediana_ms"] for r in anterior["resultados"]}
+
+  print(f"\nComparación contra {anterior['commit']} ({archivo_anterior}):")
+  for r in actual["resultados"]:
+    antes = previos.get((r["clientes"], r["metodo"]))
+    if antes:
+      variacion = (r["mediana_ms"] - antes) / antes * 100
+      marca = "  <-- más lento" if variacion > 20 else ""
+      print(f"  {r['clientes']:>8} {r['metodo']:<50} {antes:>9.2f} -> {r['mediana_ms']:>9.2f} ms ({variacion:+.0f}%){marca}")
+
+def main():
+  """
+  Mide cada método de los modelos con distintos volúmenes de datos generados
+  con generar_datos.py y guarda los resultados en JSON junto con el commit,
+  para poder comparar corridas entre commits (--comparar).
+  """
+  parser = argparse.ArgumentParser(description="Benchmark de los modelos a distintas escalas.")
+  parser.add_argument("--clientes", default="1000,10000,100000", help="Tamaños a medir (clientes), separados por coma")
+  parser.add_argument("--turnos-por-cliente", type=int, default=2, help="La historia se alarga para que los turnos entren en la agenda")
+  parser.add_argument("--repeticiones", type=int, default=5)
+  parser.add_argument("--semilla", type=int, default=42)
+  parser.add_argument("--salida", default=None, help="Archivo JSON (por defecto benchmarks/modelos_<commit>.json)")
+  parser.add_argument("--comparar", default=None, help="JSON de una corrida anterior para comparar")
+  parser.add_argument("--con-cache", action="store_true", help="Mide con la caché de consultas activa (por defecto se mide la base)")
+  args = parser.parse_args()
+
+  commit = commit_actual()
+  salida = args.salida or os.path.join(RAIZ, "benchmarks", f"modelos_{commit}.json")
+  metricas.activar()
+  cache_consultas.activa = args.con_cache
+
+  resultado = {
+    "commit": commit,
+    "fecha": datetime.now().isoformat(timespec="seconds"),
+    "backend": ModeloBase.obtener_backend().nombre,
+    "repeticiones": args.repeticiones,
+    "cache": args.con_cache,
+    "resultados": [],
+  }
+
+  for clientes in [int(c) for c in args.clientes.split(",")]:
+    turnos = clientes * args.turnos_por_cliente
+    print(f"\n=== {clientes} clientes / {turnos} turnos ===")
+    generar_datos.limpiar(informar=lambda _: None)
+    ids = generar_datos.generar(clientes=clientes, turnos=turnos, semilla=args.semilla, informar=lambda _: None)
+    indice_clientes.construir() # los datos se cargaron por fuera de los modelos
+
+    print(f"{'Método':<50} {'Mediana':>9} {'p95':>9} {'Mín':>9} {'Consultas':>10}")
+    for metodo, funcion in casos(ids).items():
+      tiempos, consultas = medir(funcion, args.repeticiones)
+      fila = {
+        "clientes": clientes,
+        "turnos": turnos,
+        "metodo": metodo,
+        "mediana_ms": round(statistics.median(tiempos), 3),
+        "p95_ms": round(percentil(tiempos, 95), 3),
+        "min_ms": round(min(tiempos), 3),
+        "consultas": consultas,
+      }
+      resultado["resultados"].append(fila)
+      print(f"{metodo:<50} {fila['mediana_ms']:>9.2f} {fila['p95_ms']:>9.2f} {fila['min_ms']:>9.2f} {consultas:>10.1f}")
+
+  generar_datos.limpiar(informar=lambda _: None)
+  ModeloBase.cerrar_pool()
+
+  os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+  with open(salida, "w", encoding="utf-8") as archivo:
+    json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+  print(f"\n[OK] Resultados guardados en {salida}")
+
+  if args.comparar:
+    comparar(resultado, args.comparar)
+
+if __name__ == "__main__":
+  main()
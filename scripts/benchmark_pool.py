@@ -0,0 +1,53 @@
+import sys
+import os
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_base import ModeloBase
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def consulta_sin_pool(query):
+  """Reproduce el comportamiento anterior: una conexión nueva por cada consulta."""
+  conn = ModeloBase.conectar()
+  try:
+    cursor = conn.cursor()
+    cursor.execute(query)
+    cursor.fetchall()
+    cursor.close()
+  finally:
+    conn.close()
+
+def consulta_con_pool(query):
+  ModeloBase.ejecutar(query, fetch=True)
+
+def medir(nombre, funcion, consultas, query):
+  inicio = time.perf_counter()
+  for _ in range(consultas):
+    funcion(query)
+  total = time.perf_counter() - inicio
+  print(f"{nombre:<18} {consultas:>6} consultas  {total:8.3f} s  {total / consultas * 1000:8.3f} ms/consulta")
+  return total
+
+def main():
+  parser = argparse.ArgumentParser(description="Compara conexión por consulta contra el pool de conexiones.")
+  parser.add_argument("--consultas", type=int, default=500, help="Cantidad de consultas por escenario")
+  parser.add_argument("--query", default="SELECT 1", help="Consulta a ejecutar")
+  args = parser.parse_args()
+
+  # Calentar el pool para no medir la primera conexión
+  ModeloBase.ejecutar(args.query, fetch=True)
+
+  sin_pool = medir("Sin pool", consulta_sin_pool, args.consultas, args.query)
+  con_pool = medir("Con pool", consulta_con_pool, args.consultas, args.query)
+
+  print(f"\nMejora: x{sin_pool / con_pool:.1f}")
+  print(f"Pool: {ModeloBase.obtener_pool().estadisticas()}")
+  ModeloBase.cerrar_pool()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,133 @@
+import sys
+import os
+import io
+import time
+import argparse
+from datetime import datetime
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab import rl_config
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+
+from funciones.generador_pdf import obtener_plantilla
+
+def dibujar_original(c, turno_info, detalle_servicios):
+  """Reproduce el ticket anterior a PlantillaTicket: todo con drawString, una sola hoja."""
+  cliente = f"{turno_info['cliente_nombre']} {turno_info['cliente_apellido']}"
+  width, height = letter
+  y = height - 50
+  line_height = 20
+
+  c.setFont("Helvetica-Bold", 16)
+  c.drawString(inch, y, "SALÓN DE BELLEZA")
+  y -= line_height * 1.5
+  c.setFont("Helvetica-Bold", 12)
+  c.drawString(inch, y, f"RECIBO DE PAGO - TURNO ID: {turno_info['id']}")
+  y -= line_height
+  c.setFont("Helvetica", 10)
+  c.drawString(inch, y, f"Cliente: {cliente}")
+  y -= line_height
+  c.drawString(inch, y, f"Fecha y Hora: {turno_info['fecha_hora'].strftime('%d/%m/%Y %H:%M')}")
+  y -= line_height * 2
+  c.setFont("Helvetica-Bold", 10)
+  c.drawString(inch, y, "SERVICIO")
+  c.drawString(inch * 4, y, "PRECIO")
+  y -= line_height / 2
+  c.line(inch, y, inch * 6, y)
+  y -= line_height
+  c.setFont("Helvetica", 10)
+  for servicio in detalle_servicios:
+    c.drawString(inch, y, servicio['nombre'])
+    c.drawString(inch * 4, y, f"${servicio['precio_cobrado']:.2f}")
+    y -= line_height
+  y -= line_height / 2
+  c.line(inch, y, inch * 6, y)
+  y -= line_height
+  c.setFont("Helvetica-Bold", 12)
+  c.drawString(inch, y, "TOTAL COBRADO:")
+  c.drawString(inch * 4, y, f"${turno_info['total']:.2f}")
+  y -= line_height * 2
+  c.setFont("Helvetica-Oblique", 10)
+  c.drawString(inch, y, "¡Gracias por su preferencia!")
+  c.showPage()
+
+def ticket_de_prueba(numero, servicios):
+  detalle = [{'nombre': f"Servicio {i + 1}", 'precio_cobrado': Decimal("1250.50") + i} for i in range(servicios)]
+  turno = {
+    'id': numero, 'cliente_nombre': "Valentina", 'cliente_apellido': "Fernandez",
+    'fecha_hora': datetime(2025, 3, 14, 17, 30), 'total': sum(s['precio_cobrado'] for s in detalle)
+  }
+  return turno, detalle
+
+def medir(nombre, dibujar, tickets, por_archivo, a85):
+  """
+  Dibuja los tickets en PDFs de `por_archivo` tickets cada uno, en memoria.
+
+  Returns:
+    tuple: (tickets por segundo, bytes por ticket)
+  """
+  rl_config.useA85 = a85
+  total_bytes = 0
+  inicio = time.perf_counter()
+  for i in range(0, len(tickets), por_archivo):
+    salida = io.BytesIO()
+    c = canvas.Canvas(salida, pagesize=letter)
+    for turno, detalle in tickets[i:i + por_archivo]:
+      dibujar(c, turno, detalle)
+    c.save()
+    total_bytes += len(salida.getvalue())
+  total = time.perf_counter() - inicio
+  velocidad, tamano = len(tickets) / total, total_bytes / len(tickets)
+  print(f"{nombre:<44} {velocidad:9.1f} tickets/s  {tamano:8.0f} bytes/ticket")
+  return velocidad, tamano
+
+def main():
+  """
+  Compara el ticket anterior (todo con drawString y flujos en ASCII85) contra
+  PlantillaTicket, con un ticket por archivo (como al cobrar o exportar), con
+  muchos tickets por archivo (partes fijas reutilizadas como forms) y con un
+  ticket largo que ocupa varias hojas.
+  """
+  parser = argparse.ArgumentParser(description="Mide tickets por segundo y bytes por ticket del generador de PDF.")
+  parser.add_argument("--tickets", type=int, default=300, help="Tickets por escenario")
+  parser.add_argument("--servicios", type=int, default=3, help="Servicios por ticket")
+  parser.add_argument("--por-archivo", type=int, default=50, help="Tickets por PDF en el escenario de varios tickets por archivo")
+  parser.add_argument("--largo", type=int, default=80, help="Servicios del ticket largo")
+  args = parser.parse_args()
+
+  plantilla = obtener_plantilla()
+  tickets = [ticket_de_prueba(i + 1, args.servicios) for i in range(args.tickets)]
+  largos = [ticket_de_prueba(i + 1, args.largo) for i in range(max(1, args.tickets // 10))]
+
+  def con_formas(c, turno, detalle):
+    plantilla.dibujar(c, turno, detalle, formas=True)
+
+  # Una pasada de calentamiento (imports, fuentes, medidas de la plantilla)
+  medir("calentamiento", plantilla.dibujar, tickets[:10], 1, 0)
+  print()
+
+  print(f"Un ticket por archivo ({args.servicios} servicios)")
+  antes = medir("  antes", dibujar_original, tickets, 1, 1)
+  despues = medir("  PlantillaTicket", plantilla.dibujar, tickets, 1, 0)
+  print(f"  mejora: x{despues[0] / antes[0]:.2f} tickets/s, {(1 - despues[1] / antes[1]) * 100:.0f}% menos bytes")
+  print()
+
+  print(f"{args.por_archivo} tickets por archivo")
+  antes = medir("  antes", dibujar_original, tickets, args.por_archivo, 1)
+  sin_formas = medir("  PlantillaTicket sin forms", lambda c, t, d: plantilla.dibujar(c, t, d, formas=False), tickets, args.por_archivo, 0)
+  despues = medir("  PlantillaTicket con forms", con_formas, tickets, args.por_archivo, 0)
+  print(f"  mejora: x{despues[0] / antes[0]:.2f} tickets/s, {(1 - despues[1] / antes[1]) * 100:.0f}% menos bytes")
+  print(f"  forms contra dibujo directo: x{despues[0] / sin_formas[0]:.2f} tickets/s")
+  print()
+
+  hojas = len(plantilla.hojas(largos[0][1]))
+  print(f"Ticket largo ({args.largo} servicios, {hojas} hojas; el anterior dibujaba fuera de la hoja)")
+  antes = medir("  antes", dibujar_original, largos, 1, 1)
+  despues = medir("  PlantillaTicket", plantilla.dibujar, largos, 1, 0)
+
+if __name__ == "__main__":
+  main()
@@ -10,15 +10,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 def crear_admin():
-  conn = ModeloBase.conectar()
-  if not conn:
+  # Se usa ejecutar() para que funcione con cualquier backend (DB_BACKEND)
+  rows = ModeloBase.ejecutar("SELECT COUNT(*) FROM Usuario WHERE rol = 'admin'", fetch=True)
+  if rows is None:
     print("[ERROR] No se pudo conectar con la base de datos.")
     return
   
-  cursor = conn.cursor()
-
-  cursor.execute("SELECT COUNT(*) FROM Usuario WHERE rol = 'admin'")
-  existe = cursor.fetchone()[0]
+  existe = rows[0][0]
   
   if existe > 0:
     print("[INFO] Ya existe un usuario Administrador")
@@ -32,11 +30,12 @@ def crear_admin():
     INSERT INTO Usuario (nombre, apellido, email, password_hash, rol)
     VALUES (%s, %s, %s, %s, %s)
     """
-    cursor.execute(query, (admin_nombre, admin_apellido, admin_email, admin_password, "admin"))
-    conn.commit()
-    print("[OK] Usuario administrador creado con éxito.")
+    if ModeloBase.ejecutar(query, (admin_nombre, admin_apellido, admin_email, admin_password, "admin")) is None:
+      print("[ERROR] No se pudo crear el usuario administrador. Revisá las variables ADMIN_* del .env.")
+    else:
+      print("[OK] Usuario administrador creado con éxito.")
 
-    conn.close()
+  ModeloBase.cerrar_pool()
     
 if __name__ == "__main__":
   crear_admin()
\ No newline at end of file
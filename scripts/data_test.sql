@@ -47,12 +47,16 @@ INSERT INTO Servicio (nombre, descripcion, precio, duracion_estimada, activo) VA
 -- -----------------------------------------------------------
 
 -- Insertar el Turno (primero el registro principal)
-INSERT INTO Turno (cliente_id, fecha_hora, estado, total) VALUES
-(7, '2025-11-19 10:00:00', 'pendiente', 800.00); -- Asumimos que el corte cuesta 800.00
+INSERT INTO Turno (cliente_id, fecha_hora, estado, total, duracion) VALUES
+(7, '2025-11-19 10:00:00', 'pendiente', 800.00, 30); -- Asumimos que el corte cuesta 800.00
 
 -- Insertar el Servicio asociado al Turno (asumiendo que Corte Caballero tiene ID: 1)
 -- NOTA: Debes verificar los IDs de los servicios insertados en tu BD.
 INSERT INTO Turno_Servicio (turno_id, servicio_id, precio_cobrado) VALUES
 (LAST_INSERT_ID(), 1, 800.00); 
 
+-- Contador de capacidad del horario del turno de ejemplo
+INSERT INTO Turno_Slot (fecha_hora, ocupados) VALUES
+('2025-11-19 10:00:00', 1);
+
 COMMIT;
\ No newline at end of file
@@ -0,0 +1,92 @@
+import sys
+import os
+import re
+import time
+import argparse
+from datetime import date, datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_base import ModeloBase
+from modelos.modelo_turno import Turno
+from funciones.generador_pdf import PDF_PATH, almacen_tickets
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Tickets guardados antes del almacén por día: tickets/Ticket_<id>_<apellido>.pdf
+PATRON_PLANO = re.compile(r"^Ticket_(\d+)_.*\.pdf$")
+
+def leer_mes(texto):
+  return datetime.strptime(texto, "%Y-%m").date()
+
+def migrar_planos():
+  """
+  Mueve los tickets de la carpeta plana al almacén, a la carpeta de su día de
+  cobro (o al de la fecha del archivo si el turno no tiene fecha_cobro).
+
+  Returns:
+    int: Tickets movidos.
+  """
+  if not os.path.isdir(PDF_PATH):
+    return 0
+  planos = {}
+  for archivo in os.scandir(PDF_PATH):
+    coincidencia = PATRON_PLANO.match(archivo.name)
+    if coincidencia and archivo.is_file():
+      planos[int(coincidencia.group(1))] = archivo.path
+  if not planos:
+    return 0
+
+  fechas = Turno.fechas_cobro(planos.keys())
+  for turno_id, ruta in planos.items():
+    fecha = fechas.get(turno_id) or datetime.fromtimestamp(os.path.getmtime(ruta))
+    with open(ruta, "rb") as f:
+      almacen_tickets.guardar(turno_id, fecha, f.read())
+    os.remove(ruta)
+  return len(planos)
+
+def main():
+  """
+  Empaqueta los tickets de los meses cerrados en un zip por mes con su índice
+  (ver funciones/almacen_tickets.py), para que el almacén no acumule millones
+  de archivos sueltos y un respaldo copie un archivo por mes.
+
+  Sin --mes empaqueta todos los meses anteriores al actual que tengan tickets
+  sueltos. Un mes ya empaquetado se puede volver a empaquetar: los tickets
+  regenerados después reemplazan a los del zip.
+  """
+  parser = argparse.ArgumentParser(description="Empaqueta los tickets de los meses cerrados.")
+  parser.add_argument("--mes", type=leer_mes, default=None, help="Solo este mes (AAAA-MM); tiene que estar cerrado")
+  parser.add_argument("--migrar-planos", action="store_true", help=f"Antes, mueve al almacén los tickets sueltos en {PDF_PATH}")
+  args = parser.parse_args()
+
+  if not hasattr(almacen_tickets, "empaquetar_mes"):
+    print(f"[ERROR] El almacén '{almacen_tickets.nombre}' no se empaqueta.")
+    sys.exit(2)
+
+  inicio = time.perf_counter()
+  if args.migrar_planos:
+    movidos = migrar_planos()
+    ModeloBase.cerrar_pool()
+    print(f"[OK] {movidos} ticket(s) de la carpeta plana movidos al almacén")
+
+  actual = date.today().replace(day=1)
+  if args.mes:
+    if args.mes >= actual:
+      print(f"[ERROR] {args.mes:%Y-%m} no está cerrado: solo se empaquetan meses anteriores al actual.")
+      sys.exit(2)
+    meses = [(args.mes.year, args.mes.month)]
+  else:
+    meses = [(anio, mes) for anio, mes in almacen_tickets.meses_sueltos() if date(anio, mes, 1) < actual]
+
+  total = 0
+  for anio, mes in meses:
+    empaquetados = almacen_tickets.empaquetar_mes(anio, mes)
+    total += empaquetados
+    print(f"      {anio:04d}-{mes:02d}: {empaquetados} ticket(s)")
+  print(f"[OK] {total} ticket(s) empaquetados en {len(meses)} mes(es) en {time.perf_counter() - inicio:.1f} s.")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,97 @@
+import sys
+import os
+import time
+import argparse
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_base import ModeloBase
+from modelos.modelo_turno import Turno
+from modelos.modelo_turno_servicio import TurnoServicio
+from funciones.generador_pdf import PDF_PATH, almacen_tickets, generar_tickets_lote
+from funciones.almacen_tickets import AlmacenDirectorio, NUEVO, IGUAL, REEMPLAZADO
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def leer_fecha(texto):
+  return datetime.strptime(texto, "%Y-%m-%d").date()
+
+def mes_anterior(hoy):
+  """Primer y último día del mes anterior a `hoy`."""
+  hasta = hoy.replace(day=1) - timedelta(days=1)
+  return hasta.replace(day=1), hasta
+
+def main():
+  """
+  Genera los tickets PDF de todos los turnos cobrados en un rango de fechas
+  (por defecto, el mes anterior), por ejemplo para la exportación contable.
+
+  Los turnos y sus servicios se leen con dos consultas para todo el rango; el
+  dibujo se reparte entre procesos (uno por núcleo) y cada ticket se guarda en
+  el almacén de tickets (carpetas por día, renombrado atómico), así una
+  exportación interrumpida no deja PDFs incompletos y los tickets que no
+  cambiaron no se vuelven a escribir. Termina con código 1 si algún ticket no
+  se pudo generar.
+  """
+  desde_defecto, hasta_defecto = mes_anterior(date.today())
+  parser = argparse.ArgumentParser(description="Genera los tickets de los turnos cobrados en un rango de fechas.")
+  parser.add_argument("--desde", type=leer_fecha, default=desde_defecto, help="Primer día de cobro (AAAA-MM-DD); por defecto el mes anterior")
+  parser.add_argument("--hasta", type=leer_fecha, default=hasta_defecto, help="Último día de cobro (AAAA-MM-DD)")
+  parser.add_argument("--destino", default=None, help=f"Carpeta de otro almacén; por defecto el de la aplicación ({PDF_PATH})")
+  parser.add_argument("--procesos", type=int, default=None, help="Procesos que dibujan tickets; por defecto uno por núcleo")
+  parser.add_argument("--lote", type=int, default=50, help="Tickets por tarea enviada a cada proceso")
+  args = parser.parse_args()
+
+  if args.desde > args.hasta:
+    print("[ERROR] --desde no puede ser posterior a --hasta.")
+    sys.exit(2)
+  almacen = AlmacenDirectorio(args.destino) if args.destino else almacen_tickets
+
+  # --- Lectura: dos consultas para todo el rango ---
+  inicio = time.perf_counter()
+  turnos = Turno.listar_cobrados(args.desde, args.hasta)
+  servicios = TurnoServicio.listar_por_turnos_cobrados(args.desde, args.hasta)
+  # Se cierra antes de crear los procesos: las conexiones no se comparten entre procesos
+  ModeloBase.cerrar_pool()
+  if turnos is None or servicios is None:
+    print("[ERROR] No se pudieron leer los turnos cobrados.")
+    sys.exit(1)
+  if not turnos:
+    print(f"[INFO] No hay turnos cobrados de {args.desde} a {args.hasta}.")
+    return
+  lectura = time.perf_counter() - inicio
+
+  tickets = [(turno, servicios.get(turno['id'], [])) for turno in turnos]
+  print(f"[OK] {len(tickets)} turnos cobrados leídos en {lectura:.2f} s")
+
+  # --- Dibujo en paralelo ---
+  hechos = 0
+  def al_avanzar(cantidad):
+    nonlocal hechos
+    hechos += cantidad
+    print(f"\r      {hechos}/{len(tickets)} tickets", end="", flush=True)
+
+  inicio = time.perf_counter()
+  resultados = generar_tickets_lote(tickets, almacen, procesos=args.procesos, tamano_lote=args.lote, al_avanzar=al_avanzar)
+  dibujo = time.perf_counter() - inicio
+  print()
+
+  errores = [(turno_id, error) for turno_id, _, _, error in resultados if error]
+  generados = len(resultados) - len(errores)
+  estados = [estado for _, _, estado, _ in resultados]
+  print(f"[OK] {generados} tickets en {almacen.raiz}: {estados.count(NUEVO)} nuevos, "
+        f"{estados.count(REEMPLAZADO)} reemplazados, {estados.count(IGUAL)} sin cambios")
+  print(f"     Dibujo: {dibujo:.2f} s ({generados / dibujo:.1f} tickets/s)")
+  print(f"     Total:  {lectura + dibujo:.2f} s ({generados / (lectura + dibujo):.1f} tickets/s)")
+
+  if errores:
+    for turno_id, error in errores[:20]:
+      print(f"[ERROR] Turno {turno_id}: {error}")
+    print(f"[ERROR] {len(errores)} ticket(s) no se pudieron generar.")
+    sys.exit(1)
+
+if __name__ == "__main__":
+  main()
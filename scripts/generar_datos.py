@@ -0,0 +1,276 @@
+import sys
+import os
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_base import ModeloBase
+from modelos.modelo_reporte import Reporte
+from modelos.modelo_turno import Turno
+from funciones import disponibilidad
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Los datos generados se identifican por este dominio (emails) y descripción (servicios) para poder borrarlos
+DOMINIO = "seed.datos"
+
+NOMBRES = ["Ana", "Lucia", "Sofia", "Valentina", "Camila", "Martina", "Julieta", "Paula", "Elena", "Carla",
+           "Juan", "Mateo", "Santiago", "Tomas", "Lucas", "Matias", "Nicolas", "Diego", "Andres", "Bruno"]
+APELLIDOS = ["Gomez", "Fernandez", "Rodriguez", "Lopez", "Martinez", "Garcia", "Perez", "Sanchez", "Romero", "Diaz",
+             "Alvarez", "Torres", "Ruiz", "Ramirez", "Flores", "Acosta", "Benitez", "Medina", "Herrera", "Suarez"]
+SERVICIOS = ["Corte", "Brushing", "Color", "Mechas", "Alisado", "Manicura", "Pedicura", "Peinado", "Barba", "Tratamiento"]
+
+# Distribución de estados según el turno ya pasó o todavía no
+ESTADOS_PASADO = (["realizado", "cancelado", "confirmado", "pendiente"], [85, 10, 1, 4])
+ESTADOS_FUTURO = (["pendiente", "confirmado", "cancelado"], [85, 5, 10])
+
+# Más demanda a la tarde y los sábados
+PESO_HORA = {9: 4, 10: 6, 11: 7, 12: 6, 13: 5, 14: 6, 15: 8, 16: 9, 17: 10, 18: 8}
+PESO_DIA = [8, 8, 9, 10, 12, 16, 0] # 0=Lunes ... 6=Domingo (cerrado)
+
+# Turnos por día (corrido) que entran en la agenda sin saturar los sábados a la
+# tarde: 3 lugares por horario, 10 horarios por día y ~2 horarios por turno
+TURNOS_POR_DIA = 6
+
+def _siguiente_id(tabla):
+  rows = ModeloBase.ejecutar(f"SELECT MAX(id) FROM {tabla}", fetch=True)
+  return (rows[0][0] or 0) + 1
+
+def _insertar_por_lotes(query, filas, lote):
+  for i in range(0, len(filas), lote):
+    with ModeloBase.transaccion():
+      ModeloBase.ejecutar_lote(query, filas[i:i + lote])
+
+def dias_necesarios(turnos, minimo=730):
+  """Días de historia para que `turnos` entren en la agenda (ver TURNOS_POR_DIA), al menos `minimo`."""
+  return max(minimo, -(-turnos // TURNOS_POR_DIA))
+
+def _ocupacion_existente(desde, hasta):
+  """Turno_Slot ya cargado en el rango (datos reales o de otra corrida), para respetar la capacidad."""
+  rows = ModeloBase.ejecutar(
+    "SELECT fecha_hora, ocupados FROM Turno_Slot WHERE fecha_hora >= %s AND fecha_hora < %s",
+    (desde, hasta), fetch=True
+  ) or []
+  return {fecha_hora: ocupados for fecha_hora, ocupados in rows}
+
+def generar(clientes=1000, turnos=10000, servicios=20, peluqueros=5, dias_historia=None, semilla=42, lote=5000, informar=print):
+  """
+  Carga un conjunto de datos sintético y reproducible (misma semilla, mismos datos).
+
+  Los IDs se asignan explícitamente para poder insertar por lotes y relacionar
+  las tablas sin consultar los IDs generados. Todos los usuarios comparten un
+  mismo hash de contraseña ("Demo1234"), calculado una sola vez.
+
+  Como en la aplicación, ningún horario supera Turno.CAPACIDAD_SLOT turnos no
+  cancelados y un peluquero no tiene dos turnos no cancelados superpuestos. Si
+  un turno no entra a la hora elegida se prueba otra del mismo día y, si no
+  hay lugar, queda cancelado. Sin dias_historia se usan los días necesarios
+  para que los turnos entren (dias_necesarios).
+
+  Returns:
+    dict: Rangos de IDs generados (clientes, peluqueros, servicios, turnos).
+  """
+  rnd = random.Random(semilla)
+  hash_demo = ModeloBase._hash_password("Demo1234")
+  inicio = time.perf_counter()
+
+  # --- Usuarios ---
+  primer_usuario = _siguiente_id("Usuario")
+  usuarios = []
+  for i in range(peluqueros):
+    usuarios.append((primer_usuario + i, rnd.choice(NOMBRES), rnd.choice(APELLIDOS),
+                     f"peluquero{primer_usuario + i}@{DOMINIO}", hash_demo, "peluquero"))
+  ids_peluqueros = [u[0] for u in usuarios]
+  for i in range(peluqueros, peluqueros + clientes):
+    usuarios.append((primer_usuario + i, rnd.choice(NOMBRES), rnd.choice(APELLIDOS),
+                     f"cliente{primer_usuario + i}@{DOMINIO}", hash_demo, "cliente"))
+  _insertar_por_lotes(
+    "INSERT INTO Usuario (id, nombre, apellido, email, password_hash, rol) VALUES (%s, %s, %s, %s, %s, %s)",
+    usuarios, lote
+  )
+  ids_clientes = range(primer_usuario + peluqueros, primer_usuario + peluqueros + clientes)
+  informar(f"[OK] {len(usuarios)} usuarios")
+
+  # --- Servicios ---
+  primer_servicio = _siguiente_id("Servicio")
+  catalogo = []
+  for i in range(servicios):
+    nombre = f"{SERVICIOS[i % len(SERVICIOS)]} {i // len(SERVICIOS) + 1}"
+    catalogo.append((primer_servicio + i, nombre, DOMINIO, rnd.randrange(500, 10000, 50), rnd.choice([30, 45, 60, 60, 90, 120])))
+  _insertar_por_lotes(
+    "INSERT INTO Servicio (id, nombre, descripcion, precio, duracion_estimada) VALUES (%s, %s, %s, %s, %s)",
+    catalogo, lote
+  )
+  informar(f"[OK] {len(catalogo)} servicios")
+
+  # --- Turnos, sus servicios y la ocupación por horario ---
+  primer_turno = _siguiente_id("Turno")
+  hoy = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+  ahora = datetime.now()
+  dias_historia = dias_historia or dias_necesarios(turnos)
+  dias = [hoy + timedelta(days=d) for d in range(-dias_historia, disponibilidad.DIAS_RESERVA + 2)]
+  pesos_dias = [PESO_DIA[d.weekday()] for d in dias]
+  horas, pesos_horas = list(PESO_HORA), list(PESO_HORA.values())
+
+  capacidad = Turno.CAPACIDAD_SLOT
+  previa = _ocupacion_existente(dias[0], dias[-1] + timedelta(days=1))
+  ocupacion = {} # horario -> turnos no cancelados generados
+  peluqueros_ocupados = {} # horario -> peluqueros asignados
+  filas_turnos, filas_servicios = [], []
+  sin_lugar = 0
+
+  def ubicar(dia, hora, duracion, pasado):
+    """Primer horario del día (empezando por `hora`) con lugar y un peluquero libre: (fecha_hora, peluquero_id) o None."""
+    ultima = disponibilidad.HORA_CIERRE - disponibilidad.slots_necesarios(duracion)
+    otras = [h for h in range(disponibilidad.HORA_APERTURA, ultima + 1) if h != hora]
+    for h in [hora] + rnd.sample(otras, len(otras)):
+      fecha_hora = dia.replace(hour=h)
+      if (fecha_hora < ahora) != pasado:
+        continue
+      horarios = disponibilidad.slots_del_turno(fecha_hora, duracion)
+      if any(previa.get(x, 0) + ocupacion.get(x, 0) >= capacidad for x in horarios):
+        continue
+      if not ids_peluqueros:
+        return fecha_hora, None
+      ocupados = set().union(*(peluqueros_ocupados.get(x, set()) for x in horarios))
+      libres = [p for p in ids_peluqueros if p not in ocupados]
+      if libres:
+        return fecha_hora, rnd.choice(libres)
+    return None
+
+  for n in range(turnos):
+    turno_id = primer_turno + n
+    elegidos = rnd.sample(catalogo, k=min(len(catalogo), rnd.choices([1, 2, 3], [60, 30, 10])[0]))
+    duracion = sum(s[4] for s in elegidos)
+    slots = disponibilidad.slots_necesarios(duracion)
+
+    dia = rnd.choices(dias, pesos_dias)[0]
+    hora = rnd.choices(horas, pesos_horas)[0]
+    hora = min(hora, disponibilidad.HORA_CIERRE - slots) # el turno termina antes del cierre
+    fecha_hora = dia.replace(hour=max(hora, disponibilidad.HORA_APERTURA))
+
+    estados, pesos = ESTADOS_PASADO if fecha_hora < ahora else ESTADOS_FUTURO
+    estado = rnd.choices(estados, pesos)[0]
+    peluquero_id = rnd.choice(ids_peluqueros) if ids_peluqueros else None
+
+    # Como en la aplicación, los turnos no cancelados ocupan su horario (cobrar no lo libera)
+    if estado != "cancelado":
+      lugar = ubicar(dia, fecha_hora.hour, duracion, fecha_hora < ahora)
+      if lugar is None:
+        estado = "cancelado"
+        sin_lugar += 1
+      else:
+        fecha_hora, peluquero_id = lugar
+        for h in disponibilidad.slots_del_turno(fecha_hora, duracion):
+          ocupacion[h] = ocupacion.get(h, 0) + 1
+          if peluquero_id is not None:
+            peluqueros_ocupados.setdefault(h, set()).add(peluquero_id)
+
+    total = sum(s[3] for s in elegidos)
+    fecha_cobro = fecha_hora + timedelta(minutes=duracion) if estado == "realizado" else None
+    filas_turnos.append((turno_id, rnd.choice(ids_clientes), fecha_hora, estado, total, duracion, peluquero_id, fecha_cobro))
+    filas_servicios.extend((turno_id, s[0], s[3]) for s in elegidos)
+
+    if len(filas_turnos) >= lote:
+      _insertar_turnos(filas_turnos, filas_servicios, lote)
+      filas_turnos, filas_servicios = [], []
+      informar(f"      {n + 1}/{turnos} turnos")
+
+  _insertar_turnos(filas_turnos, filas_servicios, lote)
+
+  _insertar_por_lotes(
+    """INSERT INTO Turno_Slot (fecha_hora, ocupados) VALUES (%s, %s)
+      ON DUPLICATE KEY UPDATE ocupados = ocupados + VALUES(ocupados)""",
+    sorted(ocupacion.items()), lote
+  )
+  informar(f"[OK] {turnos} turnos en {dias_historia} días de historia en {time.perf_counter() - inicio:.1f} s")
+  if sin_lugar:
+    informar(f"[INFO] {sin_lugar} turnos quedaron cancelados por falta de lugar en su día")
+
+  # Los turnos se insertaron por fuera de Turno.registrar_cobro: se recalculan los reportes
+  Reporte.reconstruir(dias[0].date(), hoy.date())
+  informar("[OK] Reportes de facturación recalculados")
+
+  # Estadísticas al día después de la carga masiva, para que el planificador
+  # elija bien entre índices (ej. idx_turno_fecha_cobro frente a idx_turno_estado_fecha)
+  for tabla in ("Usuario", "Turno", "Turno_Servicio", "Turno_Slot"):
+    ModeloBase.ejecutar(f"ANALYZE TABLE {tabla}", fetch=True)
+
+  return {
+    "clientes": ids_clientes,
+    "peluqueros": ids_peluqueros,
+    "servicios": range(primer_servicio, primer_servicio + servicios),
+    "turnos": range(primer_turno, primer_turno + turnos),
+  }
+
+def _insertar_turnos(filas_turnos, filas_servicios, lote):
+  if not filas_turnos:
+    return
+  with ModeloBase.transaccion():
+    ModeloBase.ejecutar_lote(
+      """INSERT INTO Turno (id, cliente_id, fecha_hora, estado, total, duracion, peluquero_id, fecha_cobro)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+      filas_turnos
+    )
+    ModeloBase.ejecutar_lote(
+      "INSERT INTO Turno_Servicio (turno_id, servicio_id, precio_cobrado) VALUES (%s, %s, %s)",
+      filas_servicios
+    )
+
+def limpiar(informar=print):
+  """Borra los datos generados (y descuenta su ocupación de Turno_Slot)."""
+  activos = ModeloBase.ejecutar(f"""
+    SELECT t.fecha_hora, t.duracion FROM Turno t JOIN Usuario u ON t.cliente_id = u.id
+    WHERE u.email LIKE %s AND t.estado <> 'cancelado'
+  """, (f"%@{DOMINIO}",), fetch=True) or []
+
+  ocupacion = {}
+  for fecha_hora, duracion in activos:
+    for h in disponibilidad.slots_del_turno(fecha_hora, duracion):
+      ocupacion[h] = ocupacion.get(h, 0) + 1
+
+  cobros = Reporte.rango_cobros()
+
+  with ModeloBase.transaccion():
+    ModeloBase.ejecutar_lote(
+      "UPDATE Turno_Slot SET ocupados = ocupados - %s WHERE fecha_hora = %s",
+      [(cantidad, h) for h, cantidad in ocupacion.items()]
+    )
+    ModeloBase.ejecutar("DELETE FROM Turno WHERE cliente_id IN (SELECT id FROM Usuario WHERE email LIKE %s)", (f"%@{DOMINIO}",))
+    ModeloBase.ejecutar("DELETE FROM Turno WHERE peluquero_id IN (SELECT id FROM Usuario WHERE email LIKE %s)", (f"%@{DOMINIO}",))
+    ModeloBase.ejecutar("DELETE FROM Usuario WHERE email LIKE %s", (f"%@{DOMINIO}",))
+    ModeloBase.ejecutar("DELETE FROM Servicio WHERE descripcion = %s", (DOMINIO,))
+
+  if cobros:
+    Reporte.reconstruir(*cobros)
+  informar("[OK] Datos generados eliminados.")
+
+def main():
+  """
+  Genera un conjunto de datos sintético y reproducible para pruebas de escala.
+  Los datos se pueden borrar con --limpiar sin tocar los datos reales.
+  """
+  parser = argparse.ArgumentParser(description="Generador de datos sintéticos (clientes, servicios, turnos).")
+  parser.add_argument("--clientes", type=int, default=10000)
+  parser.add_argument("--turnos", type=int, default=20000)
+  parser.add_argument("--servicios", type=int, default=30)
+  parser.add_argument("--peluqueros", type=int, default=8)
+  parser.add_argument("--dias-historia", type=int, default=None, help="Días hacia atrás con turnos; por defecto los necesarios para que entren (mínimo 730)")
+  parser.add_argument("--semilla", type=int, default=42)
+  parser.add_argument("--lote", type=int, default=5000, help="Filas por INSERT en lote")
+  parser.add_argument("--limpiar", action="store_true", help="Borra los datos generados y termina")
+  args = parser.parse_args()
+
+  if args.limpiar:
+    limpiar()
+  else:
+    generar(args.clientes, args.turnos, args.servicios, args.peluqueros, args.dias_historia, args.semilla, args.lote)
+  ModeloBase.cerrar_pool()
+
+if __name__ == "__main__":
+  main()
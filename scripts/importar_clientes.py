@@ -0,0 +1,169 @@
+import sys
+import os
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+from rich.progress import Progress, BarColumn, MofNCompleteColumn, TimeElapsedColumn, TimeRemainingColumn
+
+from modelos.modelo_base import ModeloBase
+from modelos.modelo_usuario import Usuario
+from funciones.auxiliares import validar_nombre, validar_email, validar_password
+from funciones.gestion_usuarios import ROLES
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+console = Console()
+
+def leer_archivo(ruta):
+  """
+  Lee los usuarios de un CSV (con encabezado) o de un JSON (lista de objetos).
+  Campos: nombre, apellido, email, password y rol (opcional).
+
+  Returns:
+    list[tuple]: (número de fila, dict) con la fila tal cual se leyó.
+  """
+  with open(ruta, encoding="utf-8-sig", newline="") as archivo:
+    if ruta.lower().endswith(".json"):
+      filas = json.load(archivo)
+      return list(enumerate(filas, start=1))
+    # En el CSV la fila 1 es el encabezado
+    return list(enumerate(csv.DictReader(archivo), start=2))
+
+def validar_filas(filas, password_defecto=None, rol_defecto="cliente"):
+  """
+  Valida cada fila con las mismas reglas que el alta manual (crear_usuario) y
+  descarta los emails repetidos dentro del archivo.
+
+  Returns:
+    tuple: (validos, errores). validos: [(fila, nombre, apellido, email, password, rol)];
+      errores: [(fila, email, motivo)].
+  """
+  validos, errores = [], []
+  vistos = set()
+
+  for numero, fila in filas:
+    nombre = (fila.get("nombre") or "").strip()
+    apellido = (fila.get("apellido") or "").strip()
+    email = (fila.get("email") or "").strip()
+    password = fila.get("password") or password_defecto or ""
+    rol = (fila.get("rol") or rol_defecto).strip().lower()
+
+    if not validar_nombre(nombre):
+      motivo = "Nombre inválido: solo letras y al menos 2 caracteres."
+    elif not validar_nombre(apellido):
+      motivo = "Apellido inválido: solo letras y al menos 2 caracteres."
+    elif not validar_email(email):
+      motivo = "Email inválido."
+    elif not validar_password(password):
+      motivo = "La contraseña debe tener al menos 6 caracteres, una mayúscula y un número."
+    elif rol not in ROLES:
+      motivo = f"Rol inválido: {rol}."
+    elif email.lower() in vistos:
+      motivo = "Email repetido en el archivo."
+    else:
+      motivo = None
+
+    if motivo:
+      errores.append((numero, email, motivo))
+      continue
+
+    email = email.lower() # como en crear_usuario, después de validar
+    vistos.add(email)
+    validos.append((numero, nombre, apellido, email, password, rol))
+
+  return validos, errores
+
+def _hashear(passwords):
+  # Corre en los procesos del pool: bcrypt es CPU puro, así que los hilos no ayudarían
+  return [ModeloBase._hash_password(p) for p in passwords]
+
+def _insertar(lote, hashes, errores):
+  """
+  Inserta un lote en una transacción. Si falla (ej. alguien registró uno de los
+  emails después de la verificación), se reintenta fila por fila para que solo
+  quede afuera la que tiene el problema.
+  """
+  usuarios = [(nombre, apellido, email, h, rol) for (_, nombre, apellido, email, _, rol), h in zip(lote, hashes)]
+  try:
+    return Usuario.crear_lote(usuarios)
+  except Exception:
+    pass
+
+  creados = 0
+  for (numero, _, _, email, _, _), usuario in zip(lote, usuarios):
+    try:
+      creados += Usuario.crear_lote([usuario])
+    except Exception as e:
+      errores.append((numero, email, f"Error al insertar: {e}"))
+  return creados
+
+def guardar_errores(ruta, errores):
+  with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+    escritor = csv.writer(archivo)
+    escritor.writerow(["fila", "email", "error"])
+    escritor.writerows(sorted(errores))
+
+def main():
+  """
+  Importa usuarios (por defecto clientes) desde un CSV o JSON.
+
+  Valida todas las filas, descarta los emails ya registrados con consultas IN
+  por bloques, reparte el hash bcrypt de las contraseñas entre varios procesos
+  e inserta por lotes, cada lote en una transacción. Las filas rechazadas se
+  guardan con su motivo en un CSV de errores.
+  """
+  parser = argparse.ArgumentParser(description="Importación masiva de clientes desde CSV o JSON.")
+  parser.add_argument("archivo", help="Archivo .csv (con encabezado) o .json")
+  parser.add_argument("--password-defecto", default=None, help="Contraseña para las filas que no traen una")
+  parser.add_argument("--rol", default="cliente", choices=ROLES, help="Rol para las filas que no traen uno")
+  parser.add_argument("--procesos", type=int, default=os.cpu_count(), help="Procesos para el hash de contraseñas")
+  parser.add_argument("--lote", type=int, default=500, help="Usuarios por INSERT en lote")
+  parser.add_argument("--errores", default="errores_importacion.csv", help="CSV con las filas rechazadas")
+  parser.add_argument("--validar", action="store_true", help="Solo valida, no inserta nada")
+  args = parser.parse_args()
+
+  inicio = time.perf_counter()
+  filas = leer_archivo(args.archivo)
+  validos, errores = validar_filas(filas, args.password_defecto, args.rol)
+
+  existentes = Usuario.emails_existentes(v[3] for v in validos)
+  if existentes:
+    errores.extend((v[0], v[3], "Ya existe una cuenta con ese email.") for v in validos if v[3] in existentes)
+    validos = [v for v in validos if v[3] not in existentes]
+
+  console.print(f"Filas leídas: {len(filas)} | Válidas: [green]{len(validos)}[/green] | Rechazadas: [red]{len(errores)}[/red]")
+
+  creados = 0
+  if validos and not args.validar:
+    lotes = [validos[i:i + args.lote] for i in range(0, len(validos), args.lote)]
+    columnas = ("[progress.description]{task.description}", BarColumn(), MofNCompleteColumn(), TimeElapsedColumn(), TimeRemainingColumn())
+
+    # Mientras los procesos hashean los lotes siguientes, este proceso inserta el que ya está listo
+    with Progress(*columnas, console=console) as progreso, ProcessPoolExecutor(max_workers=args.procesos) as executor:
+      tarea = progreso.add_task("Importando", total=len(validos))
+      hashes_por_lote = executor.map(_hashear, ([v[4] for v in lote] for lote in lotes))
+      for lote, hashes in zip(lotes, hashes_por_lote):
+        creados += _insertar(lote, hashes, errores)
+        progreso.advance(tarea, len(lote))
+
+  ModeloBase.cerrar_pool()
+
+  if errores:
+    guardar_errores(args.errores, errores)
+    console.print(f"[yellow]{len(errores)} fila(s) con errores. Detalle en {args.errores}[/yellow]")
+
+  if args.validar:
+    console.print("[cyan]Validación terminada (no se insertó nada).[/cyan]")
+  else:
+    console.print(f"[bold green][OK] {creados} usuario(s) importados en {time.perf_counter() - inicio:.1f} s.[/bold green]")
+
+if __name__ == "__main__":
+  main()
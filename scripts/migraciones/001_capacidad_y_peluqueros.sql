@@ -0,0 +1,34 @@
+-- -----------------------------------------------------------
+-- 001: Duración y peluquero de los turnos, y tabla Turno_Slot
+-- (capacidad por horario) cargada con los turnos no cancelados actuales.
+-- -----------------------------------------------------------
+ALTER TABLE Turno ADD COLUMN IF NOT EXISTS duracion INT NOT NULL DEFAULT 60;
+ALTER TABLE Turno ADD COLUMN IF NOT EXISTS peluquero_id INT NULL;
+CREATE INDEX IF NOT EXISTS idx_turno_peluquero_fecha ON Turno (peluquero_id, fecha_hora);
+ALTER TABLE Turno ADD CONSTRAINT fk_turno_peluquero
+  FOREIGN KEY IF NOT EXISTS (peluquero_id) REFERENCES Usuario(id) ON DELETE RESTRICT;
+
+-- Duración de cada turno = suma de la duración de sus servicios
+UPDATE Turno t
+SET t.duracion = (
+  SELECT COALESCE(SUM(s.duracion_estimada), 60)
+  FROM Turno_Servicio ts JOIN Servicio s ON ts.servicio_id = s.id
+  WHERE ts.turno_id = t.id
+);
+
+CREATE TABLE IF NOT EXISTS Turno_Slot (
+  fecha_hora DATETIME PRIMARY KEY,
+  ocupados INT NOT NULL DEFAULT 0
+);
+
+-- Cada turno ocupa un horario por cada hora (o fracción) de duración; los
+-- realizados siguen ocupando el suyo (anular_cobro lo libera)
+INSERT INTO Turno_Slot (fecha_hora, ocupados)
+SELECT t.fecha_hora + INTERVAL h.n HOUR, COUNT(*)
+FROM Turno t
+JOIN (SELECT 0 AS n UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
+      UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7
+      UNION ALL SELECT 8 UNION ALL SELECT 9) h ON h.n * 60 < t.duracion
+WHERE t.estado <> 'cancelado'
+GROUP BY t.fecha_hora + INTERVAL h.n HOUR
+ON DUPLICATE KEY UPDATE ocupados = VALUES(ocupados);
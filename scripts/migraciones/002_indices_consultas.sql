@@ -0,0 +1,14 @@
+-- -----------------------------------------------------------
+-- 002: Índices compuestos para las consultas frecuentes de los modelos
+-- -----------------------------------------------------------
+
+-- Turno.listar(estado=...), Turno.listar_agenda y los listados por estado y fecha
+CREATE INDEX IF NOT EXISTS idx_turno_estado_fecha ON Turno (estado, fecha_hora);
+
+-- Turno.listar_para_cliente y Turno.listar(estado, cliente_id, fecha_hoy).
+-- También cubre la clave foránea de cliente_id.
+CREATE INDEX IF NOT EXISTS idx_turno_cliente_estado_fecha ON Turno (cliente_id, estado, fecha_hora);
+
+-- Usuario.listar_empleados, listar_peluqueros y buscar_por_nombre_similar
+-- (filtran por rol y activo y ordenan por nombre, apellido)
+CREATE INDEX IF NOT EXISTS idx_usuario_rol_activo_nombre ON Usuario (rol, activo, nombre, apellido);
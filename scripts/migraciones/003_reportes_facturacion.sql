@@ -0,0 +1,25 @@
+-- -----------------------------------------------------------
+-- 003: Fecha de cobro de los turnos y tablas de resumen para los
+-- reportes de facturación (se mantienen al cobrar y al anular un cobro).
+-- Después de aplicarla, cargar el historial con scripts/backfill_reportes.py
+-- -----------------------------------------------------------
+ALTER TABLE Turno ADD COLUMN IF NOT EXISTS fecha_cobro DATETIME NULL;
+CREATE INDEX IF NOT EXISTS idx_turno_fecha_cobro ON Turno (fecha_cobro);
+
+-- Los turnos cobrados antes de esta versión no registraban la fecha: se usa la del turno
+UPDATE Turno SET fecha_cobro = fecha_hora WHERE estado = 'realizado' AND fecha_cobro IS NULL;
+
+CREATE TABLE IF NOT EXISTS Reporte_Diario (
+  fecha DATE PRIMARY KEY,
+  turnos INT NOT NULL DEFAULT 0,
+  ingresos DECIMAL(12, 2) NOT NULL DEFAULT 0.00
+);
+
+-- Sin clave foránea a Servicio: el historial se conserva aunque se borre el servicio
+CREATE TABLE IF NOT EXISTS Reporte_Servicio_Diario (
+  fecha DATE NOT NULL,
+  servicio_id INT NOT NULL,
+  cantidad INT NOT NULL DEFAULT 0,
+  ingresos DECIMAL(12, 2) NOT NULL DEFAULT 0.00,
+  PRIMARY KEY (fecha, servicio_id)
+);
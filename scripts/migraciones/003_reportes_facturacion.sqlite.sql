@@ -0,0 +1,23 @@
+-- -----------------------------------------------------------
+-- 003 (SQLite): igual que 003_reportes_facturacion.sql. SQLite no acepta
+-- ADD COLUMN IF NOT EXISTS; las bases nuevas ya traen la columna
+-- (tablas_sqlite.sql registra esta versión como aplicada).
+-- -----------------------------------------------------------
+ALTER TABLE Turno ADD COLUMN fecha_cobro DATETIME NULL;
+CREATE INDEX IF NOT EXISTS idx_turno_fecha_cobro ON Turno (fecha_cobro);
+
+UPDATE Turno SET fecha_cobro = fecha_hora WHERE estado = 'realizado' AND fecha_cobro IS NULL;
+
+CREATE TABLE IF NOT EXISTS Reporte_Diario (
+  fecha DATE PRIMARY KEY,
+  turnos INT NOT NULL DEFAULT 0,
+  ingresos DECIMAL(12, 2) NOT NULL DEFAULT 0.00
+);
+
+CREATE TABLE IF NOT EXISTS Reporte_Servicio_Diario (
+  fecha DATE NOT NULL,
+  servicio_id INT NOT NULL,
+  cantidad INT NOT NULL DEFAULT 0,
+  ingresos DECIMAL(12, 2) NOT NULL DEFAULT 0.00,
+  PRIMARY KEY (fecha, servicio_id)
+);
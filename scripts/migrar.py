@@ -0,0 +1,37 @@
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_migracion import Migracion
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def main():
+  parser = argparse.ArgumentParser(description="Aplica las migraciones pendientes de scripts/migraciones.")
+  parser.add_argument("--estado", action="store_true", help="Solo muestra las migraciones pendientes")
+  args = parser.parse_args()
+
+  pendientes = Migracion.pendientes()
+  if not pendientes:
+    print("[INFO] La base de datos está actualizada.")
+    return
+
+  if args.estado:
+    for version, descripcion, _ in pendientes:
+      print(f"[PENDIENTE] {version:03d} {descripcion}")
+    return
+
+  for version, descripcion, ruta in pendientes:
+    try:
+      Migracion.aplicar(version, descripcion, ruta)
+      print(f"[OK] {version:03d} {descripcion}")
+    except Exception as e:
+      print(f"[ERROR] Falló la migración {version:03d} {descripcion}: {e}")
+      sys.exit(1)
+
+if __name__ == "__main__":
+  main()
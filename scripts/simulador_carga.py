@@ -0,0 +1,303 @@
+import sys
+import os
+import random
+import argparse
+import threading
+import statistics
+from time import perf_counter, sleep
+from datetime import datetime, time, timedelta
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_base import ModeloBase
+from modelos.modelo_usuario import Usuario
+from modelos.modelo_servicio import Servicio
+from modelos.modelo_turno import Turno
+from modelos.modelo_turno_servicio import TurnoServicio
+from modelos.instrumentacion import metricas
+from funciones import disponibilidad
+
+import generar_datos
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Resultado de cada operación simulada
+OK = "ok"
+RECHAZADA = "rechazada" # el horario se llenó o el turno cambió mientras tanto (esperable con carga)
+SIN_DATOS = "sin_datos" # no había nada para confirmar, cobrar o cancelar
+ERROR = "error"
+
+MEZCLA_DEFECTO = "reservar=50,confirmar=20,cobrar=15,cancelar=15"
+
+
+class Simulacion:
+  """
+  Recorre los mismos pasos que las acciones de los menús (mismas llamadas a los
+  modelos, en el mismo orden), pero eligiendo al azar en lugar de preguntar.
+
+  Los clientes que reservan quedan en `reservados` para que los flujos de la
+  recepción (confirmar, cobrar) y las cancelaciones tengan turnos sobre los que trabajar.
+  """
+
+  def __init__(self, clientes, semilla):
+    self.clientes = clientes
+    self.semilla = semilla
+    self.reservados = []
+    self._lock = threading.Lock()
+
+  def reservar(self, rnd):
+    """Como funciones_cliente.solicitar_turno."""
+    cliente = rnd.choice(self.clientes)
+    servicios = Servicio.listar_todos(solo_activos=True) or []
+    if not servicios:
+      return SIN_DATOS
+    elegidos = rnd.sample(servicios, k=min(len(servicios), rnd.choice([1, 1, 2, 3])))
+    total = sum(s['precio'] for s in elegidos)
+    duracion = sum(s['duracion_estimada'] for s in elegidos)
+
+    dias = disponibilidad.dias_habiles()
+    peluqueros = Usuario.listar_peluqueros() or []
+    agenda = None
+    capacidad = Turno.CAPACIDAD_SLOT
+    if peluqueros:
+      agenda = disponibilidad.AgendaPeluqueros.desde_turnos(peluqueros, Turno.listar_agenda(dias[0], dias[-1]) or [])
+      capacidad = len(peluqueros)
+
+    ocupacion = Turno.listar_ocupacion(dias[0], dias[-1])
+    libres_por_dia = disponibilidad.calcular_disponibilidad(dias, ocupacion, duracion, capacidad, agenda)
+    horarios = [datetime.combine(fecha, time(hora)) for fecha, horas in libres_por_dia.items() for hora in horas]
+    if not horarios:
+      return RECHAZADA
+    fecha_hora = rnd.choice(horarios)
+
+    peluquero = None
+    if agenda is not None:
+      libres = agenda.libres(fecha_hora, duracion)
+      if not libres:
+        return RECHAZADA
+      peluquero = rnd.choice(libres)
+
+    with Turno.transaccion():
+      turno_id = Turno.reservar(
+        cliente['id'], fecha_hora, total,
+        duracion=duracion,
+        slots=disponibilidad.slots_del_turno(fecha_hora, duracion),
+        limite_turnos=capacidad,
+        peluquero_id=peluquero
+      )
+      if not turno_id:
+        return RECHAZADA
+      TurnoServicio.agregar_servicios(turno_id, [(s['id'], s['precio']) for s in elegidos])
+
+    with self._lock:
+      self.reservados.append(cliente)
+    return OK
+
+  def _cliente_con_reserva(self, rnd):
+    with self._lock:
+      return rnd.choice(self.reservados) if self.reservados else None
+
+  def confirmar(self, rnd):
+    """Como funciones_recepcionista.gestion_turnos (búsqueda por email)."""
+    cliente = self._cliente_con_reserva(rnd)
+    if not cliente:
+      return SIN_DATOS
+    usuario = Usuario.obtener_por_email(cliente['email'])
+    pendientes = Turno.listar('pendiente', usuario['id'], True) if usuario else None
+    if not pendientes:
+      return SIN_DATOS
+    return OK if Turno.cambiar_estado(rnd.choice(pendientes)['id'], 'pendiente', 'confirmado') else RECHAZADA
+
+  def cobrar(self, rnd):
+    """Como funciones_recepcionista.cobrar_turno (primera página de confirmados)."""
+    pagina = Turno.listar_pagina(estado='confirmado')
+    if not pagina:
+      return SIN_DATOS
+    turno = rnd.choice(pagina)
+    with Turno.transaccion():
+      if not Turno.registrar_cobro(turno['id']):
+        return RECHAZADA
+      TurnoServicio.listar_por_turno(turno['id'])
+    return OK
+
+  def cancelar(self, rnd):
+    """Como funciones_cliente.cancelar_turno."""
+    cliente = self._cliente_con_reserva(rnd)
+    if not cliente:
+      return SIN_DATOS
+    turnos = Turno.listar_para_cliente(cliente['id'])
+    if not turnos:
+      return SIN_DATOS
+    return OK if Turno.cancelar(rnd.choice(turnos)['id']) else RECHAZADA
+
+
+def parsear_mezcla(texto):
+  mezcla = {}
+  for parte in texto.split(","):
+    flujo, peso = parte.split("=")
+    if flujo not in ("reservar", "confirmar", "cobrar", "cancelar"):
+      raise argparse.ArgumentTypeError(f"Flujo desconocido: {flujo}")
+    mezcla[flujo] = float(peso)
+  return mezcla
+
+def correr_usuarios(usuarios, simulacion, mezcla, operaciones, duracion, pausa_ms, semilla):
+  """
+  Corre `usuarios` hilos; cada uno repite flujos elegidos según `mezcla` hasta
+  completar `operaciones` o hasta que pasen `duracion` segundos.
+
+  Returns:
+    list[tuple]: (flujo, resultado, latencia_ms) de cada operación.
+  """
+  ModeloBase.POOL_CONFIG["tamano"] = max(ModeloBase.POOL_CONFIG.get("tamano", 0), usuarios)
+  flujos, pesos = list(mezcla), list(mezcla.values())
+  fin = perf_counter() + duracion if duracion else None
+  muestras = []
+  lock = threading.Lock()
+
+  def usuario(n):
+    rnd = random.Random(semilla * 1000 + n)
+    propias = []
+    while (fin is None and len(propias) < operaciones) or (fin is not None and perf_counter() < fin):
+      flujo = rnd.choices(flujos, pesos)[0]
+      inicio = perf_counter()
+      try:
+        resultado = getattr(simulacion, flujo)(rnd)
+      except Exception:
+        resultado = ERROR
+      propias.append((flujo, resultado, (perf_counter() - inicio) * 1000))
+      if pausa_ms:
+        sleep(rnd.expovariate(1000 / pausa_ms)) # tiempo de "pensar" del usuario
+    with lock:
+      muestras.extend(propias)
+
+  with ThreadPoolExecutor(max_workers=usuarios) as executor:
+    list(executor.map(usuario, range(usuarios)))
+  return muestras
+
+def _proceso(args):
+  # Cada proceso arma su propio pool y sus propios clientes reservados
+  usuarios, clientes, mezcla, operaciones, duracion, pausa_ms, semilla = args
+  metricas.activar()
+  simulacion = Simulacion(clientes, semilla)
+  muestras = correr_usuarios(usuarios, simulacion, mezcla, operaciones, duracion, pausa_ms, semilla)
+  errores_sql = sum(e["errores"] for e in metricas.resumen()["sentencias"].values())
+  ModeloBase.cerrar_pool()
+  return muestras, errores_sql
+
+def verificar_sobreventa(dias):
+  """
+  Compara, para los días simulados, los turnos no cancelados de cada horario
+  (cobrar no libera el horario) con la capacidad y con el contador de
+  Turno_Slot, y busca peluqueros con turnos activos superpuestos.
+
+  Returns:
+    tuple: (horarios sobre la capacidad, contadores inconsistentes, superposiciones de peluqueros)
+  """
+  desde = datetime.combine(dias[0], datetime.min.time())
+  hasta = datetime.combine(dias[-1] + timedelta(days=1), datetime.min.time())
+  activos = ModeloBase.ejecutar("""
+    SELECT peluquero_id, fecha_hora, duracion, estado FROM Turno
+    WHERE fecha_hora >= %s AND fecha_hora < %s AND estado <> 'cancelado'
+    ORDER BY fecha_hora
+  """, (desde, hasta), fetch=True, dict_cursor=True) or []
+
+  peluqueros = Usuario.listar_peluqueros() or []
+  capacidad = len(peluqueros) or Turno.CAPACIDAD_SLOT
+
+  reales = {}
+  for t in activos:
+    for h in disponibilidad.slots_del_turno(t['fecha_hora'], t['duracion']):
+      reales[h] = reales.get(h, 0) + 1
+  contadores = {datetime.combine(f, datetime.min.time()).replace(hour=h): n for (f, h), n in Turno.listar_ocupacion(dias[0], dias[-1]).items()}
+
+  excedidos = sum(1 for n in reales.values() if n > capacidad)
+  inconsistentes = sum(1 for h in set(reales) | set(contadores) if reales.get(h, 0) != contadores.get(h, 0))
+
+  superpuestos = 0
+  fin_anterior = {}
+  for t in activos:
+    p = t['peluquero_id']
+    if p is None or t['estado'] == 'realizado': # ya cobrado: el peluquero vuelve a estar libre
+      continue
+    if p in fin_anterior and t['fecha_hora'] < fin_anterior[p]:
+      superpuestos += 1
+    fin_anterior[p] = max(fin_anterior.get(p, t['fecha_hora']), t['fecha_hora'] + timedelta(minutes=t['duracion']))
+  return excedidos, inconsistentes, superpuestos
+
+def main():
+  """
+  Simula usuarios concurrentes (clientes y recepcionistas) que reservan,
+  confirman, cobran y cancelan turnos a través de los modelos, sin prompts.
+  Informa throughput, latencia p50/p95/p99 por flujo, errores y sobreventa.
+  Termina con código 1 si hay errores o sobreventa.
+
+  Los clientes, peluqueros y servicios se generan con generar_datos.py y se
+  borran al terminar (junto con los turnos que se hayan reservado).
+  """
+  parser = argparse.ArgumentParser(description="Carga concurrente sobre los flujos de reserva, confirmación, cobro y cancelación.")
+  parser.add_argument("--usuarios", type=int, default=20, help="Usuarios simulados (hilos) por proceso")
+  parser.add_argument("--procesos", type=int, default=1, help="Procesos (requiere MariaDB o SQLite sobre un archivo)")
+  parser.add_argument("--operaciones", type=int, default=50, help="Operaciones por usuario")
+  parser.add_argument("--duracion", type=float, default=None, help="Segundos de simulación (reemplaza --operaciones)")
+  parser.add_argument("--pausa-ms", type=float, default=0, help="Pausa media entre operaciones de un usuario")
+  parser.add_argument("--mezcla", type=parsear_mezcla, default=parsear_mezcla(MEZCLA_DEFECTO), help=f"Peso de cada flujo (por defecto {MEZCLA_DEFECTO})")
+  parser.add_argument("--clientes", type=int, default=500, help="Clientes generados")
+  parser.add_argument("--peluqueros", type=int, default=5, help="Peluqueros generados")
+  parser.add_argument("--semilla", type=int, default=42)
+  args = parser.parse_args()
+
+  generar_datos.limpiar(informar=lambda _: None)
+  generar_datos.generar(clientes=args.clientes, turnos=0, servicios=10, peluqueros=args.peluqueros, semilla=args.semilla, informar=lambda _: None)
+  clientes = ModeloBase.ejecutar(
+    "SELECT id, email FROM Usuario WHERE rol = 'cliente' AND email LIKE %s",
+    (f"%@{generar_datos.DOMINIO}",), fetch=True, dict_cursor=True
+  )
+  dias = disponibilidad.dias_habiles()
+  metricas.activar()
+
+  print(f"Simulando {args.usuarios * args.procesos} usuarios ({args.procesos} proceso/s x {args.usuarios} hilos)...")
+  inicio = perf_counter()
+  if args.procesos > 1:
+    ModeloBase.cerrar_pool() # los procesos hijos no deben heredar conexiones abiertas
+    tareas = [(args.usuarios, clientes, args.mezcla, args.operaciones, args.duracion, args.pausa_ms, args.semilla + p)
+              for p in range(args.procesos)]
+    with ProcessPoolExecutor(max_workers=args.procesos) as executor:
+      resultados = list(executor.map(_proceso, tareas))
+    muestras = [m for parcial, _ in resultados for m in parcial]
+    errores_sql = sum(e for _, e in resultados)
+  else:
+    simulacion = Simulacion(clientes, args.semilla)
+    muestras = correr_usuarios(args.usuarios, simulacion, args.mezcla, args.operaciones, args.duracion, args.pausa_ms, args.semilla)
+    errores_sql = sum(e["errores"] for e in metricas.resumen()["sentencias"].values())
+  duracion = perf_counter() - inicio
+
+  print(f"\n{'Flujo':<10} {'Ops':>7} {'OK':>7} {'Rechaz.':>8} {'Sin datos':>10} {'Errores':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+  for flujo in list(args.mezcla) + ["total"]:
+    propias = [m for m in muestras if flujo == "total" or m[0] == flujo]
+    if not propias:
+      continue
+    latencias = [m[2] for m in propias]
+    cortes = statistics.quantiles(latencias, n=100) if len(latencias) > 1 else latencias * 99
+    cuenta = {r: sum(1 for m in propias if m[1] == r) for r in (OK, RECHAZADA, SIN_DATOS, ERROR)}
+    print(f"{flujo:<10} {len(propias):>7} {cuenta[OK]:>7} {cuenta[RECHAZADA]:>8} {cuenta[SIN_DATOS]:>10} {cuenta[ERROR]:>8} "
+          f"{cortes[49]:>9.1f} {cortes[94]:>9.1f} {cortes[98]:>9.1f}")
+
+  errores = sum(1 for m in muestras if m[1] == ERROR)
+  excedidos, inconsistentes, superpuestos = verificar_sobreventa(dias)
+  print(f"\nThroughput:             {len(muestras) / duracion:.1f} ops/s ({len(muestras)} ops en {duracion:.1f} s)")
+  print(f"Errores de SQL:         {errores_sql}")
+  print(f"Horarios sobrevendidos: {excedidos} | Contadores inconsistentes: {inconsistentes} | Peluqueros superpuestos: {superpuestos}")
+
+  generar_datos.limpiar(informar=lambda _: None)
+  ModeloBase.cerrar_pool()
+
+  if errores or errores_sql or excedidos or inconsistentes or superpuestos:
+    print("[ERROR] Hubo errores o se superó la capacidad.")
+    sys.exit(1)
+  print("[OK] Sin errores ni sobreventa.")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,81 @@
+import sys
+import os
+import time
+import argparse
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_base import ModeloBase
+from modelos.modelo_turno import Turno
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def main():
+  """
+  Prueba de estrés de Turno.reservar: lanza cientos de reservas concurrentes
+  contra un mismo horario y verifica que nunca se supere la capacidad.
+  Requiere una base MariaDB local. Termina con código 1 si hay sobreventa.
+  """
+  parser = argparse.ArgumentParser(description="Reservas concurrentes contra un mismo horario.")
+  parser.add_argument("--cliente", type=int, required=True, help="ID de un cliente existente")
+  parser.add_argument("--reservas", type=int, default=300, help="Cantidad total de reservas a intentar")
+  parser.add_argument("--hilos", type=int, default=50, help="Hilos concurrentes")
+  parser.add_argument("--capacidad", type=int, default=Turno.CAPACIDAD_SLOT, help="Capacidad del horario")
+  args = parser.parse_args()
+
+  # Una conexión por hilo para que la concurrencia sea real
+  ModeloBase.POOL_CONFIG["tamano"] = args.hilos
+
+  # Horario lejano para no interferir con datos reales
+  fecha_hora = (datetime.now() + timedelta(days=3650)).replace(minute=0, second=0, microsecond=0)
+  barrera = threading.Barrier(args.hilos)
+  errores = []
+
+  def reservar(i):
+    if i < args.hilos:
+      barrera.wait() # la primera tanda arranca a la vez
+    try:
+      return Turno.reservar(args.cliente, fecha_hora, 0, limite_turnos=args.capacidad)
+    except Exception as e:
+      errores.append(e)
+      return None
+
+  inicio = time.perf_counter()
+  with ThreadPoolExecutor(max_workers=args.hilos) as executor:
+    resultados = list(executor.map(reservar, range(args.reservas)))
+  duracion = time.perf_counter() - inicio
+
+  creados = [r for r in resultados if r]
+  en_tabla = ModeloBase.ejecutar(
+    "SELECT COUNT(*) AS cantidad FROM Turno WHERE fecha_hora = %s AND estado IN ('pendiente', 'confirmado')",
+    (fecha_hora,), fetch=True, dict_cursor=True
+  )[0]['cantidad']
+  contador = ModeloBase.ejecutar(
+    "SELECT ocupados FROM Turno_Slot WHERE fecha_hora = %s", (fecha_hora,), fetch=True, dict_cursor=True
+  )[0]['ocupados']
+
+  print(f"Reservas intentadas: {args.reservas} ({args.hilos} hilos) en {duracion:.2f} s")
+  print(f"Reservas aceptadas:  {len(creados)} (capacidad {args.capacidad})")
+  print(f"Turnos en la tabla:  {en_tabla} | Contador del horario: {contador}")
+  print(f"Errores:             {len(errores)}")
+  for e in errores[:5]:
+    print(f"  - {e}")
+
+  # Limpiar los datos de prueba
+  for turno_id in creados:
+    Turno.eliminar(turno_id)
+  ModeloBase.ejecutar("DELETE FROM Turno_Slot WHERE fecha_hora = %s", (fecha_hora,))
+  ModeloBase.cerrar_pool()
+
+  if en_tabla > args.capacidad or len(creados) != en_tabla or contador != en_tabla:
+    print("[ERROR] Se superó la capacidad del horario o el contador quedó inconsistente.")
+    sys.exit(1)
+  print("[OK] La capacidad del horario nunca se superó.")
+
+if __name__ == "__main__":
+  main()
@@ -9,7 +9,8 @@ CREATE TABLE Usuario (
   email VARCHAR(255) NOT NULL UNIQUE, -- Único para login
   password_hash VARCHAR(255) NOT NULL, -- Contraseña hasheada
   rol ENUM('admin', 'peluquero', 'recepcionista', 'cliente') NOT NULL,
-  activo BOOLEAN DEFAULT TRUE -- Para desactivar cuentas en lugar de eliminarlas
+  activo BOOLEAN DEFAULT TRUE, -- Para desactivar cuentas en lugar de eliminarlas
+  INDEX idx_usuario_rol_activo_nombre (rol, activo, nombre, apellido)
 );
 
 -- -----------------------------------------------------------
@@ -33,8 +34,16 @@ CREATE TABLE Turno (
   fecha_hora DATETIME NOT NULL,
   estado ENUM('pendiente', 'confirmado', 'realizado', 'cancelado') NOT NULL DEFAULT 'pendiente',
   total DECIMAL(10, 2) DEFAULT 0.00,
+  duracion INT NOT NULL DEFAULT 60, -- En minutos (suma de los servicios)
   fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  FOREIGN KEY (cliente_id) REFERENCES Usuario(id) ON DELETE RESTRICT
+  peluquero_id INT NULL, -- Peluquero asignado
+  fecha_cobro DATETIME NULL, -- Cuándo se cobró (estado 'realizado')
+  FOREIGN KEY (cliente_id) REFERENCES Usuario(id) ON DELETE RESTRICT,
+  CONSTRAINT fk_turno_peluquero FOREIGN KEY (peluquero_id) REFERENCES Usuario(id) ON DELETE RESTRICT,
+  INDEX idx_turno_peluquero_fecha (peluquero_id, fecha_hora),
+  INDEX idx_turno_estado_fecha (estado, fecha_hora),
+  INDEX idx_turno_cliente_estado_fecha (cliente_id, estado, fecha_hora),
+  INDEX idx_turno_fecha_cobro (fecha_cobro)
 );
 
 -- -----------------------------------------------------------
@@ -52,3 +61,54 @@ CREATE TABLE Turno_Servicio (
 );
 
 
+
+
+-- -----------------------------------------------------------
+-- 5. Tabla Turno_Slot
+-- Cantidad de turnos activos por horario (un turno largo ocupa varios horarios).
+-- La actualizan Turno.reservar y Turno.cancelar para controlar la capacidad sin
+-- bloquear toda la tabla Turno.
+-- -----------------------------------------------------------
+CREATE TABLE Turno_Slot (
+  fecha_hora DATETIME PRIMARY KEY,
+  ocupados INT NOT NULL DEFAULT 0
+);
+
+
+-- -----------------------------------------------------------
+-- 6. Tablas de resumen para los reportes de facturación
+-- Turnos cobrados e ingresos por día de cobro, en total y por servicio.
+-- Las actualizan Turno.registrar_cobro y Turno.anular_cobro; el historial
+-- se recalcula con scripts/backfill_reportes.py.
+-- -----------------------------------------------------------
+CREATE TABLE Reporte_Diario (
+  fecha DATE PRIMARY KEY,
+  turnos INT NOT NULL DEFAULT 0,
+  ingresos DECIMAL(12, 2) NOT NULL DEFAULT 0.00
+);
+
+-- Sin clave foránea a Servicio: el historial se conserva aunque se borre el servicio
+CREATE TABLE Reporte_Servicio_Diario (
+  fecha DATE NOT NULL,
+  servicio_id INT NOT NULL,
+  cantidad INT NOT NULL DEFAULT 0,
+  ingresos DECIMAL(12, 2) NOT NULL DEFAULT 0.00,
+  PRIMARY KEY (fecha, servicio_id)
+);
+
+
+-- -----------------------------------------------------------
+-- 7. Tabla Schema_Version
+-- Migraciones ya incluidas en este esquema (ver modelos/modelo_migracion.py),
+-- así scripts/migrar.py no las vuelve a aplicar sobre una base nueva. Al
+-- agregar una migración, actualizar también este archivo y su fila acá.
+-- -----------------------------------------------------------
+CREATE TABLE Schema_Version (
+  version INT PRIMARY KEY,
+  descripcion VARCHAR(255) NOT NULL,
+  aplicada_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO Schema_Version (version, descripcion) VALUES
+  (1, 'capacidad y peluqueros'),
+  (2, 'indices consultas'),
+  (3, 'reportes facturacion');
@@ -0,0 +1,79 @@
+-- -----------------------------------------------------------
+-- Esquema equivalente a tablas.sql para el backend SQLite (DB_BACKEND=sqlite).
+-- Lo ejecuta automáticamente modelos/backend.py al crear una base nueva.
+-- Refleja el esquema con todas las migraciones aplicadas; al agregar una
+-- migración, actualizar también este archivo y su fila en Schema_Version.
+-- -----------------------------------------------------------
+
+CREATE TABLE Usuario (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  nombre VARCHAR(100) NOT NULL,
+  apellido VARCHAR(100) NOT NULL,
+  email VARCHAR(255) NOT NULL UNIQUE,
+  password_hash VARCHAR(255) NOT NULL,
+  rol TEXT NOT NULL CHECK (rol IN ('admin', 'peluquero', 'recepcionista', 'cliente')),
+  activo BOOLEAN DEFAULT TRUE
+);
+CREATE INDEX idx_usuario_rol_activo_nombre ON Usuario (rol, activo, nombre, apellido);
+
+CREATE TABLE Servicio (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  nombre VARCHAR(100) NOT NULL,
+  descripcion TEXT,
+  precio DECIMAL(10, 2) NOT NULL,
+  duracion_estimada INT NOT NULL,
+  activo BOOLEAN DEFAULT TRUE
+);
+
+CREATE TABLE Turno (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  cliente_id INT NOT NULL REFERENCES Usuario(id) ON DELETE RESTRICT,
+  fecha_hora DATETIME NOT NULL,
+  estado TEXT NOT NULL DEFAULT 'pendiente' CHECK (estado IN ('pendiente', 'confirmado', 'realizado', 'cancelado')),
+  total DECIMAL(10, 2) DEFAULT 0.00,
+  duracion INT NOT NULL DEFAULT 60,
+  fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  peluquero_id INT NULL REFERENCES Usuario(id) ON DELETE RESTRICT,
+  fecha_cobro DATETIME NULL
+);
+CREATE INDEX idx_turno_peluquero_fecha ON Turno (peluquero_id, fecha_hora);
+CREATE INDEX idx_turno_estado_fecha ON Turno (estado, fecha_hora);
+CREATE INDEX idx_turno_cliente_estado_fecha ON Turno (cliente_id, estado, fecha_hora);
+CREATE INDEX idx_turno_fecha_cobro ON Turno (fecha_cobro);
+
+CREATE TABLE Turno_Servicio (
+  turno_id INT NOT NULL REFERENCES Turno(id) ON DELETE CASCADE,
+  servicio_id INT NOT NULL REFERENCES Servicio(id) ON DELETE RESTRICT,
+  precio_cobrado DECIMAL(10, 2),
+  PRIMARY KEY (turno_id, servicio_id)
+);
+
+CREATE TABLE Turno_Slot (
+  fecha_hora DATETIME PRIMARY KEY,
+  ocupados INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE Reporte_Diario (
+  fecha DATE PRIMARY KEY,
+  turnos INT NOT NULL DEFAULT 0,
+  ingresos DECIMAL(12, 2) NOT NULL DEFAULT 0.00
+);
+
+CREATE TABLE Reporte_Servicio_Diario (
+  fecha DATE NOT NULL,
+  servicio_id INT NOT NULL,
+  cantidad INT NOT NULL DEFAULT 0,
+  ingresos DECIMAL(12, 2) NOT NULL DEFAULT 0.00,
+  PRIMARY KEY (fecha, servicio_id)
+);
+
+-- Migraciones ya incluidas en este esquema (ver modelos/modelo_migracion.py)
+CREATE TABLE Schema_Version (
+  version INT PRIMARY KEY,
+  descripcion VARCHAR(255) NOT NULL,
+  aplicada_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO Schema_Version (version, descripcion) VALUES
+  (1, 'capacidad y peluqueros'),
+  (2, 'indices consultas'),
+  (3, 'reportes facturacion');
@@ -0,0 +1,152 @@
+import sys
+import os
+import random
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_base import ModeloBase
+from modelos.modelo_usuario import Usuario
+from modelos.modelo_servicio import Servicio
+from modelos.modelo_turno import Turno
+from modelos.modelo_turno_servicio import TurnoServicio
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DOMINIO = "seed.explain"
+# Un full scan sobre una tabla chica (ej. Servicio) es correcto; solo se marca sobre tablas grandes
+FILAS_MAXIMAS_SIN_INDICE = 100
+
+def sembrar(clientes, turnos_por_cliente):
+  """Carga un conjunto de datos con una distribución realista de estados."""
+  hash_demo = ModeloBase._hash_password("Demo1234")
+  Usuario.ejecutar_lote(
+    "INSERT INTO Usuario (nombre, apellido, email, password_hash, rol) VALUES (%s, %s, %s, %s, %s)",
+    [(f"Nombre{i}", f"Apellido{i}", f"cliente{i}@{DOMINIO}", hash_demo, 'cliente') for i in range(clientes)]
+  )
+  Usuario.ejecutar_lote(
+    "INSERT INTO Usuario (nombre, apellido, email, password_hash, rol) VALUES (%s, %s, %s, %s, %s)",
+    [(f"Peluquero{i}", "Seed", f"peluquero{i}@{DOMINIO}", hash_demo, 'peluquero') for i in range(3)]
+  )
+  servicio_id = Servicio.crear("Servicio EXPLAIN", None, 1000, 60)
+
+  ids = [r[0] for r in Usuario.ejecutar("SELECT id FROM Usuario WHERE email LIKE %s AND rol = 'cliente'", (f"%@{DOMINIO}",), fetch=True)]
+  peluqueros = [r[0] for r in Usuario.ejecutar("SELECT id FROM Usuario WHERE email LIKE %s AND rol = 'peluquero'", (f"%@{DOMINIO}",), fetch=True)]
+
+  rnd = random.Random(42)
+  ahora = datetime.now().replace(minute=0, second=0, microsecond=0)
+  filas = []
+  for cliente_id in ids:
+    for _ in range(turnos_por_cliente):
+      fecha = ahora + timedelta(days=rnd.randint(-730, 5), hours=rnd.randint(-4, 4))
+      if fecha > ahora:
+        estado = rnd.choice(['pendiente', 'pendiente', 'cancelado'])
+      else:
+        estado = rnd.choices(['realizado', 'cancelado', 'confirmado', 'pendiente'], weights=[85, 10, 1, 4])[0]
+      filas.append((cliente_id, fecha, estado, 1000, 60, rnd.choice(peluqueros)))
+
+  Turno.ejecutar_lote(
+    "INSERT INTO Turno (cliente_id, fecha_hora, estado, total, duracion, peluquero_id) VALUES (%s, %s, %s, %s, %s, %s)",
+    filas
+  )
+  turnos = Turno.ejecutar("SELECT t.id FROM Turno t JOIN Usuario u ON t.cliente_id = u.id WHERE u.email LIKE %s", (f"%@{DOMINIO}",), fetch=True)
+  TurnoServicio.ejecutar_lote(
+    "INSERT INTO Turno_Servicio (turno_id, servicio_id, precio_cobrado) VALUES (%s, %s, %s)",
+    [(r[0], servicio_id, 1000) for r in turnos]
+  )
+
+  for tabla in ("Usuario", "Turno", "Turno_Servicio", "Turno_Slot"):
+    ModeloBase.ejecutar(f"ANALYZE TABLE {tabla}", fetch=True)
+
+  return ids[0], turnos[0][0], servicio_id
+
+def limpiar(servicio_id):
+  ModeloBase.ejecutar("DELETE FROM Turno WHERE cliente_id IN (SELECT id FROM Usuario WHERE email LIKE %s)", (f"%@{DOMINIO}",))
+  ModeloBase.ejecutar("DELETE FROM Turno WHERE peluquero_id IN (SELECT id FROM Usuario WHERE email LIKE %s)", (f"%@{DOMINIO}",))
+  ModeloBase.ejecutar("DELETE FROM Usuario WHERE email LIKE %s", (f"%@{DOMINIO}",))
+  ModeloBase.ejecutar("DELETE FROM Servicio WHERE id = %s", (servicio_id,))
+
+def capturar_consultas(llamada):
+  """Ejecuta una llamada a un modelo y devuelve las consultas SELECT que envió."""
+  capturadas = []
+  ejecutar_original = ModeloBase.ejecutar.__func__
+
+  def ejecutar_capturando(cls, query, params=(), fetch=False, last_id=False, dict_cursor=False):
+    if query.lstrip().upper().startswith("SELECT"):
+      capturadas.append((query, params))
+    return ejecutar_original(cls, query, params, fetch, last_id, dict_cursor)
+
+  ModeloBase.ejecutar = classmethod(ejecutar_capturando)
+  try:
+    llamada()
+  finally:
+    ModeloBase.ejecutar = classmethod(ejecutar_original)
+  return capturadas
+
+def main():
+  """
+  Verifica con EXPLAIN que cada consulta de los modelos use un índice en lugar
+  de recorrer la tabla completa, sobre un conjunto de datos sembrado.
+  Termina con código 1 si alguna consulta hace un full scan sobre una tabla grande.
+  """
+  parser = argparse.ArgumentParser(description="Regresión de índices basada en EXPLAIN.")
+  parser.add_argument("--clientes", type=int, default=2000)
+  parser.add_argument("--turnos-por-cliente", type=int, default=10)
+  args = parser.parse_args()
+
+  # Se leen las columnas del EXPLAIN de MariaDB (type, rows, key); SQLite tiene otro formato
+  backend = ModeloBase.obtener_backend()
+  if backend.nombre != "mariadb":
+    print(f"[ERROR] verificar_indices.py lee el EXPLAIN de MariaDB y el backend es '{backend.nombre}' (DB_BACKEND).")
+    sys.exit(2)
+
+  cliente_id, turno_id, servicio_id = sembrar(args.clientes, args.turnos_por_cliente)
+  hoy = datetime.now().date()
+  ahora = datetime.now().replace(minute=0, second=0, microsecond=0)
+
+  consultas = {
+    "Turno.listar(estado='confirmado')": lambda: Turno.listar(estado='confirmado'),
+    "Turno.listar('pendiente', cliente, fecha_hoy)": lambda: Turno.listar('pendiente', cliente_id, True),
+    "Turno.listar_pagina(estado='confirmado', after)": lambda: Turno.listar_pagina('confirmado', after_fecha=ahora - timedelta(days=365), after_id=turno_id),
+    "Turno.obtener_por_id": lambda: Turno.obtener_por_id(turno_id),
+    "Turno.listar_para_cliente": lambda: Turno.listar_para_cliente(cliente_id),
+    "Turno.listar_ocupacion": lambda: Turno.listar_ocupacion(hoy, hoy + timedelta(days=6)),
+    "Turno.listar_agenda": lambda: Turno.listar_agenda(hoy, hoy + timedelta(days=6)),
+    "Turno.verificar_disponibilidad": lambda: Turno.verificar_disponibilidad(ahora),
+    "TurnoServicio.listar_por_turno": lambda: TurnoServicio.listar_por_turno(turno_id),
+    "TurnoServicio.calcular_total": lambda: TurnoServicio.calcular_total(turno_id),
+    "Usuario.listar_empleados": lambda: Usuario.listar_empleados(),
+    "Usuario.listar_clientes_pagina(after)": lambda: Usuario.listar_clientes_pagina(after_id=cliente_id),
+    "Usuario.listar_peluqueros": lambda: Usuario.listar_peluqueros(),
+    "Usuario.obtener_por_id": lambda: Usuario.obtener_por_id(cliente_id),
+    "Usuario.obtener_por_email": lambda: Usuario.obtener_por_email(f"cliente1@{DOMINIO}"),
+    "Usuario.buscar_por_nombre_similar": lambda: Usuario.buscar_por_nombre_similar("nombre1"),
+  }
+
+  fallas = 0
+  try:
+    for nombre, llamada in consultas.items():
+      for query, params in capturar_consultas(llamada):
+        plan = ModeloBase.ejecutar(f"EXPLAIN {query}", params, fetch=True, dict_cursor=True) or []
+        scans = [p for p in plan if p['type'] == 'ALL' and (p['rows'] or 0) > FILAS_MAXIMAS_SIN_INDICE]
+        if scans:
+          fallas += 1
+          tablas = ", ".join(f"{p['table']} ({p['rows']} filas)" for p in scans)
+          print(f"[FALLA] {nombre}: full scan sobre {tablas}")
+        else:
+          indices = ", ".join(f"{p['table']}:{p['key'] or p['type']}" for p in plan)
+          print(f"[OK]    {nombre}: {indices}")
+  finally:
+    limpiar(servicio_id)
+    ModeloBase.cerrar_pool()
+
+  if fallas:
+    print(f"\n[ERROR] {fallas} consulta(s) sin índice. ¿Se ejecutó scripts/migrar.py?")
+    sys.exit(1)
+  print("\n[OK] Todas las consultas usan índices.")
+
+if __name__ == "__main__":
+  main()